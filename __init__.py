@@ -28,29 +28,818 @@ Tool specific initialization for doxyfile.
 __docformat__ = "restructuredText"
 
 from .about import __version__
+
 from .doxyoptions import *
 
-def Doxyfile(env, target='Doxyfile', *args, **kw):
+import SCons.Warnings
+
+class DoxyfileWarning(SCons.Warnings.WarningOnByDefault):
+    pass
+
+_builder = None
+_fragment_builder = None
+_scanner = None
+
+# Tag files (absolute paths) mapped to Doxyfiles generating them, and
+# Doxyfiles mapped to tag files they use.
+_tagfile_producers = {}
+_tagfile_consumers = {}
+
+class _Options(dict):
+    """Option values passed to the builder (via ``DOXYFILE_OPTIONS``).
+
+    The values are shared between Doxyfiles and never modified in place, so
+    the dict is not copied when SCons creates an override environment for
+    each target.
+
+    The options may be derived from `parent` options by overriding some of
+    them. The digest of such options is computed from the parent's digest
+    and the overriden values only, so the (shared) defaults get stringified
+    once, not once per Doxyfile."""
+    __slots__ = ('_parent', '_overriden', '_digests')
+
+    def __init__(self, options, parent=None):
+        dict.__init__(self, options)
+        self._parent = parent
+        self._overriden = set()
+        self._digests = {}
+
+    def __semi_deepcopy__(self):
+        return self
+
+    def override(self, key, val):
+        self[key] = val
+        self._overriden.add(key)
+
+    def digest(self, ctx=None):
+        """Returns hex digest of option values, as rendered with `ctx`."""
+        from . import doxystats
+        key = None if ctx is None else ctx.key()
+        try:
+            digest = self._digests[key]
+        except KeyError:
+            pass
+        else:
+            doxystats.count('digest:hit')
+            return digest
+        doxystats.count('digest:miss')
+        import hashlib
+        md = hashlib.sha1()
+        if self._parent is None:
+            keys = self.keys()
+        else:
+            md.update(_to_bytes(self._parent.digest(ctx)))
+            keys = self._overriden
+        # options written to fragments have their own signatures
+        fragments = None if ctx is None else ctx.fragments
+        for name in sorted(keys):
+            if fragments and name in fragments:
+                text = ctx.include(name)
+            else:
+                text = self[name].render(ctx)
+            md.update(_to_bytes('%s=%s\n' % (name, text)))
+        digest = md.hexdigest()
+        self._digests[key] = digest
+        return digest
+
+def _to_bytes(s):
+    return s if isinstance(s, bytes) else s.encode('utf-8')
+
+def _prototypes(env):
+    """Returns (options, defaults) cached for `env`.
+
+    The options is a dict with default option values, filled lazily with the
+    options that were needed so far. The defaults maps sets of option names
+    to :class:`_Options` made of these options. Both are cached in the
+    environment object. A cloned environment shallow-copies attributes of its
+    parent, so we also remember the owner (and the selected doxygen version)
+    and start over if it doesn't match. The default values are shared by all
+    the Doxyfiles generated within `env`, so they must not be modified."""
+    version = env.get('DOXYFILE_VERSION')
+    cache = getattr(env, '_doxyfile_prototypes', None)
+    if cache is None or cache[0] is not env or cache[1] != version:
+        cache = (env, version, {}, {})
+        env._doxyfile_prototypes = cache
+    return cache[2:]
+
+def _defaults(env, names):
+    """Returns :class:`_Options` with default values of options `names`."""
+    from . import doxystats
+    from .doxyoptions import doxyoptions
+    protos, defaults = _prototypes(env)
+    key = frozenset(names)
+    try:
+        options = defaults[key]
+    except KeyError:
+        pass
+    else:
+        doxystats.count('defaults:hit')
+        return options
+    doxystats.count('defaults:miss')
+    missing = [k for k in key if k not in protos]
+    if missing:
+        protos.update(doxyoptions(env, missing, shared=True))
+    options = _Options((k, protos[k]) for k in key if k in protos)
+    defaults[key] = options
+    return options
+
+def _template_placeholders(node):
+    """Returns the set of placeholder names used by template `node`.
+
+    The result is cached in node's attributes. If the template can't be read
+    at this point (e.g. it's generated by another builder), None is returned
+    and cached."""
+    attrs = node.attributes
+    try:
+        return attrs.doxyfile_placeholders
+    except AttributeError:
+        pass
+    from .doxytemplate import compile_template
+    src = node.srcnode()
+    if src.has_builder() or not src.rexists():
+        placeholders = None
+    else:
+        text = src.rfile().get_text_contents()
+        placeholders = compile_template(text).placeholders
+    attrs.doxyfile_placeholders = placeholders
+    return placeholders
+
+def _templates_placeholders(nodes):
+    """Returns the set of placeholder names used by all templates in `nodes`
+    or None if any of them is unknown."""
+    result = frozenset()
+    for node in nodes:
+        placeholders = _template_placeholders(node)
+        if placeholders is None:
+            return None
+        result = result.union(placeholders)
+    return result
+
+def _template_nodes(env, source):
+    """Converts `source` to a list of template nodes.
+
+    Strings with no suffix get the default ``.in`` suffix appended, as the
+    builder would do."""
     import SCons.Util
+    import os
+    nodes = []
+    for src in SCons.Util.flatten([source]):
+        if SCons.Util.is_String(src):
+            src = env.subst(src)
+            if not os.path.splitext(src)[1]:
+                src = src + '.in'
+            src = env.File(src)
+        nodes.append(src)
+    return nodes
+
+def _digest(options, source, ctx=None):
+    """Returns the build signature of Doxyfile generated from templates
+    `source` with `options` (rendered with `ctx`)."""
+    import hashlib
+    md = hashlib.sha1(_to_bytes(options.digest(ctx)))
+    for node in source:
+        md.update(_to_bytes(node.get_path()))
+    return md.hexdigest()
+
+def _file_digest(path):
+    """Returns SHA1 digest of the file at `path`, None if it can't be read."""
+    import hashlib
+    md = hashlib.sha1()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(65536), b''):
+                md.update(chunk)
+    except (IOError, OSError):
+        return None
+    return md.digest()
+
+def _same_contents(path, data):
+    """Checks whether the file at `path` contains exactly `data` bytes."""
+    import hashlib
+    import os
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+    except (IOError, OSError):
+        return False
+    return _file_digest(path) == hashlib.sha1(data).digest()
+
+def _render_context(env, target, source, fragments=None):
+    """Returns :class:`RenderContext` for Doxyfile `target` generated from
+    `source`, or None if the defaults are used.
+
+    Relative paths are selected by ``DOXYFILE_RELATIVE_PATHS``, which is
+    either True (paths relative to the Doxyfile) or a directory. Canonical
+    rendering is selected by ``DOXYFILE_CANONICAL``. The `fragments` maps
+    options written to fragment files to their nodes."""
+    from .doxyoptions import RenderContext
+    anchor = env.get('DOXYFILE_RELATIVE_PATHS')
+    canonical = bool(env.get('DOXYFILE_CANONICAL'))
+    if not (anchor or canonical or fragments):
+        return None
+    if not anchor:
+        base = None
+    elif anchor is True:
+        base = _target_node(env, target, source).dir.get_abspath()
+    else:
+        base = env.arg2nodes(anchor, env.fs.Dir)[0].get_abspath()
+    return RenderContext(base, canonical, fragments)
+
+def _doxyfile_action(target, source, env):
+    import SCons.Errors
+    from . import doxystats
+    from .doxytemplate import compile_template
+    stats = doxystats.current
+    if stats is not None:
+        start = doxystats.clock()
+    options = env['DOXYFILE_OPTIONS']
+    fragments = getattr(target[0].attributes, 'doxyfile_fragments', None)
+    ctx = _render_context(env, target[0], source, fragments)
+    header = env.get('DOXYFILE_MINIMAL')
+    if header is not None:
+        base = getattr(target[0].attributes, 'doxyfile_base', None)
+        contents = [_render_minimal(options, ctx, header, base)]
+    else:
+        contents = [compile_template(src.get_text_contents()).render(options, ctx)
+                    for src in source]
+    encoding = env.get('FILE_ENCODING', 'utf-8')
+    data = u'\n'.join(contents).encode(encoding)
+    if stats is not None:
+        stats.target(str(target[0]), render_seconds=doxystats.clock() - start,
+                     bytes=len(data), written=False)
+    path = target[0].get_abspath()
+    # leave the file (and its timestamp) untouched if nothing has changed,
+    # so that dependent targets are considered up to date
+    if env.get('DOXYFILE_WRITE_IF_CHANGED') and _same_contents(path, data):
+        return 0
+    try:
+        with open(path, 'wb') as f:
+            f.write(data)
+    except (IOError, OSError) as e:
+        raise SCons.Errors.UserError("Can't write target file %s [%s]" %
+                                     (target[0], e))
+    if stats is not None:
+        stats.target(str(target[0]), written=True)
+
+def _doxyfile_strfunc(target, source, env):
+    return "Creating '%s'" % target[0]
+
+def _doxyfile_emitter(target, source, env):
+    import SCons.Errors
+    if len(target) != 1:
+        raise SCons.Errors.UserError("Only one target file allowed")
+    for t in target:
+        # effective options, for scanners of tools consuming the Doxyfile
+        t.attributes.doxyfile_options = env.get('DOXYFILE_OPTIONS')
+        # the directory relative paths are relative to (doxygen must be run
+        # there)
+        ctx = _render_context(env, t, source)
+        t.attributes.doxyfile_basedir = None if ctx is None else ctx.base
+        if env.get('DOXYFILE_WRITE_IF_CHANGED'):
+            # don't let SCons remove the old file before it gets rebuilt
+            t.set_precious()
+    return target, source
+
+def _doxyfile_builder():
+    global _builder
+    if _builder is None:
+        import SCons.Builder
+        import SCons.Action
+        import SCons.Node.FS
+        action = SCons.Action.Action(_doxyfile_action, _doxyfile_strfunc,
+                                     varlist=['DOXYFILE_DIGEST'])
+        _builder = SCons.Builder.Builder(action=action,
+                                         emitter=_doxyfile_emitter,
+                                         source_factory=SCons.Node.FS.File,
+                                         src_suffix=['.in'])
+    return _builder
+
+def _fragment_lines(name, value, ctx):
+    """Yields the contents of fragment file with option `name` set to
+    `value`, in pieces."""
+    yield '%s += ' % name
+    for chunk in value.iter_render(ctx):
+        yield chunk
+    yield '\n'
+
+def _fragment_digest(name, value, ctx):
+    import hashlib
+    md = hashlib.sha1()
+    for chunk in _fragment_lines(name, value, ctx):
+        md.update(_to_bytes(chunk))
+    return md.hexdigest()
+
+def _fragment_action(target, source, env):
+    import hashlib
+    import os
+    import SCons.Errors
+    from . import doxystats
+    stats = doxystats.current
+    if stats is not None:
+        start = doxystats.clock()
+    name = env['DOXYFILE_FRAGMENT']
+    value = env['DOXYFILE_OPTIONS'][name]
+    ctx = _render_context(env, target[0], source)
+    encoding = env.get('FILE_ENCODING', 'utf-8')
+    path = target[0].get_abspath()
+    tmp = path + '.tmp'
+    # the value is written as it's rendered, it's never held in memory as a
+    # whole
+    md = hashlib.sha1()
+    size = 0
+    try:
+        with open(tmp, 'wb') as f:
+            for chunk in _fragment_lines(name, value, ctx):
+                data = chunk.encode(encoding)
+                md.update(data)
+                size += len(data)
+                f.write(data)
+        if stats is not None:
+            stats.target(str(target[0]), written=False, bytes=size,
+                         render_seconds=doxystats.clock() - start)
+        if (env.get('DOXYFILE_WRITE_IF_CHANGED') and
+                _file_digest(path) == md.digest()):
+            os.remove(tmp)
+            return 0
+        if os.name == 'nt' and os.path.exists(path):
+            os.remove(path)
+        os.rename(tmp, path)
+    except (IOError, OSError) as e:
+        raise SCons.Errors.UserError("Can't write target file %s [%s]" %
+                                     (target[0], e))
+    if stats is not None:
+        stats.target(str(target[0]), written=True)
+
+def _fragment_emitter(target, source, env):
+    if env.get('DOXYFILE_WRITE_IF_CHANGED'):
+        for t in target:
+            t.set_precious()
+    return target, source
+
+def _doxyfile_fragment_builder():
+    global _fragment_builder
+    if _fragment_builder is None:
+        import SCons.Builder
+        import SCons.Action
+        action = SCons.Action.Action(_fragment_action, _doxyfile_strfunc,
+                                     varlist=['DOXYFILE_DIGEST'])
+        _fragment_builder = SCons.Builder.Builder(action=action,
+                                                  emitter=_fragment_emitter)
+    return _fragment_builder
+
+def _fragments(env, target, source, options):
+    """Writes list options having more than ``DOXYFILE_FRAGMENTS`` items to
+    fragment files next to Doxyfile `target`, returns a dict mapping these
+    options to the fragment nodes (None if there are no such options).
+
+    Each fragment is a separate target, with its own signature, so a change
+    in a long list rewrites only its fragment, not the Doxyfile."""
+    limit = env.get('DOXYFILE_FRAGMENTS')
+    if not limit:
+        return None
+    from .doxyoptions import DoxyValList
+    builder = _doxyfile_fragment_builder()
+    node = _target_node(env, target, source)
+    fragments = {}
+    for name in sorted(options):
+        opt = options[name]
+        if not isinstance(opt, DoxyValList) or (opt.size() or 0) <= int(limit):
+            continue
+        fragment = node.dir.File('%s.%s' % (node.name, name))
+        ctx = _render_context(env, fragment, source)
+        builder(env, [fragment], [],
+                DOXYFILE_FRAGMENT = name,
+                DOXYFILE_OPTIONS = options,
+                DOXYFILE_DIGEST = _fragment_digest(name, options[name], ctx))
+        fragments[name] = fragment
+    return fragments or None
+
+def _build_doxyfile(env, builder, target, source, options, header=None,
+                    base=None, effective=None):
+    """Calls `builder` generating Doxyfile `target` from templates `source`
+    with `options`.
+
+    If `header` is not None, the Doxyfile is written without templates (see
+    :func:`_minimal`), starting with `header` and ``@INCLUDE`` of `base`
+    Doxyfile, if given. The `effective` options (including these inherited
+    from `base`) are what tools reading the Doxyfile get to see."""
+    import hashlib
+    from .doxyoptions import RenderContext
+    fragments = _fragments(env, target, source, options)
+    ctx = _render_context(env, target, source, fragments)
+    digest = _digest(options, source, ctx)
+    if header is not None:
+        # the contents of base has its own signature, only its path matters
+        include = '' if base is None else (ctx or RenderContext()).include_file(base)
+        digest = hashlib.sha1(_to_bytes('%s\nminimal\n%s%s' %
+                                        (digest, header, include))).hexdigest()
+    nodes = _call_builder(builder, env, target, source,
+                          DOXYFILE_OPTIONS = options,
+                          DOXYFILE_DIGEST = digest,
+                          DOXYFILE_MINIMAL = header)
+    if effective is None:
+        effective = options
+    else:
+        nodes[0].attributes.doxyfile_options = effective
+    if base is not None:
+        nodes[0].attributes.doxyfile_base = base
+        env.Requires(nodes[0], base)
+    if fragments:
+        nodes[0].attributes.doxyfile_fragments = fragments
+        # built together with the Doxyfile, doxygen runs depend on them
+        # via the scanner
+        env.Requires(nodes[0], list(fragments.values()))
+        env.Clean(nodes[0], list(fragments.values()))
+    _register_tagfiles(nodes[0], effective)
+    return nodes
+
+def _is_default(opt, default):
+    from .doxyoptions import DoxyValList
+    if opt is default:
+        return True
+    if isinstance(opt, DoxyValList) and isinstance(default, DoxyValList):
+        size, dsize = opt.size(), default.size()
+        if size is not None and dsize is not None and size != dsize:
+            return False
+    return opt.render() == default.render()
+
+def _minimal_header(env):
+    from .doxyoptions import doxyfile_version
+    version = doxyfile_version(env)
+    return '# Doxyfile %s\n' % version if version else ''
+
+def _render_minimal(options, ctx, header, base=None):
+    """Renders `options` as ``TAG = value`` lines, without a template."""
+    from .doxyoptions import RenderContext
+    fragments = None if ctx is None else ctx.fragments
+    lines = [header]
+    if base is not None:
+        lines.append((ctx or RenderContext()).include_file(base) + '\n')
+    for name in sorted(options):
+        if fragments and name in fragments:
+            text = ctx.include(name)
+        else:
+            text = options[name].render(ctx)
+        lines.append('%s = %s\n' % (name, text))
+    return ''.join(lines)
+
+def _base_options(env, base):
+    """Returns (node, options) of Doxyfile `base` generated by
+    ``DoxyfileBase()``."""
+    import SCons.Errors
+    node = env.arg2nodes(base, env.fs.File)[0]
+    options = getattr(node.attributes, 'doxyfile_layer', None)
+    if options is None:
+        raise SCons.Errors.UserError("%s is not generated by DoxyfileBase()" % node)
+    return node, options
+
+def _minimal(env, target, values, base=None):
+    """Generates Doxyfile `target` with the options from `values` which
+    differ from their defaults (or the values inherited from `base`),
+    without a template."""
+    from .doxyoptions import doxyoptions_names
+    names = doxyoptions_names(env)
+    for key in sorted(values):
+        if key not in names:
+            SCons.Warnings.warn(DoxyfileWarning,
+                                "option %s is not supported" % key)
+    values = dict((k, v) for k, v in values.items() if k in names)
+    if base is None:
+        layer = _defaults(env, values.keys())
+        header = _minimal_header(env)
+    else:
+        base, inherited = _base_options(env, base)
+        defaults = _defaults(env, set(values).union(inherited))
+        layer = _override(defaults, None, [], inherited)
+        # the base has the header already
+        header = ''
+    effective = _override(layer, None, [], values)
+    _check_dot(env, effective)
+    # the options left to their defaults (or to the values inherited from
+    # base) are not written, doxygen applies them anyway
+    options = _Options((k, effective[k]) for k in values
+                       if not _is_default(effective[k], layer[k]))
+    if base is None:
+        effective = options
+    nodes = _build_doxyfile(env, _doxyfile_builder(), target, [], options,
+                            header, base, effective)
+    # options seen by Doxyfiles including this one
+    nodes[0].attributes.doxyfile_layer = effective
+    return nodes
+
+def _call_builder(builder, env, target, source, **kw):
+    import SCons.Util
+    if target is not None and not SCons.Util.is_List(target):
+        target = [target]
+    return builder(env, target, source, **kw)
+
+def _template_options(env, source):
+    """Returns (used, defaults) for templates in `source`.
+
+    The `used` is the set of placeholders used by templates (or None if it's
+    unknown) and `defaults` is a dict with default values of options to be
+    materialized."""
+    from .doxyoptions import doxyoptions_names
+    # only options used by template(s) get materialized; if we don't know
+    # what's in the template, all of them are
+    used = _templates_placeholders(source)
+    names = doxyoptions_names(env) if used is None else used
+    return used, _defaults(env, names)
+
+def _override(options, used, source, values):
+    """Returns a copy of `options` overriden with `values`.
+
+    The option values in `options` are shared, only overriden options get
+    their own values."""
     import copy
-    # build subst-dict
-    sd = {}
-    for key,val in doxyoptions(env).items():
-        placeholder = '@%s@' % key
-        sd[placeholder] = copy.copy(val)
-        try: sd[placeholder].assign(kw[key])
-        except KeyError: pass
+    from .doxyoptions import DoxyValBase
+    options = _Options(options, options)
+    for key, val in values.items():
+        if used is not None and key not in used:
+            SCons.Warnings.warn(DoxyfileWarning,
+                                "option %s is not used by template %s" %
+                                (key, ', '.join(str(s) for s in source)))
+            continue
+        try:
+            proto = options[key]
+        except KeyError:
+            SCons.Warnings.warn(DoxyfileWarning,
+                                "option %s is not supported" % key)
+            continue
+        if isinstance(val, DoxyValBase):
+            # already typed (e.g. loaded from existing Doxyfile)
+            opt = val
+        else:
+            opt = copy.copy(proto)
+            opt.assign(val)
+        options.override(key, opt)
+    return options
+
+def _check_dot(env, options):
+    """Warns if `options` enable ``HAVE_DOT``, while dot (``DOXYGEN_DOT``)
+    can't be run. Dot is probed only if doxygen is (``DOXYFILE_VERSION``
+    set to ``'auto'``)."""
+    if env.get('DOXYFILE_VERSION') != 'auto':
+        return
+    if not _option_value(options, 'HAVE_DOT'):
+        return
+    from . import doxyprobe
+    if doxyprobe.dot_version(env) is None:
+        SCons.Warnings.warn(DoxyfileWarning,
+                            "HAVE_DOT is enabled, but dot (%s) can't be run" %
+                            env.subst('$DOXYGEN_DOT'))
+
+def _option_value(options, name):
+    opt = options.get(name)
+    return None if opt is None else opt.value()
+
+def _register_tagfiles(doxyfile, options):
+    """Records tag files produced (``GENERATE_TAGFILE``) and consumed
+    (``TAGFILES``) by `doxyfile` and checks for cycles between projects."""
+    import SCons.Node.FS
+    from .doxyoptions import DoxyValTagFiles
+    produced = _option_value(options, 'GENERATE_TAGFILE')
+    if isinstance(produced, SCons.Node.FS.Base):
+        _tagfile_producers[produced.get_abspath()] = doxyfile
+    consumed = _option_value(options, 'TAGFILES')
+    if isinstance(options.get('TAGFILES'), DoxyValTagFiles) and consumed:
+        _tagfile_consumers[doxyfile] = [item.tagfile().get_abspath()
+                                        for item in consumed]
+    cycle = _tagfiles_cycle(doxyfile, [doxyfile], set())
+    if cycle:
+        import SCons.Errors
+        top = doxyfile.fs.Dir('#')
+        raise SCons.Errors.UserError("cycle in TAGFILES dependencies: %s" %
+                                     ' -> '.join(n.get_path(top) for n in cycle))
+
+def _tagfiles_cycle(start, path, visited):
+    """Returns a cycle of Doxyfiles leading back to `start` from the last
+    Doxyfile on `path`, following the tag files they consume."""
+    for tagfile in _tagfile_consumers.get(path[-1], ()):
+        producer = _tagfile_producers.get(tagfile)
+        if producer is None:
+            continue
+        if producer is start:
+            return path + [start]
+        if producer in visited:
+            continue
+        visited.add(producer)
+        cycle = _tagfiles_cycle(start, path + [producer], visited)
+        if cycle:
+            return cycle
+    return None
+
+def _target_node(env, target, source):
+    """Returns the Doxyfile node the builder would create for `target`."""
+    import os
+    if target is None:
+        src = source[0]
+        return src.dir.File(os.path.splitext(src.name)[0])
+    return env.arg2nodes(target, env.fs.File)[0]
+
+def _sharded(env, target, source, used, options, count):
+    """Generates Doxyfiles documenting sources in `count` shards and the
+    index Doxyfile linking them."""
+    import SCons.Errors
+    import SCons.Node
+    from . import doxyshards
+    from .doxyparser import template_values, options_words
+    from .doxyscanner import env_dir_index
+    if used is not None:
+        missing = [k for k in doxyshards.required_options if k not in used]
+        if missing:
+            raise SCons.Errors.UserError("sharding requires options %s in "
+                                         "template %s" %
+                                         (', '.join(missing),
+                                          ', '.join(str(s) for s in source)))
+    node = _target_node(env, target, source)
+    cwd = node.dir.get_abspath()
+    values = template_values(source, options, cwd, str(node))
+    if values is None:
+        values = options_words(options, doxyshards.plan_options)
+    plan = doxyshards.plan(values, cwd, count, env_dir_index(env))
+    builder = _doxyfile_builder()
+    shards = []
+    for i, overrides in enumerate(plan.shards):
+        overrides['INPUT'] = [env.File(p) for p in overrides['INPUT']]
+        opts = _override(options, used, source, overrides)
+        shard = node.dir.File('%s.shard%d' % (node.name, i))
+        shards.extend(_build_doxyfile(env, builder, shard, source, opts))
+    overrides = plan.index
+    overrides['INPUT'] = [env.File(p) for p in overrides['INPUT']]
+    # tag files of other projects are used by the index too
+    tagfiles = _option_value(options, 'TAGFILES') or []
+    overrides['TAGFILES'] = [t.value() for t in tagfiles] + overrides['TAGFILES']
+    opts = _override(options, used, source, overrides)
+    index = _build_doxyfile(env, builder, node, source, opts)
+    return SCons.Node.NodeList(index + shards)
+
+def Doxyfile(env, target='Doxyfile', *args, **kw):
+    from . import doxystats
+    stats = doxystats.current
+    if stats is None:
+        return _doxyfile(env, target, *args, **kw)
+    start = doxystats.clock()
+    nodes = _doxyfile(env, target, *args, **kw)
+    stats.add_time('Doxyfile', doxystats.clock() - start)
+    return nodes
+
+def _doxyfile(env, target='Doxyfile', *args, **kw):
+    import SCons.Errors
+    source = args[0] if args else None
+    shards = kw.pop('shards', None)
+    base = kw.pop('base', None)
+    if kw.pop('minimal', False) or base is not None:
+        if source is not None or shards:
+            raise SCons.Errors.UserError("minimal Doxyfile %s can't be used "
+                                         "with template or shards" % target)
+        return _minimal(env, target, kw, base)
+    if source is None:
+        source, target = target, None
+    source = _template_nodes(env, source)
+    used, defaults = _template_options(env, source)
+    options = _override(defaults, used, source, kw)
+    _check_dot(env, options)
+    if shards:
+        return _sharded(env, target, source, used, options, int(shards))
     # use builder
-    return env.Substfile(target, *args, SUBST_DICT = sd)
+    return _build_doxyfile(env, _doxyfile_builder(), target, source, options)
+
+def Doxyfiles(env, configs, source='Doxyfile.in', base=None):
+    """Generates several Doxyfiles from a shared template.
+
+    Each item of `configs` is a mapping with options for a single Doxyfile.
+    Its ``'target'`` key is required and names the Doxyfile to be generated,
+    an optional ``'source'`` key overrides the default template. The options
+    from `base` are shared by all the Doxyfiles. The template is read, and
+    the base options are created, only once for all the configs using it."""
+    import SCons.Errors
+    import SCons.Node
+    from . import doxystats
+    stats = doxystats.current
+    if stats is not None:
+        start = doxystats.clock()
+    builder = _doxyfile_builder()
+    if base is None:
+        base = {}
+    # (used placeholders, base options) per template
+    templates = {}
+    default_nodes = _template_nodes(env, source)
+    targets = []
+    for config in configs:
+        config = dict(config)
+        try:
+            target = config.pop('target')
+        except KeyError:
+            raise SCons.Errors.UserError("missing 'target' in Doxyfiles() "
+                                         "config: %r" % config)
+        try:
+            nodes = _template_nodes(env, config.pop('source'))
+        except KeyError:
+            nodes = default_nodes
+        key = tuple(nodes)
+        try:
+            used, options = templates[key]
+        except KeyError:
+            used, defaults = _template_options(env, nodes)
+            options = _override(defaults, used, nodes, base)
+            templates[key] = (used, options)
+        options = _override(options, used, nodes, config)
+        _check_dot(env, options)
+        targets.extend(_build_doxyfile(env, builder, target, nodes, options))
+    if stats is not None:
+        stats.add_time('Doxyfiles', doxystats.clock() - start)
+    return SCons.Node.NodeList(targets)
+
+def DoxyfileBase(env, target, **kw):
+    """Generates Doxyfile `target` with options shared by many Doxyfiles.
+
+    Doxyfiles given it as ``base`` include it and write only the options
+    they change, see ``Doxyfile()``. The base is written as with
+    ``minimal=True`` and it may have a base itself."""
+    return Doxyfile(env, target, minimal=True, **kw)
+
+def LoadDoxyfile(env, path, cwd=None, include_path=None):
+    """Reads existing Doxyfile and returns its options.
+
+    The result is a dict of option values which may be passed as keyword
+    arguments to ``env.Doxyfile()``. Relative paths found in the Doxyfile are
+    resolved against `cwd` (by default, the directory of the Doxyfile)."""
+    import SCons.Util
+    from .doxyparser import load_doxyfile
+    if SCons.Util.is_String(path):
+        path = env.File(env.subst(path))
+    path = path.srcnode().get_abspath()
+    return load_doxyfile(env, path, cwd, include_path,
+                         env.get('FILE_ENCODING', 'utf-8'))
+
+def DoxygenRun(env, target=None, source=None, **kw):
+    """Runs doxygen with Doxyfile(s) `source`.
+
+    The targets are the files written by doxygen, they're determined from
+    the Doxyfile, so `source` may be passed as the only argument."""
+    import SCons.Node
+    from .doxyrun import doxygen_builder
+    if source is None:
+        source, target = target, None
+    builder = doxygen_builder()
+    if target is not None:
+        return _call_builder(builder, env, target, source, **kw)
+    # the Doxyfile is a placeholder target, replaced by the emitter (SCons
+    # would derive target names from Doxyfile names, which may collide)
+    result = []
+    for src in env.arg2nodes(source, env.fs.File):
+        result.extend(builder(env, [src], [src], **kw))
+    return SCons.Node.NodeList(result)
+
+def DoxyfileStats(env):
+    """Returns statistics collected by the tool (see ``doxystats``), or None
+    if they're not enabled."""
+    from . import doxystats
+    return doxystats.stats()
+
+def _doxyfile_scan(node, env, path=()):
+    from .doxyscanner import scan
+    return scan(node, env, path)
+
+def _doxyfile_scanner():
+    # same as doxyscanner.DoxyfileScanner(), without importing doxyscanner
+    # until something gets scanned
+    global _scanner
+    if _scanner is None:
+        import SCons.Scanner
+        _scanner = SCons.Scanner.Base(_doxyfile_scan, name='DoxyfileScanner')
+    return _scanner
+
+def _doxygen_emitter(target, source, env):
+    from .doxyoutputs import doxygen_emitter
+    return doxygen_emitter(target, source, env)
 
 def generate(env):
-    try:
-        env['BUILDERS']['Substfile']
-    except KeyError:
-        env.Tool('textfile')
+    from . import doxystats
+    env.SetDefault(DOXYFILE_WRITE_IF_CHANGED = True,
+                   DOXYFILE_RELATIVE_PATHS = False,
+                   DOXYFILE_CANONICAL = False,
+                   DOXYFILE_FRAGMENTS = None,
+                   DOXYFILE_DIRINDEX = '#.doxyfile.dirindex',
+                   DOXYFILE_SCANNER = _doxyfile_scanner(),
+                   DOXYFILE_EMITTER = _doxygen_emitter,
+                   DOXYFILE_PROBE_CACHE = '#.doxyfile.probe',
+                   DOXYGEN = 'doxygen',
+                   DOXYGEN_DOT = 'dot',
+                   DOXYGEN_CPUS = None)
     env.AddMethod(Doxyfile,'Doxyfile')
+    env.AddMethod(Doxyfiles,'Doxyfiles')
+    env.AddMethod(DoxyfileBase,'DoxyfileBase')
+    env.AddMethod(LoadDoxyfile,'LoadDoxyfile')
+    env.AddMethod(DoxygenRun,'DoxygenRun')
+    env.AddMethod(DoxyfileStats,'DoxyfileStats')
+    doxystats.setup(env)
 
 def exists(env):
+    # Doxyfiles are generated without doxygen, so the tool is always
+    # available; doxygen itself is probed (see doxyprobe) only when
+    # DOXYFILE_VERSION is 'auto'
     return 1
 
 # Local Variables:
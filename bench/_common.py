@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""Common helpers for benchmarks.
+
+Every ``bench_*.py`` module defines ``run(recorder)`` function, which
+measures things with :meth:`Recorder.time` and :meth:`Recorder.memory`. The
+modules may be run standalone or all together by ``run.py``.
+"""
+
+import os
+import sys
+import gc
+import timeit
+import tracemalloc
+import importlib
+import importlib.util
+
+topsrcdir = os.path.realpath(os.path.join(os.path.dirname(__file__), '..'))
+
+def load_tool(name='doxyfile'):
+    """Imports the tool from the source tree as a package named `name`."""
+    try:
+        return sys.modules[name]
+    except KeyError:
+        pass
+    init = os.path.join(topsrcdir, '__init__.py')
+    spec = importlib.util.spec_from_file_location(
+            name, init, submodule_search_locations=[topsrcdir])
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+def load_module(modname, name='doxyfile'):
+    """Imports submodule `modname` of the tool loaded by :func:`load_tool`."""
+    load_tool(name)
+    return importlib.import_module('%s.%s' % (name, modname))
+
+def environment(**kw):
+    """Creates SCons environment with the tool loaded."""
+    import SCons.Environment
+    load_tool()
+    env = SCons.Environment.Environment(tools=[], **kw)
+    sys.modules['doxyfile'].generate(env)
+    return env
+
+def measure(func, number=None, repeat=5):
+    """Returns best time (in seconds) of a single call to `func`."""
+    timer = timeit.Timer(func)
+    if number is None:
+        number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+def allocated(func):
+    """Returns (result, bytes) where bytes is memory retained by result."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = func()
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, after - before
+
+class Recorder(object):
+    """Runs measurements, prints and collects their results."""
+
+    def __init__(self, pattern=None, out=sys.stdout):
+        self.pattern = pattern
+        self.out = out
+        self.results = {}
+
+    def enabled(self, name):
+        return self.pattern is None or self.pattern in name
+
+    def time(self, name, func, number=None, repeat=5):
+        """Records the best time of a single call to `func`."""
+        if not self.enabled(name):
+            return None
+        seconds = measure(func, number, repeat)
+        self.results.setdefault(name, {})['time'] = seconds
+        self.out.write("%-56s %14.3f us\n" % (name, seconds * 1e6))
+        return seconds
+
+    def memory(self, name, func, count=None):
+        """Records memory retained by the object returned by `func`."""
+        if not self.enabled(name):
+            return None
+        _, nbytes = allocated(func)
+        self.results.setdefault(name, {})['memory'] = nbytes
+        if count:
+            self.out.write("%-56s %14d B %8.1f B/item\n" %
+                           (name, nbytes, float(nbytes) / count))
+        else:
+            self.out.write("%-56s %14d B\n" % (name, nbytes))
+        return nbytes
+
+def main(run):
+    """Entry point for a standalone benchmark module."""
+    run(Recorder(sys.argv[1] if len(sys.argv) > 1 else None))
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4 nospell:
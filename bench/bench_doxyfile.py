@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""End-to-end ``Doxyfile()`` for 1, 100 and 1000 configurations.
+
+The "declare" benchmarks measure what happens at SConscript read time (the
+``env.Doxyfile()`` or ``env.Doxyfiles()`` calls), the "build" ones
+additionally write the files.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import itertools
+
+sys.path.insert(0, os.path.dirname(__file__))
+import _common
+
+def declare(env, template, outdir, counter, count):
+    round = next(counter)
+    targets = []
+    for i in range(count):
+        target = os.path.join(outdir, 'r%d' % round, 'c%d' % i, 'Doxyfile')
+        targets.extend(env.Doxyfile(target, template,
+                                    PROJECT_NAME='Component %d' % i,
+                                    INPUT=['src/c%d' % i, 'include/c%d' % i],
+                                    RECURSIVE=True))
+    return targets
+
+def declare_batch(env, template, outdir, counter, count):
+    round = next(counter)
+    configs = ({'target': os.path.join(outdir, 'r%d' % round, 'c%d' % i,
+                                       'Doxyfile'),
+                'PROJECT_NAME': 'Component %d' % i,
+                'INPUT': ['src/c%d' % i, 'include/c%d' % i]}
+               for i in range(count))
+    return env.Doxyfiles(configs, template, base={'RECURSIVE': True})
+
+def build(env, template, outdir, counter, count):
+    targets = declare(env, template, outdir, counter, count)
+    for target in targets:
+        target.prepare()
+        target.build()
+    return targets
+
+def run(recorder):
+    import SCons.Action
+    SCons.Action.print_actions = False
+    env = _common.environment()
+    tmpdir = tempfile.mkdtemp()
+    try:
+        template = os.path.join(tmpdir, 'Doxyfile.in')
+        shutil.copy(os.path.join(_common.topsrcdir, 'Doxyfile.in'), template)
+        counter = itertools.count()
+        for count in (1, 100, 1000):
+            number = max(1, 100 // count)
+            repeat = 3 if count < 1000 else 1
+            recorder.time('Doxyfile(): declare %d configs' % count,
+                          lambda: declare(env, template, tmpdir, counter,
+                                          count),
+                          number=number, repeat=repeat)
+            recorder.time('Doxyfiles(): declare %d configs' % count,
+                          lambda: declare_batch(env, template, tmpdir,
+                                                counter, count),
+                          number=number, repeat=repeat)
+            recorder.time('Doxyfile(): build %d configs' % count,
+                          lambda: build(env, template, tmpdir, counter,
+                                        count),
+                          number=number, repeat=repeat)
+        recorder.memory('memory: Doxyfile(): declare 1000 configs',
+                        lambda: declare(env, template, tmpdir, counter, 1000),
+                        1000)
+        recorder.memory('memory: Doxyfiles(): declare 1000 configs',
+                        lambda: declare_batch(env, template, tmpdir, counter,
+                                              1000),
+                        1000)
+    finally:
+        shutil.rmtree(tmpdir)
+
+if __name__ == '__main__':
+    _common.main(run)
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4 nospell:
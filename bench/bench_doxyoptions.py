@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""Creation, assignment and stringification of option values."""
+
+import os
+import sys
+import copy
+
+sys.path.insert(0, os.path.dirname(__file__))
+import _common
+
+# a typical value for each kind of option
+_samples = [
+    ('int',         3),
+    ('str',         'str 2'),
+    ('list',        ['a b', False, 3]),
+    ('dict',        {'a': 'A', 'b': 'be ce'}),
+    ('bool',        True),
+    ('entry',       'foo'),
+    ('file',        'bar.txt'),
+    ('dir',         '.'),
+    ('srcentry',    'foo'),
+    ('srcfile',     'foo.txt'),
+    ('srcdir',      '.'),
+    ('dualentry',   'foo'),
+    ('dualfile',    'foo.txt'),
+    ('dualdir',     '.'),
+    ('entries',     ['foo', 'bar/gez']),
+    ('files',       ['foo', 'bar.txt']),
+    ('dirs',        ['.', 'foo']),
+    ('srcentries',  ['.', 'foo']),
+    ('srcfiles',    ['a.txt', 'b.txt']),
+    ('srcdirs',     ['.', 'foo']),
+    ('dualentries', ['.', 'foo']),
+    ('dualfiles',   ['a.txt', 'b.txt']),
+    ('dualdirs',    ['.', 'foo']),
+]
+
+def run(recorder):
+    doxyoptions = _common.load_module('doxyoptions')
+    DoxyVal = doxyoptions.DoxyVal
+    env = _common.environment()
+
+    doxyschema = _common.load_module('doxyschema')
+    def fresh_schema():
+        doxyschema._schemas.clear()
+        return doxyschema.schema('1.8.5')
+    recorder.time('doxyschema.schema(version) (uncached)', fresh_schema)
+    recorder.time('doxyoptions(env)', lambda: doxyoptions.doxyoptions(env))
+
+    # each sample gets its own working directory, so that entries, files and
+    # dirs do not clash with each other
+    cwd = env.fs.getcwd()
+    for kind, val in _samples:
+        env.fs.chdir(env.Dir('#samples/%s' % kind))
+        recorder.time('DoxyVal(): %s' % kind,
+                      lambda: DoxyVal(env, val, kind))
+    env.fs.chdir(cwd)
+
+    for kind, val in [('int', 3), ('str', 'str 2'), ('bool', 'YES'),
+                      ('dict', dict(('k%d' % i, 'v %d' % i)
+                                    for i in range(100)))]:
+        opt = copy.copy(DoxyVal(env, val, kind))
+        recorder.time('assign: %s' % kind, lambda: opt.assign(val))
+        recorder.time('str: %s' % kind, lambda: str(opt))
+
+    paths = ['dir_%d/file_%d.h' % (i % 100, i) for i in range(10000)]
+    opt = DoxyVal(env, None, 'srcentries')
+    recorder.time('assign: srcentries, 10k items',
+                  lambda: opt.assign(paths), repeat=3)
+    recorder.time('str: srcentries, 10k items', lambda: str(opt), repeat=3)
+    recorder.memory('memory: srcentries, 10k items',
+                    lambda: DoxyVal(env, paths, 'srcentries'), len(paths))
+
+    opt = DoxyVal(env, None, 'dualentries')
+    recorder.time('assign: dualentries, 10k items',
+                  lambda: opt.assign(paths), repeat=3)
+    recorder.time('str: dualentries, 10k items', lambda: str(opt), repeat=3)
+    recorder.time('resolve_paths(): srcentry, 10k items',
+                  lambda: doxyoptions.resolve_paths(env, paths, 'srcentry'),
+                  repeat=3)
+
+    def lookup_cold():
+        doxyoptions._path_nodes.clear()
+        doxyoptions.lookup_nodes(env, paths, 'Entry')
+    recorder.time('lookup_nodes(): 10k items, cold', lookup_cold, repeat=3)
+    recorder.time('lookup_nodes(): 10k items, cached',
+                  lambda: doxyoptions.lookup_nodes(env, paths, 'Entry'),
+                  repeat=3)
+    recorder.time('env.arg2nodes(): 10k items (reference)',
+                  lambda: env.arg2nodes(paths, env.fs.Entry), repeat=3)
+
+if __name__ == '__main__':
+    _common.main(run)
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4 nospell:
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""Loading the tool into an environment.
+
+The tool is imported afresh (under a name of its own) on every call, so the
+timings include executing its modules, but not importing SCons. Modules
+pulled in by loading the tool are reported, as only these are paid for by
+builds which never call ``Doxyfile()``.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+import _common
+
+_name = 'doxyfile_bench_import'
+
+def _unload():
+    for mod in [m for m in sys.modules if m.split('.')[0] == _name]:
+        del sys.modules[mod]
+
+def _load():
+    _unload()
+    return _common.load_tool(_name)
+
+def run(recorder):
+    import SCons.Environment
+    recorder.time('import: tool', _load, repeat=3)
+
+    def generate():
+        tool = _load()
+        env = SCons.Environment.Environment(tools=[])
+        tool.generate(env)
+        return env
+    recorder.time('import: tool + generate(env)', generate, repeat=3)
+
+    # a target of its own for each call, the tool's builders are new each
+    # time it's imported
+    count = [0]
+    def first_doxyfile():
+        count[0] += 1
+        env = generate()
+        return env.Doxyfile('#bench_import/Doxyfile.%d' % count[0],
+                            minimal=True, PROJECT_NAME='P')
+    recorder.time('import: tool + generate(env) + Doxyfile()', first_doxyfile,
+                  repeat=3)
+
+    recorder.time('import: Environment() (for reference)',
+                  lambda: SCons.Environment.Environment(tools=[]), repeat=3)
+
+    generate()
+    loaded = sorted(m for m in sys.modules if m.split('.')[0] == _name)
+    recorder.out.write("modules loaded by generate(env): %s\n" %
+                       ', '.join(m.split('.')[-1] for m in loaded))
+    _unload()
+
+if __name__ == '__main__':
+    _common.main(run)
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4 nospell:
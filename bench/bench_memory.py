@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""Memory taken by option values.
+
+Reports the number of bytes allocated (as seen by :mod:`tracemalloc`) for
+the full table of default options and for large list values. The table is
+measured both as returned to users and as kept by the tool for its defaults
+(``shared=True``).
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+import _common
+
+def run(recorder):
+    doxyoptions = _common.load_module('doxyoptions')
+    env = _common.environment()
+    DoxyVal = doxyoptions.DoxyVal
+
+    n = len(list(doxyoptions.doxyoptions_names()))
+    recorder.memory('memory: doxyoptions(env)',
+                    lambda: doxyoptions.doxyoptions(env), n)
+
+    tables = 100
+    recorder.memory('memory: doxyoptions(env) x %d' % tables,
+                    lambda: [doxyoptions.doxyoptions(env)
+                             for i in range(tables)], n * tables)
+
+    recorder.memory('memory: doxyoptions(env, shared=True) x %d' % tables,
+                    lambda: [doxyoptions.doxyoptions(env, shared=True)
+                             for i in range(tables)], n * tables)
+
+    items = ['item_%d' % i for i in range(10000)]
+    recorder.memory("memory: DoxyVal(env, <10k str>, 'list')",
+                    lambda: DoxyVal(env, items, 'list'), len(items))
+
+    flags = [bool(i % 2) for i in range(10000)]
+    recorder.memory("memory: DoxyVal(env, <10k bool>, 'list')",
+                    lambda: DoxyVal(env, flags, 'list'), len(flags))
+
+    nodes = [env.File('src/file_%d.h' % i) for i in range(10000)]
+    recorder.memory("memory: DoxyVal(env, <10k nodes>, 'files')",
+                    lambda: DoxyVal(env, nodes, 'files'), len(nodes))
+
+if __name__ == '__main__':
+    _common.main(run)
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4 nospell:
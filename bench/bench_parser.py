@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""Tokenizing and loading of existing Doxyfiles.
+
+Inputs are the Doxyfile rendered from the shipped template (~260 options
+with comments) and a synthetic one with a 10k-item ``INPUT`` list spread over
+continuation lines, which is the worst case for naive line joining.
+"""
+
+import io
+import os
+import sys
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+import _common
+
+def _typical(doxyoptions, env):
+    doxytemplate = _common.load_module('doxytemplate')
+    path = os.path.join(_common.topsrcdir, 'Doxyfile.in')
+    with io.open(path, encoding='utf-8') as f:
+        tpl = doxytemplate.compile_template(f.read())
+    return tpl.render(doxyoptions.doxyoptions(env, tpl.placeholders))
+
+def _large(count):
+    lines = ['PROJECT_NAME = "Large project"', 'RECURSIVE = YES',
+             'FILE_PATTERNS = *.h *.hpp "*.in l"']
+    lines.append('INPUT = ' + ' \\\n        '.join(
+        'dir_%d/file_%d.h' % (i % 100, i) for i in range(count)))
+    return '\n'.join(lines) + '\n'
+
+def run(recorder):
+    doxyoptions = _common.load_module('doxyoptions')
+    doxyparser = _common.load_module('doxyparser')
+    env = _common.environment()
+    tmpdir = tempfile.mkdtemp()
+    try:
+        for name, text in [('typical', _typical(doxyoptions, env)),
+                           ('10k INPUT', _large(10000))]:
+            lines = text.splitlines(True)
+            path = os.path.join(tmpdir, 'Doxyfile')
+            with io.open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            recorder.time('parser: tokenize(), %s' % name,
+                          lambda: list(doxyparser.tokenize(lines)))
+            recorder.time('parser: parse() (cached), %s' % name,
+                          lambda: doxyparser.parse(path))
+            recorder.time('parser: load_doxyfile(), %s' % name,
+                          lambda: doxyparser.load_doxyfile(env, path),
+                          repeat=3)
+    finally:
+        shutil.rmtree(tmpdir)
+
+if __name__ == '__main__':
+    _common.main(run)
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4 nospell:
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""Render time of Doxyfile.in for growing number of options.
+
+The compiled template renders in a single pass, so its timing should stay
+flat as the number of options passed to the renderer grows. The per-key
+``str.replace()`` loop (what ``Substfile`` does) is measured for comparison.
+"""
+
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+import _common
+
+def replace_render(text, subs):
+    for (k, v) in subs:
+        text = text.replace(k, v)
+    return text
+
+def run(recorder):
+    doxytemplate = _common.load_module('doxytemplate')
+    doxyoptions = _common.load_module('doxyoptions')
+    path = os.path.join(_common.topsrcdir, 'Doxyfile.in')
+    with io.open(path, encoding='utf-8') as f:
+        text = f.read()
+    tpl = doxytemplate.compile_template(text)
+    names = sorted(tpl.placeholders)
+    for extra in (0, 250, 2500, 25000):
+        values = dict((n, doxyoptions.DoxyValStr(None, n.lower()))
+                      for n in names)
+        unused = doxyoptions.DoxyValStr(None, 'x')
+        values.update(('UNUSED_%d' % i, unused) for i in range(extra))
+        subs = [('@%s@' % k, str(v)) for (k, v) in values.items()]
+        n = len(values)
+        recorder.time('render: compiled, %d options' % n,
+                      lambda: tpl.render(values))
+        if extra <= 2500:
+            recorder.time('render: str.replace, %d options' % n,
+                          lambda: replace_render(text, subs), repeat=3)
+    recorder.time('render: compile_template() (cached)',
+                  lambda: doxytemplate.compile_template(text))
+    recorder.time('render: DoxyTemplate() (tokenize)',
+                  lambda: doxytemplate.DoxyTemplate(text))
+
+if __name__ == '__main__':
+    _common.main(run)
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4 nospell:
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Expansion of INPUT/FILE_PATTERNS/EXCLUDE into the list of source files.
+
+A synthetic tree of 20k files in 1k directories is walked with an empty
+directory index (cold), with an up to date one (null build, a ``stat()`` per
+directory) and with one just reloaded from disk.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+import _common
+
+def _make_tree(top, ndirs=1000, nfiles=20):
+    for d in range(ndirs):
+        path = os.path.join(top, 'd%02d' % (d % 50), 'd%d' % d)
+        os.makedirs(path)
+        for f in range(nfiles):
+            ext = ('.h', '.cpp', '.txt', '.o')[f % 4]
+            open(os.path.join(path, 'f%d%s' % (f, ext)), 'w').close()
+
+def run(recorder):
+    doxyscanner = _common.load_module('doxyscanner')
+    tmpdir = tempfile.mkdtemp()
+    try:
+        top = os.path.join(tmpdir, 'src')
+        _make_tree(top)
+        spec = doxyscanner.InputSpec([top], True, ['*.h', '*.cpp'],
+                                     [os.path.join(top, 'd07')],
+                                     ['*/d1?/*'])
+        recorder.time('scanner: 20k files, cold index',
+                      lambda: doxyscanner.input_files(
+                          spec, doxyscanner.DirIndex()), repeat=3)
+        index = doxyscanner.DirIndex()
+        doxyscanner.input_files(spec, index)
+        recorder.time('scanner: 20k files, warm index',
+                      lambda: doxyscanner.input_files(spec, index), repeat=3)
+        index.path = os.path.join(tmpdir, 'dirindex')
+        index.save()
+        recorder.time('scanner: 20k files, index reloaded from disk',
+                      lambda: doxyscanner.input_files(
+                          spec, doxyscanner.DirIndex(index.path)), repeat=3)
+        recorder.time('scanner: os.walk() + fnmatch (reference)',
+                      lambda: _reference(top), repeat=3)
+    finally:
+        shutil.rmtree(tmpdir)
+
+def _reference(top):
+    import fnmatch
+    result = []
+    for path, dirs, files in os.walk(top):
+        for name in files:
+            if fnmatch.fnmatch(name, '*.h') or fnmatch.fnmatch(name, '*.cpp'):
+                result.append(os.path.join(path, name))
+    return result
+
+if __name__ == '__main__':
+    _common.main(run)
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4 nospell:
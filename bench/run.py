@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""Runs benchmarks and compares results against stored baselines.
+
+Results are stored as JSON files under ``bench/.baselines``. By default they
+are named after the current git commit, so that running::
+
+    python bench/run.py --save
+    git checkout other-branch
+    python bench/run.py --compare <commit>
+
+shows how the timings and memory usage differ between the two commits.
+"""
+
+import os
+import sys
+import glob
+import json
+import argparse
+import subprocess
+import importlib
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _common
+
+benchdir = os.path.dirname(os.path.abspath(__file__))
+baselinedir = os.path.join(benchdir, '.baselines')
+
+def modules():
+    """Returns names of all benchmark modules."""
+    files = sorted(glob.glob(os.path.join(benchdir, 'bench_*.py')))
+    return [os.path.splitext(os.path.basename(f))[0] for f in files]
+
+def default_name():
+    """Returns a name identifying the working tree (current commit)."""
+    def git(*args):
+        return subprocess.check_output(('git',) + args, cwd=benchdir,
+                                       universal_newlines=True).strip()
+    try:
+        name = git('rev-parse', '--short', 'HEAD')
+        if git('status', '--porcelain', '--untracked-files=no'):
+            name += '-dirty'
+        return name
+    except (OSError, subprocess.CalledProcessError):
+        return 'default'
+
+def baseline_path(name):
+    return os.path.join(baselinedir, '%s.json' % name)
+
+def save(name, results):
+    if not os.path.isdir(baselinedir):
+        os.makedirs(baselinedir)
+    with open(baseline_path(name), 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    sys.stdout.write("results saved as %r\n" % name)
+
+def load(name):
+    with open(baseline_path(name)) as f:
+        return json.load(f)
+
+def compare(results, baseline, threshold):
+    """Prints ratios of results to baseline, returns number of regressions."""
+    regressions = 0
+    sys.stdout.write("\n%-56s %10s %10s\n" % ('benchmark', 'time', 'memory'))
+    for name in sorted(results):
+        if name not in baseline:
+            continue
+        cols = []
+        for key in ('time', 'memory'):
+            new, old = results[name].get(key), baseline[name].get(key)
+            if new is None or old is None or not old:
+                cols.append('')
+                continue
+            ratio = float(new) / old
+            mark = ''
+            if ratio > threshold:
+                mark = '!'
+                regressions += 1
+            cols.append('%.2fx%s' % (ratio, mark))
+        sys.stdout.write("%-56s %10s %10s\n" % tuple([name] + cols))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('modules', metavar='MODULE', nargs='*',
+                        help='benchmark modules to run (default: all)')
+    parser.add_argument('-k', dest='pattern', metavar='PATTERN',
+                        help='run only benchmarks with PATTERN in name')
+    parser.add_argument('--save', metavar='NAME', nargs='?', const='',
+                        help='save results (default NAME: current commit)')
+    parser.add_argument('--compare', metavar='NAME',
+                        help='compare results with baseline NAME')
+    parser.add_argument('--threshold', type=float, default=1.1,
+                        help='ratio above which a result is reported as '
+                             'regression (default: %(default)s)')
+    parser.add_argument('--list', action='store_true',
+                        help='list stored baselines and exit')
+    args = parser.parse_args()
+
+    if args.list:
+        for path in sorted(glob.glob(baseline_path('*'))):
+            sys.stdout.write("%s\n" % os.path.basename(path)[:-5])
+        return 0
+
+    baseline = load(args.compare) if args.compare else None
+
+    recorder = _common.Recorder(args.pattern)
+    for name in (args.modules or modules()):
+        name = os.path.splitext(os.path.basename(name))[0]
+        importlib.import_module(name).run(recorder)
+
+    if args.save is not None:
+        save(args.save or default_name(), recorder.results)
+    if baseline is not None:
+        if compare(recorder.results, baseline, args.threshold):
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4 nospell:
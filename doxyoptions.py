@@ -22,63 +22,363 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE
+
 # Factory method
 
+import os
+import re
+import sys
+
+import SCons.Errors
+import SCons.Node.FS
+import SCons.Util
+
+from . import doxystats
+
 try:
     _int_types = (int, long)
 except NameError:
     _int_types = (int,)
 
+try:
+    _intern = sys.intern
+except AttributeError:
+    # Python 2
+    _intern = intern
+
+_space_re = re.compile(r'\s')
+_quote_re = re.compile(r'[\s"]')
+
+_class_map = None
+
+# Kinds of value classes (see DoxyValBase.kind()).
+_kinds = {}
+
+def _kind_class(kind):
+    """Returns the class of values of given `kind` (None if unknown)."""
+    global _class_map
+    if _class_map is None:
+        _class_map = {
+            'int'           : DoxyValInt,
+            'str'           : DoxyValStr,
+            'list'          : DoxyValList,
+            'dict'          : DoxyValDict,
+            'bool'          : DoxyValBool,
+            'entry'         : DoxyValEntry,
+            'file'          : DoxyValFile,
+            'dir'           : DoxyValDir,
+            'srcentry'      : DoxyValSrcEntry,
+            'srcfile'       : DoxyValSrcFile,
+            'srcdir'        : DoxyValSrcDir,
+            'dualentry'     : DoxyValDualEntry,
+            'dualfile'      : DoxyValDualFile,
+            'dualdir'       : DoxyValDualDir,
+            'entries'       : DoxyValEntries,
+            'files'         : DoxyValFiles,
+            'dirs'          : DoxyValDirs,
+            'srcentries'    : DoxyValSrcEntries,
+            'srcfiles'      : DoxyValSrcFiles,
+            'srcdirs'       : DoxyValSrcDirs,
+            'dualentries'   : DoxyValDualEntries,
+            'dualfiles'     : DoxyValDualFiles,
+            'dualdirs'      : DoxyValDualDirs,
+            'tagfile'       : DoxyValTagFile,
+            'tagfiles'      : DoxyValTagFiles,
+        }
+    return _class_map.get(kind)
+
 def DoxyVal(env, val, kind=None, **kw):
-    import SCons.Util
-    import SCons.Errors
-    _class_map = {
-        'int'           : DoxyValInt,
-        'str'           : DoxyValStr,
-        'list'          : DoxyValList,
-        'dict'          : DoxyValDict,
-        'bool'          : DoxyValBool,
-        'entry'         : DoxyValEntry,
-        'file'          : DoxyValFile,
-        'dir'           : DoxyValDir,
-        'srcentry'      : DoxyValSrcEntry,
-        'srcfile'       : DoxyValSrcFile,
-        'srcdir'        : DoxyValSrcDir,
-        'dualentry'     : DoxyValDualEntry,
-        'dualfile'      : DoxyValDualFile,
-        'dualdir'       : DoxyValDualDir,
-        'entries'       : DoxyValEntries,
-        'files'         : DoxyValFiles,
-        'dirs'          : DoxyValDirs,
-        'srcentries'    : DoxyValSrcEntries,
-        'srcfiles'      : DoxyValSrcFiles,
-        'srcdirs'       : DoxyValSrcDirs,
-        'dualentries'   : DoxyValDualEntries,
-        'dualfiles'     : DoxyValDualFiles,
-        'dualdirs'      : DoxyValDualDirs,
-    }
+    return _timed_doxyval(env, val, kind, False, kw)
+
+def _timed_doxyval(env, val, kind, shared, kw):
+    stats = doxystats.current
+    if stats is None:
+        return _doxyval(env, val, kind, shared, **kw)
+    start = doxystats.clock()
+    obj = _doxyval(env, val, kind, shared, **kw)
+    stats.add_time('DoxyVal:%s' % obj.kind(), doxystats.clock() - start)
+    return obj
+
+def _doxyval(env, val, kind=None, shared=False, **kw):
+    """Creates option value. If `shared` is True, an immutable instance
+    shared with other options may be returned for some values (see
+    :func:`_shared_value`)."""
     if kind is None:
         kind = type(val).__name__.lower()
     if kind is None:
         raise SCons.Errors.UserError("can not create doxygen option with no type")
     if not SCons.Util.is_String(kind):
         kind = kind.__name__.lower()
-    try:
-        klass = _class_map[kind]
-    except KeyError:
+    klass = _kind_class(kind)
+    if klass is None:
         raise SCons.Errors.UserError("can not create doxygen option of type %s" % kind)
+    if shared and type(val) in _shareable_types and (klass, val) in _shareable:
+        fmt = klass._format(**kw)
+        if fmt is klass._format():
+            return _shared_value(klass, val)
     return klass(env,val,**kw)
 
+# Formatting parameters
+
+class _DoxyFmt(object):
+    """Formatting parameters of option values.
+
+    Instances are interned (see :func:`_doxyfmt`) and shared by many values,
+    so they must not be modified."""
+    __slots__ = ('ssep', 'dsep', 'quot')
+
+    def __init__(self, ssep, dsep, quot):
+        self.ssep = ssep
+        self.dsep = dsep
+        self.quot = quot
+
+_formats = {}
+_default_formats = {}
+
+def _doxyfmt(ssep, dsep, quot):
+    key = (ssep, dsep, quot)
+    try:
+        return _formats[key]
+    except KeyError:
+        fmt = _DoxyFmt(ssep, dsep, quot)
+        _formats[key] = fmt
+        return fmt
+
+def _default_quot(s):
+    return "\"%s\"" % s
+
+def _canonical_quot(s):
+    return "\"%s\"" % s.replace('"', '\\"')
+
+# Shared values
+
+_shared = {}
+_shared_ids = set()
+
+def _shared_value(klass, val):
+    """Returns an immutable instance of `klass` holding `val`.
+
+    The instance is created once and then shared. It has no environment
+    attached, so this is only good for scalar kinds."""
+    key = (klass, val)
+    try:
+        return _shared[key]
+    except KeyError:
+        obj = klass(None, val)
+        _shared[key] = obj
+        _shared_ids.add(id(obj))
+        return obj
+
+# Path resolution
+#
+# Nodes never change their paths, so the paths written to Doxyfiles, the
+# source nodes and the values made of them are resolved once per node (and
+# per platform, which decides the escaping) and shared by all the options,
+# and all the Doxyfiles, referring to them.
+
+_abspaths = {}
+_relpaths = {}
+_srcnodes = {}
+_fs_values = {}
+# nodes looked up by strings, keyed by (factory, directory, string)
+_path_nodes = {}
+
+def _abspath(node):
+    """Returns the path of `node` as written to Doxyfile."""
+    key = (node, sys.platform)
+    try:
+        return _abspaths[key]
+    except KeyError:
+        pass
+    path = node.get_abspath()
+    if sys.platform == 'win32':
+        path = path.replace('\\', '\\\\')
+    _abspaths[key] = path
+    return path
+
+def _relpath(node, base):
+    """Returns the path of `node` relative to `base` directory, written with
+    forward slashes, so it's the same on every host."""
+    key = (node, base)
+    try:
+        return _relpaths[key]
+    except KeyError:
+        pass
+    try:
+        path = os.path.relpath(node.get_abspath(), base).replace(os.sep, '/')
+    except ValueError:
+        # on another drive
+        path = _abspath(node)
+    _relpaths[key] = path
+    return path
+
+class RenderContext(object):
+    """Parameters of rendering option values to a Doxyfile.
+
+    Paths are written relative to `base` (an absolute path of directory),
+    or as absolute paths if `base` is None. If `canonical` is set, logically
+    equal values are rendered the same: dicts are sorted by keys, duplicates
+    are removed from lists of paths and quoting doesn't depend on custom
+    formatting. The `fragments` maps names of options written to separate
+    files to the nodes of these files, such options are rendered as
+    ``@INCLUDE`` directives."""
+    __slots__ = ('base', 'canonical', 'fragments')
+
+    def __init__(self, base=None, canonical=False, fragments=None):
+        self.base = base
+        self.canonical = canonical
+        self.fragments = fragments
+
+    def key(self):
+        if not self.fragments:
+            return (self.base, self.canonical)
+        return (self.base, self.canonical,
+                tuple(sorted((k, self.path(v))
+                             for k, v in self.fragments.items())))
+
+    def path(self, node):
+        if self.base is None:
+            return _abspath(node)
+        return _relpath(node, self.base)
+
+    def include(self, name):
+        """Returns the text replacing option `name`, which is written to a
+        fragment file."""
+        # the option itself is assigned (+=) in the fragment
+        return '\n' + self.include_file(self.fragments[name])
+
+    def include_file(self, node):
+        """Returns ``@INCLUDE`` directive including file `node`."""
+        path = self.path(node)
+        if _space_re.search(path):
+            path = (_canonical_quot if self.canonical else _default_quot)(path)
+        return '@INCLUDE = %s' % path
+
+def _srcnode(node):
+    try:
+        return _srcnodes[node]
+    except KeyError:
+        src = node.srcnode()
+        _srcnodes[node] = src
+        return src
+
+def _fs_value(env, klass, node, fmt):
+    """Returns an immutable instance of path `klass` holding `node`, shared
+    by all the options referring to `node`."""
+    key = (klass, node, fmt)
+    stats = doxystats.current
+    try:
+        obj = _fs_values[key]
+    except KeyError:
+        pass
+    else:
+        if stats is not None:
+            stats.count('fs_values:hit')
+        return obj
+    if stats is not None:
+        stats.count('fs_values:miss')
+    obj = klass.__new__(klass)
+    obj._env = env
+    obj._fmt = fmt
+    obj._fs_assign(node)
+    _fs_values[key] = obj
+    _shared_ids.add(id(obj))
+    return obj
+
+def resolve_paths(env, vals, kind, fmt=None):
+    """Converts `vals` (strings or nodes) to a list of values of path `kind`
+    (e.g. ``'srcentry'`` or ``'dualfile'``).
+
+    The strings are converted to nodes in bulk (see :func:`lookup_nodes`)
+    and the values are taken from the shared cache, so this is much cheaper
+    than creating the values one by one."""
+    klass = _kind_class(kind)
+    if fmt is None:
+        fmt = klass._format()
+    if not SCons.Util.is_Sequence(vals):
+        vals = [vals]
+    nodes = lookup_nodes(env, vals, klass._fs_factory, kind)
+    return [_fs_value(env, klass, node, fmt) for node in nodes]
+
+def lookup_nodes(env, vals, factory, kind=None, cwd=None):
+    """Converts `vals` (strings or nodes) to nodes with `factory` (the name
+    of ``env.fs`` method, e.g. ``'File'``).
+
+    Relative paths are looked up in directory `cwd` (the current SConscript
+    directory by default), which is captured once for all the `vals`.
+    Strings without construction variables are looked up once per
+    directory, so a long list shared by many Doxyfiles (or assigned over and
+    over) costs a dict lookup per item."""
+    stats = doxystats.current
+    fs = env.fs
+    lookup = getattr(fs, factory)
+    if cwd is None:
+        cwd = fs.getcwd()
+    nodes = []
+    for val in vals:
+        if isinstance(val, SCons.Node.FS.Base):
+            nodes.append(val)
+            continue
+        if not SCons.Util.is_String(val):
+            raise SCons.Errors.UserError("can not set doxygen option of type %s to %r" % (kind or factory.lower(), val))
+        if '$' in val:
+            # depends on the environment, don't cache
+            nodes.append(lookup(env.subst(val, raw=1), cwd))
+            continue
+        key = (factory, cwd, val)
+        try:
+            node = _path_nodes[key]
+        except KeyError:
+            if stats is not None:
+                stats.count('path_nodes:miss')
+            node = lookup(val, cwd)
+            _path_nodes[key] = node
+        else:
+            if stats is not None:
+                stats.count('path_nodes:hit')
+        nodes.append(node)
+    return nodes
+
+class _PathList(object):
+    """Items of a path list option, stored compactly: a tuple of interned
+    strings, nodes and Nones, as assigned. The strings are looked up (in
+    bulk) in directory `cwd` with `factory` when the nodes are first needed,
+    and then the tuple holds only nodes (and Nones)."""
+    __slots__ = ('factory', 'cwd', 'items')
+
+    def __init__(self, factory, cwd, items):
+        self.factory = factory
+        self.cwd = cwd
+        self.items = items
+
+    def __len__(self):
+        return len(self.items)
+
+    def nodes(self, env, kind=None):
+        if self.cwd is not None:
+            found = iter(lookup_nodes(env, [x for x in self.items if x is not None],
+                                      self.factory, kind, self.cwd))
+            self.items = tuple(None if x is None else next(found)
+                               for x in self.items)
+            self.cwd = None
+        return self.items
 
 class DoxyValBase(object):
+    __slots__ = ('_env', '_fmt', '_value')
+
     def __init__(self, env, value=None, **kw):
         self._env = env
-        self._kw = { 'ssep' : self.default_ssep(),
-                     'dsep' : self.default_dsep(),
-                     'quot' : self.default_quot() }
-        self._kw.update(kw)
+        self._fmt = self._format(**kw)
         self.assign(value)
 
+    def __copy__(self):
+        # the copy of a shared value is an ordinary (modifiable) one
+        other = self.__class__.__new__(self.__class__)
+        other._env = self._env
+        other._fmt = self._fmt
+        other._value = self._value
+        return other
+
     @classmethod
     def default_ssep(cls):
         return ' '
@@ -87,89 +387,160 @@ class DoxyValBase(object):
         return '='
     @classmethod
     def default_quot(cls):
-        return lambda s :  "\"%s\"" % s
+        return _default_quot
+    @classmethod
+    def _format(cls, fmt=None, **kw):
+        if fmt is not None:
+            return fmt
+        if not kw:
+            try:
+                return _default_formats[cls]
+            except KeyError:
+                fmt = _doxyfmt(cls.default_ssep(), cls.default_dsep(),
+                               cls.default_quot())
+                _default_formats[cls] = fmt
+                return fmt
+        return _doxyfmt(kw.get('ssep', cls.default_ssep()),
+                        kw.get('dsep', cls.default_dsep()),
+                        kw.get('quot', cls.default_quot()))
     @classmethod
     def kind(cls):
-        import re
-        return re.sub(r'^DoxyVal', '', cls.__name__).lower()
+        try:
+            return _kinds[cls]
+        except KeyError:
+            pass
+        name = cls.__name__
+        if name.startswith('DoxyVal'):
+            name = name[len('DoxyVal'):]
+        kind = _kinds[cls] = name.lower()
+        return kind
+    def value(self):
+        """Returns the assigned value (a list of values for sequences)."""
+        return self._value
     def assign(self, val):
+        if id(self) in _shared_ids:
+            raise TypeError("can not modify shared doxygen option value")
         if val is None: self._value = val
         else: self._assign(val)
     def _assign(self, val):
         raise NotImplementedError
     def __str__(self):
         return ('' if self._value is None else self._str())
-    def _str(self):
+    def render(self, ctx=None):
+        """Returns the value as written to Doxyfile, with paths written as
+        decided by `ctx` (:class:`RenderContext`, absolute paths if None)."""
+        return ('' if self._value is None else self._str(ctx))
+    def iter_render(self, ctx=None):
+        """Yields the value, as returned by :meth:`render`, in pieces."""
+        yield self.render(ctx)
+    def _str(self, ctx=None):
         raise NotImplementedError
 
 class DoxyValStr(DoxyValBase):
+    __slots__ = ()
     def _assign(self,val):
-        import SCons.Util
-        import SCons.Errors
         if not SCons.Util.is_String(val):
             raise SCons.Errors.UserError("can not set doxygen option of string type to %r" % val)
         self._value = val
-    def _str(self):
-        return  self._str_str("%s" % self._value)
-    def _str_str(self,s):
-        import re
-        return (self._kw['quot'](s) if re.search(r'\s',s) else s)
+    def _str(self, ctx=None):
+        return  self._str_str("%s" % self._value, ctx)
+    def _str_str(self, s, ctx=None):
+        return _quote_str(self._fmt, s, ctx)
+
+def _quote_str(fmt, s, ctx=None):
+    """Quotes string `s` as needed, with `fmt` or as `ctx` decides."""
+    if ctx is not None and ctx.canonical:
+        return (_canonical_quot(s) if _quote_re.search(s) else s)
+    return (fmt.quot(s) if _space_re.search(s) else s)
 
 class DoxyValInt(DoxyValBase):
+    __slots__ = ()
     def _assign(self, val):
-        import SCons.Util
-        import SCons.Errors
         global _int_types
         if not isinstance(val, _int_types):
             raise SCons.Errors.UserError("can not set doxygen option of type int to %r" % val)
         self._value = val
-    def _str(self):
+    def _str(self, ctx=None):
         return "%s" % self._value
 
 class DoxyValBool(DoxyValBase):
+    __slots__ = ()
     def _assign(self, val):
-        import SCons.Errors
         if val == 'YES': val = True
         elif val == 'NO': val = False
         if not isinstance(val, bool) and not isinstance(val, _int_types):
             raise SCons.Errors.UserError("can not set doxygen option of type bool to %r" % val)
         self._value = bool(val)
-    def _str(self):
+    def _str(self, ctx=None):
         return ('YES' if self._value else 'NO')
 
 class DoxyValSeq(DoxyValBase):
-    def _str_seq(self,seq):
-        return self._kw['ssep'].join([('' if x is None else "%s" % x) for x in seq])
+    __slots__ = ()
+    def _str_seq(self, seq, ctx=None):
+        return self._fmt.ssep.join([('' if x is None else x.render(ctx)) for x in seq])
 
 class DoxyValList(DoxyValSeq):
+    __slots__ = ()
     def _assign(self, val):
-        import SCons.Util
         if SCons.Util.is_Sequence(val):
             pass
         elif SCons.Util.is_Scalar(val):
             val = [val]
         else:
             raise SCons.Errors.UserError("can not set doxygen option of type list to %r" % val)
-        self._value = [DoxyVal(self._env, v, self.item_kind(), **self._kw) for v in val]
+        self._value = [DoxyVal(self._env, v, self.item_kind(), fmt=self._fmt) for v in val]
     @classmethod
     def item_kind(cls):
         return None # deduce type ...
-    def _str(self):
-        return super(DoxyValList,self)._str_seq(self._value)
+    def size(self):
+        """Returns the number of items (None if the value is None)."""
+        return None if self._value is None else len(self._value)
+    def _str(self, ctx=None):
+        return super(DoxyValList,self)._str_seq(self._value, ctx)
+    def iter_render(self, ctx=None):
+        if self._value is None:
+            return iter(())
+        return self._iter_join(('' if x is None else x.render(ctx))
+                               for x in self._value)
+    def _iter_join(self, items):
+        ssep = self._fmt.ssep
+        for i, item in enumerate(items):
+            if i:
+                yield ssep
+            yield item
 
 class DoxyValDict(DoxyValSeq):
+    __slots__ = ()
     def _assign(self, val):
-        import SCons.Util
-        import SCons.Errors
         if not isinstance(val, dict):
             raise SCons.Errors.UserError("can not set doxygen option of type int to %r" % val)
-        self._value = dict([(k,DoxyVal(self._env, v, **self._kw)) for k,v in val.items()])
-    def _str(self):
-        f = lambda k,v : "%s%s%s" % (k, self._kw['dsep'], ('' if v is None else v))
-        items = [f(k,v) for (k,v) in self._value.items()]
-        return super(DoxyValDict,self)._str_seq(items)
+        self._value = dict([(k,DoxyVal(self._env, v, fmt=self._fmt)) for k,v in val.items()])
+    def _str(self, ctx=None):
+        f = lambda k,v : "%s%s%s" % (k, self._fmt.dsep, ('' if v is None else v.render(ctx)))
+        items = self._value.items()
+        if ctx is not None and ctx.canonical:
+            items = sorted(items, key=lambda kv: str(kv[0]))
+        items = [f(k,v) for (k,v) in items]
+        return self._fmt.ssep.join(items)
 
 class DoxyValFsList(DoxyValList):
+    __slots__ = ()
+    def _str(self, ctx=None):
+        if ctx is None or not ctx.canonical:
+            return super(DoxyValFsList, self)._str(ctx)
+        return self._fmt.ssep.join(self._unique(ctx))
+    def iter_render(self, ctx=None):
+        if ctx is None or not ctx.canonical:
+            return super(DoxyValFsList, self).iter_render(ctx)
+        return self._iter_join(self._unique(ctx))
+    def _unique(self, ctx):
+        # the same path listed twice means nothing more than once
+        seen = set()
+        for x in self._value:
+            item = x.render(ctx)
+            if item not in seen:
+                seen.add(item)
+                yield item
     @classmethod
     def default_ssep(cls):
         return " \\\n"
@@ -177,36 +548,109 @@ class DoxyValFsList(DoxyValList):
     def item_kind(cls):
         raise NotImplementedError # force subclasses to show their item types
 
+class DoxyValPathList(DoxyValFsList):
+    """List of paths, stored compactly (see :class:`_PathList`).
+
+    No value is created per item: the strings are converted to nodes in bulk
+    when the list is first rendered, and the paths are written straight from
+    the nodes. The :meth:`value` is built on demand."""
+    __slots__ = ()
+    def _assign(self, val):
+        if SCons.Util.is_Sequence(val):
+            pass
+        elif SCons.Util.is_Scalar(val):
+            val = [val]
+        else:
+            raise SCons.Errors.UserError("can not set doxygen option of type list to %r" % val)
+        kind = self.item_kind()
+        factory = _kind_class(kind)._fs_factory
+        cwd = self._env.fs.getcwd()
+        items = []
+        for v in val:
+            if v is None or isinstance(v, SCons.Node.FS.Base):
+                pass
+            elif not SCons.Util.is_String(v):
+                raise SCons.Errors.UserError("can not set doxygen option of type %s to %r" % (kind, v))
+            elif '$' in v:
+                # depends on the environment as it's now
+                v = lookup_nodes(self._env, [v], factory, kind, cwd)[0]
+            else:
+                v = _intern(v)
+            items.append(v)
+        self._value = _PathList(factory, cwd, tuple(items))
+    def value(self):
+        if self._value is None:
+            return None
+        kind = self.item_kind()
+        klass = _kind_class(kind)
+        return [(DoxyVal(self._env, None, kind, fmt=self._fmt) if node is None
+                 else _fs_value(self._env, klass, node, self._fmt))
+                for node in self._value.nodes(self._env, kind)]
+    def nodes(self):
+        """Returns the nodes written to Doxyfile, in order (for dual kinds,
+        the source node follows its build node)."""
+        if self._value is None:
+            return []
+        kind = self.item_kind()
+        fs_nodes = _kind_class(kind)._fs_nodes
+        return [n for node in self._value.nodes(self._env, kind)
+                if node is not None for n in fs_nodes(node)]
+    def _str(self, ctx=None):
+        return self._fmt.ssep.join(self._paths(ctx))
+    def iter_render(self, ctx=None):
+        if self._value is None:
+            return iter(())
+        return self._iter_join(self._paths(ctx))
+    def _paths(self, ctx):
+        kind = self.item_kind()
+        fs_nodes = _kind_class(kind)._fs_nodes
+        fmt = self._fmt
+        path = _abspath if ctx is None else ctx.path
+        # the same path listed twice means nothing more than once
+        seen = set() if ctx is not None and ctx.canonical else None
+        for node in self._value.nodes(self._env, kind):
+            for n in ((None,) if node is None else fs_nodes(node)):
+                item = '' if n is None else _quote_str(fmt, path(n), ctx)
+                if seen is not None:
+                    if item in seen:
+                        continue
+                    seen.add(item)
+                yield item
+
 class DoxyValFsBase(DoxyValStr):
+    __slots__ = ()
+    # name of the ``env.fs`` method creating nodes (None, if not applicable)
+    _fs_factory = None
     def _assign(self, val):
-        import SCons.Util
-        import SCons.Errors
-        import SCons.Node.FS
         if isinstance(val, SCons.Node.FS.Base):
             self._fs_assign(val)
         elif SCons.Util.is_String(val):
             self._fs_assign(self._fs_create(val))
         else:
             raise SCons.Errors.UserError("can not set doxygen option of type %s to %r" % (self.kind(),val))
-    def _str(self):
-        import sys
-        if sys.platform == 'win32':
-            return self._str_str(self._value.get_abspath().replace('\\', '\\\\'))
-        else:
-            return self._str_str(self._value.get_abspath())
+    def _str(self, ctx=None):
+        path = _abspath(self._value) if ctx is None else ctx.path(self._value)
+        return self._str_str(path, ctx)
     def _fs_assign(self,val):
         self._value = val
     def _fs_create(self,val):
         raise NotImplementedError
+    @classmethod
+    def _fs_nodes(cls, node):
+        # nodes written for `node` by a list of these values
+        return (node,)
 
 class DoxyValFsSrcBase(DoxyValFsBase):
+    __slots__ = ()
     def _fs_assign(self, val):
-        self._value = val.srcnode()
+        self._value = _srcnode(val)
+    @classmethod
+    def _fs_nodes(cls, node):
+        return (_srcnode(node),)
 
 class DoxyValFsDualBase(DoxyValFsList):
+    __slots__ = ()
     def _assign(self, val):
-        import SCons.Util
-        import SCons.Node.FS
         if isinstance(val,SCons.Node.FS.Base):
             pass
         elif SCons.Util.is_String(val):
@@ -215,38 +659,56 @@ class DoxyValFsDualBase(DoxyValFsList):
             raise SCons.Errors.UserError("can not set doxygen option of type %s to %r" % (self.kind(),val))
         self._fs_assign(val)
     def _fs_assign(self,val):
-        src = val.srcnode()
-        ik = self.item_kind()
-        vals = [ DoxyVal(self._env, val, ik, **self._kw) ]
+        src = _srcnode(val)
+        klass = _kind_class(self.item_kind())
+        vals = [ _fs_value(self._env, klass, val, self._fmt) ]
         if val != src:
-            vals.append(DoxyVal(self._env, src, ik, **self._kw))
+            vals.append(_fs_value(self._env, klass, src, self._fmt))
         self._value = vals
+    @classmethod
+    def _fs_nodes(cls, node):
+        src = _srcnode(node)
+        return (node,) if node == src else (node, src)
 
 class DoxyValEntry(DoxyValFsBase):
+    __slots__ = ()
+    _fs_factory = 'Entry'
     def _fs_create(self,val):
         return self._env.Entry(val)
 
 class DoxyValFile(DoxyValFsBase):
+    __slots__ = ()
+    _fs_factory = 'File'
     def _fs_create(self,val):
         return self._env.File(val)
 
 class DoxyValDir(DoxyValFsBase):
+    __slots__ = ()
+    _fs_factory = 'Dir'
     def _fs_create(self,val):
         return self._env.Dir(val)
 
 class DoxyValSrcEntry(DoxyValFsSrcBase):
+    __slots__ = ()
+    _fs_factory = 'Entry'
     def _fs_create(self,val):
         return self._env.Entry(val).srcnode()
 
 class DoxyValSrcFile(DoxyValFsSrcBase):
+    __slots__ = ()
+    _fs_factory = 'File'
     def _fs_create(self,val):
         return self._env.File(val).srcnode()
 
 class DoxyValSrcDir(DoxyValFsSrcBase):
+    __slots__ = ()
+    _fs_factory = 'Dir'
     def _fs_create(self,val):
         return self._env.Dir(val).srcnode()
 
 class DoxyValDualEntry(DoxyValFsDualBase):
+    __slots__ = ()
+    _fs_factory = 'Entry'
     @classmethod
     def item_kind(cls):
         return 'entry'
@@ -254,6 +716,8 @@ class DoxyValDualEntry(DoxyValFsDualBase):
         return self._env.Entry(val)
 
 class DoxyValDualFile(DoxyValFsDualBase):
+    __slots__ = ()
+    _fs_factory = 'File'
     @classmethod
     def item_kind(cls):
         return 'file'
@@ -261,324 +725,159 @@ class DoxyValDualFile(DoxyValFsDualBase):
         return self._env.File(val)
 
 class DoxyValDualDir(DoxyValFsDualBase):
+    __slots__ = ()
+    _fs_factory = 'Dir'
     @classmethod
     def item_kind(cls):
         return 'dir'
     def _fs_create(self,val):
         return self._env.Dir(val)
 
-class DoxyValEntries(DoxyValFsList):
+class DoxyValEntries(DoxyValPathList):
+    __slots__ = ()
     @classmethod
     def item_kind(cls):
         return 'entry'
 
-class DoxyValFiles(DoxyValFsList):
+class DoxyValFiles(DoxyValPathList):
+    __slots__ = ()
     @classmethod
     def item_kind(cls):
         return 'file'
 
-class DoxyValDirs(DoxyValFsList):
+class DoxyValDirs(DoxyValPathList):
+    __slots__ = ()
     @classmethod
     def item_kind(cls):
         return 'dir'
 
-class DoxyValSrcEntries(DoxyValFsList):
+class DoxyValSrcEntries(DoxyValPathList):
+    __slots__ = ()
     @classmethod
     def item_kind(cls):
         return 'srcentry'
 
-class DoxyValSrcFiles(DoxyValFsList):
+class DoxyValSrcFiles(DoxyValPathList):
+    __slots__ = ()
     @classmethod
     def item_kind(cls):
         return 'srcfile'
 
-class DoxyValSrcDirs(DoxyValFsList):
+class DoxyValSrcDirs(DoxyValPathList):
+    __slots__ = ()
     @classmethod
     def item_kind(cls):
         return 'srcdir'
 
-class DoxyValDualEntries(DoxyValFsList):
+class DoxyValDualEntries(DoxyValPathList):
+    __slots__ = ()
     @classmethod
     def item_kind(cls):
         return 'dualentry'
 
-class DoxyValDualFiles(DoxyValFsList):
+class DoxyValDualFiles(DoxyValPathList):
+    __slots__ = ()
     @classmethod
     def item_kind(cls):
         return 'dualfile'
 
-class DoxyValDualDirs(DoxyValFsList):
+class DoxyValDualDirs(DoxyValPathList):
+    __slots__ = ()
     @classmethod
     def item_kind(cls):
         return 'dualdir'
 
-def doxyoptions(env):
-    import os;
-    # NOTE: this may sometimes give wrong result, but I have no better idea how
-    # to determine case sensitiveness, some people say, that this gives wrong
-    # answer on Mac OS for example (I don't have one to test it)
-    #
-    # See also:
-    # http://stackoverflow.com/questions/7870041/check-if-file-system-is-case-insensitive-in-python
-    case_sense_names = (os.path.normcase('A') != os.path.normcase('a'))
-    opts = {
-        'ABBREVIATE_BRIEF'          : DoxyVal(env, ''),
-        'ALIASES'                   : DoxyVal(env, ''),
-        'ALLEXTERNALS'              : DoxyVal(env, False),
-        'ALPHABETICAL_INDEX'        : DoxyVal(env, True),
-        'ALWAYS_DETAILED_SEC'       : DoxyVal(env, False),
-        'AUTOLINK_SUPPORT'          : DoxyVal(env, True),
-        'BINARY_TOC'                : DoxyVal(env, False),
-        'BRIEF_MEMBER_DESC'         : DoxyVal(env, True),
-        'BUILTIN_STL_SUPPORT'       : DoxyVal(env, False),
-        'CALLER_GRAPH'              : DoxyVal(env, False),
-        'CALL_GRAPH'                : DoxyVal(env, False),
-        'CASE_SENSE_NAMES'          : DoxyVal(env, case_sense_names),
-        'CHM_FILE'                  : DoxyVal(env, None, 'file'),
-        'CHM_FILE'                  : DoxyVal(env, None, 'srcfile'),
-        'CHM_INDEX_ENCODING'        : DoxyVal(env, ''),
-        'CITE_BIB_FILES'            : DoxyVal(env, None, 'files'),
-        'CLANG_ASSISTED_PARSING'    : DoxyVal(env, False),
-        'CLANG_OPTIONS'             : DoxyVal(env, ''),
-        'CLASS_DIAGRAMS'            : DoxyVal(env, True),
-        'CLASS_GRAPH'               : DoxyVal(env, True),
-        'COLLABORATION_GRAPH'       : DoxyVal(env, True),
-        'COLS_IN_ALPHA_INDEX'       : DoxyVal(env, ''),
-        'COMPACT_LATEX'             : DoxyVal(env, False),
-        'COMPACT_RTF'               : DoxyVal(env, False),
-        'CPP_CLI_SUPPORT'           : DoxyVal(env, False),
-        'CREATE_SUBDIRS'            : DoxyVal(env, False),
-        'DIRECTORY_GRAPH'           : DoxyVal(env, True),
-        'DISABLE_INDEX'             : DoxyVal(env, False),
-        'DISTRIBUTE_GROUP_DOC'      : DoxyVal(env, False),
-        'DOCBOOK_OUTPUT'            : DoxyVal(env, None, 'dir'),
-        'DOCSET_BUNDLE_ID'          : DoxyVal(env, 'org.doxygen.Project'),
-        'DOCSET_FEEDNAME'           : DoxyVal(env, 'Doxygen generated docs'),
-        'DOCSET_PUBLISHER_ID'       : DoxyVal(env, 'org.doxygen.Publisher'),
-        'DOCSET_PUBLISHER_NAME'     : DoxyVal(env, 'Publisher'),
-        'DOTFILE_DIRS'              : DoxyVal(env, None, 'srcdirs'),
-        'DOT_CLEANUP'               : DoxyVal(env, True),
-        'DOT_FONTNAME'              : DoxyVal(env, 'Helvetica'),
-        'DOT_FONTPATH'              : DoxyVal(env, None, 'srcdir'),
-        'DOT_FONTSIZE'              : DoxyVal(env, 10),
-        'DOT_GRAPH_MAX_NODES'       : DoxyVal(env, 50),
-        'DOT_IMAGE_FORMAT'          : DoxyVal(env, 'png'),
-        'DOT_MULTI_TARGETS'         : DoxyVal(env, False),
-        'DOT_NUM_THREADS'           : DoxyVal(env, 0),
-        'DOT_PATH'                  : DoxyVal(env, ''),
-        'DOT_TRANSPARENT'           : DoxyVal(env, False),
-        'DOXYFILE_ENCODING'         : DoxyVal(env, 'UTF-8'),
-        'ECLIPSE_DOC_ID'            : DoxyVal(env, 'org.doxygen.Project'),
-        'ENABLED_SECTIONS'          : DoxyVal(env, ''),
-        'ENABLE_PREPROCESSING'      : DoxyVal(env, True),
-        'ENUM_VALUES_PER_LINE'      : DoxyVal(env, 4),
-        'EXAMPLE_PATH'              : DoxyVal(env, None, 'srcdirs'),
-        'EXAMPLE_PATTERNS'          : DoxyVal(env, ''),
-        'EXAMPLE_RECURSIVE'         : DoxyVal(env, False),
-        'EXCLUDE'                   : DoxyVal(env, None, 'srcdirs'),
-        'EXCLUDE_PATTERNS'          : DoxyVal(env, ''),
-        'EXCLUDE_SYMBOLS'           : DoxyVal(env, ''),
-        'EXCLUDE_SYMLINKS'          : DoxyVal(env, False),
-        'EXPAND_AS_DEFINED'         : DoxyVal(env, []),
-        'EXPAND_ONLY_PREDEF'        : DoxyVal(env, False),
-        'EXTENSION_MAPPING'         : DoxyVal(env, ''),
-        'EXTERNAL_GROUPS'           : DoxyVal(env, True),
-        'EXTERNAL_PAGES'            : DoxyVal(env, True),
-        'EXTERNAL_SEARCH'           : DoxyVal(env, False),
-        'EXTERNAL_SEARCH_ID'        : DoxyVal(env, ''),
-        'EXTRACT_ALL'               : DoxyVal(env, False),
-        'EXTRACT_ANON_NSPACES'      : DoxyVal(env, False),
-        'EXTRACT_LOCAL_CLASSES'     : DoxyVal(env, True),
-        'EXTRACT_LOCAL_METHODS'     : DoxyVal(env, False),
-        'EXTRACT_PACKAGE'           : DoxyVal(env, False),
-        'EXTRACT_PRIVATE'           : DoxyVal(env, False),
-        'EXTRACT_STATIC'            : DoxyVal(env, False),
-        'EXTRA_PACKAGES'            : DoxyVal(env, ''),
-        'EXTRA_SEARCH_MAPPINGS'     : DoxyVal(env, ''),
-        'EXT_LINKS_IN_WINDOW'       : DoxyVal(env, False),
-        'FILE_PATTERNS'             : DoxyVal(env, ''),
-        'FILE_VERSION_FILTER'       : DoxyVal(env, ''),
-        'FILTER_PATTERNS'           : DoxyVal(env, {}),
-        'FILTER_SOURCE_FILES'       : DoxyVal(env, False),
-        'FILTER_SOURCE_PATTERNS'    : DoxyVal(env, {}),
-        'FORCE_LOCAL_INCLUDES'      : DoxyVal(env, False),
-        'FORMULA_FONTSIZE'          : DoxyVal(env, 10),
-        'FORMULA_TRANSPARENT'       : DoxyVal(env, True),
-        'FULL_PATH_NAMES'           : DoxyVal(env, True),
-        'GENERATE_AUTOGEN_DEF'      : DoxyVal(env, False),
-        'GENERATE_BUGLIST'          : DoxyVal(env, True),
-        'GENERATE_CHI'              : DoxyVal(env, False),
-        'GENERATE_DEPRECATEDLIST'   : DoxyVal(env, True),
-        'GENERATE_DOCBOOK'          : DoxyVal(env, False),
-        'GENERATE_DOCSET'           : DoxyVal(env, False),
-        'GENERATE_ECLIPSEHELP'      : DoxyVal(env, False),
-        'GENERATE_HTML'             : DoxyVal(env, True),
-        'GENERATE_HTMLHELP'         : DoxyVal(env, False),
-        'GENERATE_LATEX'            : DoxyVal(env, True),
-        'GENERATE_LEGEND'           : DoxyVal(env, True),
-        'GENERATE_MAN'              : DoxyVal(env, False),
-        'GENERATE_PERLMOD'          : DoxyVal(env, False),
-        'GENERATE_QHP'              : DoxyVal(env, False),
-        'GENERATE_RTF'              : DoxyVal(env, False),
-        'GENERATE_TAGFILE'          : DoxyVal(env, None, 'file'),
-        'GENERATE_TESTLIST'         : DoxyVal(env, True),
-        'GENERATE_TODOLIST'         : DoxyVal(env, True),
-        'GENERATE_TREEVIEW'         : DoxyVal(env, False),
-        'GENERATE_XML'              : DoxyVal(env, False),
-        'GRAPHICAL_HIERARCHY'       : DoxyVal(env, True),
-        'GROUP_GRAPHS'              : DoxyVal(env, True),
-        'HAVE_DOT'                  : DoxyVal(env, False),
-        'HHC_LOCATION'              : DoxyVal(env, ''),
-        'HIDE_FRIEND_COMPOUNDS'     : DoxyVal(env, False),
-        'HIDE_IN_BODY_DOCS'         : DoxyVal(env, False),
-        'HIDE_SCOPE_NAMES'          : DoxyVal(env, False),
-        'HIDE_UNDOC_CLASSES'        : DoxyVal(env, False),
-        'HIDE_UNDOC_MEMBERS'        : DoxyVal(env, False),
-        'HIDE_UNDOC_RELATIONS'      : DoxyVal(env, True),
-        'HTML_COLORSTYLE_GAMMA'     : DoxyVal(env, 80),
-        'HTML_COLORSTYLE_HUE'       : DoxyVal(env, 220),
-        'HTML_COLORSTYLE_SAT'       : DoxyVal(env, 100),
-        'HTML_DYNAMIC_SECTIONS'     : DoxyVal(env, False),
-        'HTML_EXTRA_FILES'          : DoxyVal(env, None, 'srcfiles'),
-        'HTML_EXTRA_STYLESHEET'     : DoxyVal(env, None, 'srcfile'),
-        'HTML_FILE_EXTENSION'       : DoxyVal(env, '.html'),
-        'HTML_FOOTER'               : DoxyVal(env, None, 'srcfile'),
-        'HTML_HEADER'               : DoxyVal(env, None, 'srcfile'),
-        'HTML_INDEX_NUM_ENTRIES'    : DoxyVal(env, 100),
-        'HTML_OUTPUT'               : DoxyVal(env, 'html'),
-        'HTML_STYLESHEET'           : DoxyVal(env, None, 'srcfile'),
-        'HTML_TIMESTAMP'            : DoxyVal(env, True),
-        'IDL_PROPERTY_SUPPORT'      : DoxyVal(env, True),
-        'IGNORE_PREFIX'             : DoxyVal(env, ''),
-        'IMAGE_PATH'                : DoxyVal(env, None, 'srcdirs'),
-        'INCLUDED_BY_GRAPH'         : DoxyVal(env, True),
-        'INCLUDE_FILE_PATTERNS'     : DoxyVal(env, ''),
-        'INCLUDE_GRAPH'             : DoxyVal(env, True),
-        'INCLUDE_PATH'              : DoxyVal(env, None, 'srcdirs'),
-        'INHERIT_DOCS'              : DoxyVal(env, True),
-        'INLINE_GROUPED_CLASSES'    : DoxyVal(env, False),
-        'INLINE_INFO'               : DoxyVal(env, True),
-        'INLINE_INHERITED_MEMB'     : DoxyVal(env, False),
-        'INLINE_SIMPLE_STRUCTS'     : DoxyVal(env, False),
-        'INLINE_SOURCES'            : DoxyVal(env, False),
-        'INPUT'                     : DoxyVal(env, None, 'srcentries'),
-        'INPUT_ENCODING'            : DoxyVal(env, 'UTF-8'),
-        'INPUT_FILTER'              : DoxyVal(env, ''),
-        'INTERACTIVE_SVG'           : DoxyVal(env, False),
-        'INTERNAL_DOCS'             : DoxyVal(env, False),
-        'JAVADOC_AUTOBRIEF'         : DoxyVal(env, False),
-        'LATEX_BATCHMODE'           : DoxyVal(env, False),
-        'LATEX_BIB_STYLE'           : DoxyVal(env, ''),
-        'LATEX_CMD_NAME'            : DoxyVal(env, 'latex'),
-        'LATEX_EXTRA_FILES'         : DoxyVal(env, None, 'srcfiles'),
-        'LATEX_FOOTER'              : DoxyVal(env, None, 'srcfile'),
-        'LATEX_HEADER'              : DoxyVal(env, None, 'srcfile'),
-        'LATEX_HIDE_INDICES'        : DoxyVal(env, False),
-        'LATEX_OUTPUT'              : DoxyVal(env, 'latex'),
-        'LATEX_SOURCE_CODE'         : DoxyVal(env, False),
-        'LAYOUT_FILE'               : DoxyVal(env, None, 'srcfile'),
-        'LOOKUP_CACHE_SIZE'         : DoxyVal(env, 0),
-        'MACRO_EXPANSION'           : DoxyVal(env, False),
-        'MAKEINDEX_CMD_NAME'        : DoxyVal(env, 'makeindex'),
-        'MAN_EXTENSION'             : DoxyVal(env, '.3'),
-        'MAN_LINKS'                 : DoxyVal(env, False),
-        'MAN_OUTPUT'                : DoxyVal(env, 'man'),
-        'MARKDOWN_SUPPORT'          : DoxyVal(env, True),
-        'MATHJAX_CODEFILE'          : DoxyVal(env, None, 'srcfile'),
-        'MATHJAX_EXTENSIONS'        : DoxyVal(env, ''),
-        'MATHJAX_FORMAT'            : DoxyVal(env, 'HTML-CSS'),
-        'MATHJAX_RELPATH'           : DoxyVal(env, 'http://cdn.mathjax.org/mathjax/latest'),
-        'MAX_DOT_GRAPH_DEPTH'       : DoxyVal(env, 0),
-        'MAX_INITIALIZER_LINES'     : DoxyVal(env, 30),
-        'MSCFILE_DIRS'              : DoxyVal(env, None, 'dirs'),
-        'MSCGEN_PATH'               : DoxyVal(env, ''),
-        'MULTILINE_CPP_IS_BRIEF'    : DoxyVal(env, False),
-        'OPTIMIZE_FOR_FORTRAN'      : DoxyVal(env, False),
-        'OPTIMIZE_OUTPUT_FOR_C'     : DoxyVal(env, False),
-        'OPTIMIZE_OUTPUT_JAVA'      : DoxyVal(env, False),
-        'OPTIMIZE_OUTPUT_VHDL'      : DoxyVal(env, False),
-        'OUTPUT_DIRECTORY'          : DoxyVal(env, None, 'dir'),
-        'OUTPUT_LANGUAGE'           : DoxyVal(env, 'English'),
-        'PAPER_TYPE'                : DoxyVal(env, 'a4'),
-        'PDF_HYPERLINKS'            : DoxyVal(env, True),
-        'PERLMOD_LATEX'             : DoxyVal(env, False),
-        'PERLMOD_MAKEVAR_PREFIX'    : DoxyVal(env, ''),
-        'PERLMOD_PRETTY'            : DoxyVal(env, True),
-        'PERL_PATH'                 : DoxyVal(env, '/usr/bin/perl'),
-        'PREDEFINED'                : DoxyVal(env, []),
-        'PROJECT_BRIEF'             : DoxyVal(env, ''),
-        'PROJECT_LOGO'              : DoxyVal(env, ''),
-        'PROJECT_NAME'              : DoxyVal(env, 'My Project'),
-        'PROJECT_NUMBER'            : DoxyVal(env, ''),
-        'QCH_FILE'                  : DoxyVal(env, ''),
-        'QHG_LOCATION'              : DoxyVal(env, ''),
-        'QHP_CUST_FILTER_ATTRS'     : DoxyVal(env, ''),
-        'QHP_CUST_FILTER_NAME'      : DoxyVal(env, ''),
-        'QHP_NAMESPACE'             : DoxyVal(env, ''),
-        'QHP_SECT_FILTER_ATTRS'     : DoxyVal(env, ''),
-        'QHP_VIRTUAL_FOLDER'        : DoxyVal(env, 'doc'),
-        'QT_AUTOBRIEF'              : DoxyVal(env, False),
-        'QUIET'                     : DoxyVal(env, False),
-        'RECURSIVE'                 : DoxyVal(env, False),
-        'REFERENCED_BY_RELATION'    : DoxyVal(env, False),
-        'REFERENCES_LINK_SOURCE'    : DoxyVal(env, True),
-        'REFERENCES_RELATION'       : DoxyVal(env, False),
-        'REPEAT_BRIEF'              : DoxyVal(env, True),
-        'RTF_EXTENSIONS_FILE'       : DoxyVal(env, None, 'file'),
-        'RTF_HYPERLINKS'            : DoxyVal(env, False),
-        'RTF_OUTPUT'                : DoxyVal(env, 'rtf'),
-        'RTF_STYLESHEET_FILE'       : DoxyVal(env, None, 'file'),
-        'SEARCHDATA_FILE'           : DoxyVal(env, 'searchdata.xml'),
-        'SEARCHENGINE'              : DoxyVal(env, True),
-        'SEARCHENGINE_URL'          : DoxyVal(env, ''),
-        'SEARCH_INCLUDES'           : DoxyVal(env, True),
-        'SEPARATE_MEMBER_PAGES'     : DoxyVal(env, False),
-        'SERVER_BASED_SEARCH'       : DoxyVal(env, False),
-        'SHORT_NAMES'               : DoxyVal(env, False),
-        'SHOW_FILES'                : DoxyVal(env, True),
-        'SHOW_INCLUDE_FILES'        : DoxyVal(env, True),
-        'SHOW_NAMESPACES'           : DoxyVal(env, True),
-        'SHOW_USED_FILES'           : DoxyVal(env, True),
-        'SIP_SUPPORT'               : DoxyVal(env, False),
-        'SKIP_FUNCTION_MACROS'      : DoxyVal(env, True),
-        'SORT_BRIEF_DOCS'           : DoxyVal(env, False),
-        'SORT_BY_SCOPE_NAME'        : DoxyVal(env, False),
-        'SORT_GROUP_NAMES'          : DoxyVal(env, False),
-        'SORT_MEMBERS_CTORS_1ST'    : DoxyVal(env, False),
-        'SORT_MEMBER_DOCS'          : DoxyVal(env, True),
-        'SOURCE_BROWSER'            : DoxyVal(env, False),
-        'SOURCE_TOOLTIPS'           : DoxyVal(env, True),
-        'STRICT_PROTO_MATCHING'     : DoxyVal(env, False),
-        'STRIP_CODE_COMMENTS'       : DoxyVal(env, True),
-        'STRIP_FROM_INC_PATH'       : DoxyVal(env, None, 'srcdirs'),
-        'STRIP_FROM_PATH'           : DoxyVal(env, None, 'srcdirs'),
-        'SUBGROUPING'               : DoxyVal(env, True),
-        'TAB_SIZE'                  : DoxyVal(env, 4),
-        'TAGFILES'                  : DoxyVal(env, ''),
-        'TCL_SUBST'                 : DoxyVal(env, ''),
-        'TEMPLATE_RELATIONS'        : DoxyVal(env, False),
-        'TOC_EXPAND'                : DoxyVal(env, False),
-        'TREEVIEW_WIDTH'            : DoxyVal(env, 250),
-        'TYPEDEF_HIDES_STRUCT'      : DoxyVal(env, False),
-        'UML_LIMIT_NUM_FIELDS'      : DoxyVal(env, 10),
-        'UML_LOOK'                  : DoxyVal(env, False),
-        'USE_HTAGS'                 : DoxyVal(env, False),
-        'USE_MATHJAX'               : DoxyVal(env, False),
-        'USE_MDFILE_AS_MAINPAGE'    : DoxyVal(env, None, 'srcfile'),
-        'USE_PDFLATEX'              : DoxyVal(env, True),
-        'VERBATIM_HEADERS'          : DoxyVal(env, True),
-        'WARNINGS'                  : DoxyVal(env, True),
-        'WARN_FORMAT'               : DoxyVal(env, '$file:$line: $text'),
-        'WARN_IF_DOC_ERROR'         : DoxyVal(env, True),
-        'WARN_IF_UNDOCUMENTED'      : DoxyVal(env, True),
-        'WARN_LOGFILE'              : DoxyVal(env, None, 'file'),
-        'WARN_NO_PARAMDOC'          : DoxyVal(env, False),
-        'XML_DTD'                   : DoxyVal(env, ''),
-        'XML_OUTPUT'                : DoxyVal(env, 'xml'),
-        'XML_PROGRAMLISTING'        : DoxyVal(env, True),
-        'XML_SCHEMA'                : DoxyVal(env, ''),
-    }
-    return opts
+class DoxyValTagFile(DoxyValFile):
+    """Tag file with optional destination (``file=destination``).
+
+    Accepts a ``(file, destination)`` tuple, a ``'file=destination'`` string
+    or just a file."""
+    __slots__ = ()
+    _fs_factory = None
+    def _assign(self, val):
+        dest = None
+        if isinstance(val, tuple) and len(val) == 2:
+            val, dest = val
+        elif SCons.Util.is_String(val) and '=' in val:
+            val, dest = val.split('=', 1)
+        super(DoxyValTagFile, self)._assign(val)
+        self._value = (self._value, dest)
+    def tagfile(self):
+        return None if self._value is None else self._value[0]
+    def destination(self):
+        return None if self._value is None else self._value[1]
+    def _str(self, ctx=None):
+        node, dest = self._value
+        path = _abspath(node) if ctx is None else ctx.path(node)
+        return self._str_str(path if dest is None else '%s=%s' % (path, dest), ctx)
+
+class DoxyValTagFiles(DoxyValFsList):
+    __slots__ = ()
+    def _assign(self, val):
+        if isinstance(val, tuple):
+            # single (file, destination) pair
+            val = [val]
+        super(DoxyValTagFiles, self)._assign(val)
+    @classmethod
+    def item_kind(cls):
+        return 'tagfile'
+
+_shareable_types = (bool, str)
+_shareable = set([(DoxyValBool, True), (DoxyValBool, False), (DoxyValStr, '')])
+
+def doxyfile_version(env=None):
+    """Returns doxygen version selected in `env` with ``DOXYFILE_VERSION``,
+    or None if it's not set.
+
+    The version ``'auto'`` is the version of doxygen found by ``doxyprobe``
+    (None if it can't be run). It's probed once per environment."""
+    version = None if env is None else env.get('DOXYFILE_VERSION')
+    if version != 'auto':
+        return version
+    cache = getattr(env, '_doxyfile_version', None)
+    if cache is None or cache[0] is not env:
+        from . import doxyprobe
+        cache = (env, doxyprobe.doxygen_version(env))
+        env._doxyfile_version = cache
+    return cache[1]
+
+def _schema(env=None):
+    """Returns the schema of options for doxygen version selected in `env`
+    (``DOXYFILE_VERSION``), or all the known options if it's not set."""
+    from . import doxyschema
+    return doxyschema.schema(doxyfile_version(env))
+
+def doxyoptions_names(env=None):
+    """Returns names of all the supported options."""
+    return _schema(env).keys()
+
+def doxyoption_kind(name, env=None):
+    """Returns the kind of option `name` (e.g. ``'bool'`` or ``'srcdirs'``)."""
+    return _schema(env)[name][1]
+
+def doxyoption(env, name):
+    """Creates an option `name` initialized with its default value."""
+    default, kind = _schema(env)[name]
+    return DoxyVal(env, default, kind)
+
+def doxyoptions(env, names=None, shared=False):
+    """Creates options initialized with their default values.
+
+    If `names` is given, only these of them which are supported get created,
+    otherwise all the supported options are returned. With `shared` set, some
+    of the values may be immutable instances shared with other options, this
+    is used by the tool for its table of default values."""
+    stats = doxystats.current
+    if stats is not None:
+        start = doxystats.clock()
+    schema = _schema(env)
+    if names is None:
+        names = schema
+    options = dict((k, _timed_doxyval(env, schema[k][0], schema[k][1], shared, {}))
+                   for k in names if k in schema)
+    if stats is not None:
+        stats.add_time('doxyoptions', doxystats.clock() - start)
+    return options
 
 def generate_doc(env):
     opts = doxyoptions(env)
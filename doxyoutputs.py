@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""`doxyoutputs`
+
+Files and directories written by doxygen.
+"""
+
+#
+# Copyright (c) 2013-2020 by Paweł Tomulik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+import os
+
+# Output formats: (switch, default state, directory option, default directory,
+# index file). The index file is the file representing the whole output
+# directory in the build graph (None for formats with no fixed file names).
+_formats = (
+    ('GENERATE_HTML',        True,  'HTML_OUTPUT',    'html',    None),
+    ('GENERATE_LATEX',       True,  'LATEX_OUTPUT',   'latex',   'refman.tex'),
+    ('GENERATE_RTF',         False, 'RTF_OUTPUT',     'rtf',     'refman.rtf'),
+    ('GENERATE_MAN',         False, 'MAN_OUTPUT',     'man',     None),
+    ('GENERATE_XML',         False, 'XML_OUTPUT',     'xml',     'index.xml'),
+    ('GENERATE_DOCBOOK',     False, 'DOCBOOK_OUTPUT', 'docbook', 'index.xml'),
+    ('GENERATE_PERLMOD',     False, None,             'perlmod', 'DoxyDocs.pm'),
+    ('GENERATE_AUTOGEN_DEF', False, None,             'def',     'doxygen.def'),
+)
+
+# options deciding what's written by doxygen
+_output_options = (
+    'OUTPUT_DIRECTORY', 'HTML_FILE_EXTENSION', 'GENERATE_TAGFILE',
+    'WARN_LOGFILE',
+) + tuple(f[0] for f in _formats) + tuple(f[2] for f in _formats if f[2])
+
+class DoxygenOutputs(object):
+    """Outputs of a doxygen run (absolute paths).
+
+    The `files` are the files representing the outputs in the build graph,
+    `side_effects` are files written as a side effect (and possibly shared
+    by several runs) and `dirs` are the output directories."""
+    __slots__ = ('files', 'side_effects', 'dirs')
+
+    def __init__(self, files=(), side_effects=(), dirs=()):
+        self.files = list(files)
+        self.side_effects = list(side_effects)
+        self.dirs = list(dirs)
+
+def _enabled(values, name, default):
+    words = values.get(name)
+    if not words:
+        return default
+    return words[0].upper() == 'YES'
+
+def outputs_from_values(values, cwd):
+    """Returns :class:`DoxygenOutputs` for option `values` (lists of words,
+    see :func:`doxyparser.doxyfile_words`). Relative paths are relative to
+    `cwd`."""
+    def path(name, base, default=None):
+        words = values.get(name)
+        word = words[0] if words else default
+        return None if word is None else os.path.join(base, word)
+    outdir = path('OUTPUT_DIRECTORY', cwd, '.')
+    result = DoxygenOutputs()
+    for switch, default, diropt, subdir, index in _formats:
+        if not _enabled(values, switch, default):
+            continue
+        if diropt is None:
+            d = os.path.join(outdir, subdir)
+        else:
+            d = path(diropt, outdir, subdir)
+        d = os.path.normpath(d)
+        result.dirs.append(d)
+        if switch == 'GENERATE_HTML':
+            words = values.get('HTML_FILE_EXTENSION')
+            index = 'index' + (words[0] if words else '.html')
+        if index is not None:
+            result.files.append(os.path.join(d, index))
+    tagfile = path('GENERATE_TAGFILE', cwd)
+    if tagfile is not None:
+        result.files.append(os.path.normpath(tagfile))
+    logfile = path('WARN_LOGFILE', cwd)
+    if logfile is not None:
+        result.side_effects.append(os.path.normpath(logfile))
+    return result
+
+def doxygen_outputs(node):
+    """Returns :class:`DoxygenOutputs` of doxygen run with Doxyfile `node`,
+    or None if the Doxyfile can't be read."""
+    from .doxyparser import doxyfile_words
+    values, cwd = doxyfile_words(node, _output_options)
+    if values is None:
+        return None
+    return outputs_from_values(values, cwd)
+
+def doxygen_emitter(target, source, env):
+    """Emitter for builders running doxygen with Doxyfiles in `source`.
+
+    Adds files written by doxygen to `target`, declares the files written as
+    a side effect (so that runs sharing them are not run in parallel) and
+    makes the output directories cleaned together with `target`."""
+    files = []
+    side_effects = []
+    dirs = []
+    for src in source:
+        outputs = doxygen_outputs(src)
+        if outputs is None:
+            continue
+        files.extend(outputs.files)
+        side_effects.extend(outputs.side_effects)
+        dirs.extend(outputs.dirs)
+    known = set(t.get_abspath() for t in target)
+    for f in files:
+        if f not in known:
+            known.add(f)
+            target.append(env.File(f))
+    if side_effects:
+        env.SideEffect([env.File(f) for f in side_effects], target)
+    if dirs:
+        env.Clean(target, [env.Dir(d) for d in dirs])
+    return target, source
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4 nospell:
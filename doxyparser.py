@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+"""`doxyparser`
+
+Reading existing Doxyfiles.
+"""
+
+#
+# Copyright (c) 2013-2020 by Paweł Tomulik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+import re
+
+_assign_re = re.compile(r'\s*(@?[A-Za-z_][A-Za-z0-9_]*)\s*(\+?=)(.*)')
+# a word is made of adjacent quoted and unquoted pieces, e.g. *.h="cat x"
+_word_re = re.compile(r'(?:"(?:\\.|[^"\\])*"?|[^\s"]+)+')
+_piece_re = re.compile(r'"((?:\\.|[^"\\])*)"?|[^\s"]+')
+_unescape_re = re.compile(r'\\(["\\])')
+
+# tokenized files, keyed by (path, mtime, size)
+_statements = {}
+
+_bool_words = {
+    'YES'   : True,
+    'TRUE'  : True,
+    '1'     : True,
+    'NO'    : False,
+    'FALSE' : False,
+    '0'     : False,
+}
+
+def _error(name, lineno, msg):
+    import SCons.Errors
+    return SCons.Errors.UserError("%s:%d: %s" % (name, lineno, msg))
+
+def _words(text):
+    """Splits `text` into words, honoring double-quoted strings. As in
+    doxygen, quoted and unquoted pieces not separated by spaces make a single
+    word."""
+    if '"' not in text:
+        return text.split()
+    words = []
+    for m in _word_re.finditer(text):
+        word = m.group(0)
+        if '"' in word:
+            word = ''.join(_unquote(p) for p in _piece_re.finditer(word))
+        words.append(word)
+    return words
+
+def _unquote(m):
+    quoted = m.group(1)
+    if quoted is None:
+        return m.group(0)
+    return _unescape_re.sub(r'\1', quoted)
+
+def tokenize(lines, name='<string>'):
+    """Yields ``(lineno, tag, op, words)`` for each statement in `lines`.
+
+    The `lines` is any iterable of text lines (e.g. an open file), it's
+    consumed lazily. Comments and blank lines are skipped, lines ending with a
+    backslash are continued with the following line. The `op` is either
+    ``'='`` or ``'+='`` and `words` is the list of (unquoted) values."""
+    stmt = None
+    for lineno, line in enumerate(lines, 1):
+        line = line.rstrip()
+        cont = line.endswith('\\')
+        if cont:
+            line = line[:-1]
+        if stmt is None:
+            text = line.lstrip()
+            if not text or text[0] == '#':
+                continue
+            m = _assign_re.match(text)
+            if m is None:
+                raise _error(name, lineno, "syntax error: %r" % text)
+            stmt = (lineno, m.group(1), m.group(2), _words(m.group(3)))
+        else:
+            stmt[3].extend(_words(line))
+        if not cont:
+            yield stmt
+            stmt = None
+    if stmt is not None:
+        yield stmt
+
+def _file_statements(path, encoding):
+    """Returns the list of statements found in file `path`.
+
+    Files are tokenized once per their modification time, so fragments
+    included by many Doxyfiles are read only once."""
+    import io
+    import os
+    from . import doxystats
+    st = os.stat(path)
+    key = (path, st.st_mtime, st.st_size)
+    try:
+        stmts = _statements[key]
+    except KeyError:
+        pass
+    else:
+        doxystats.count('statements:hit')
+        return stmts
+    doxystats.count('statements:miss')
+    with io.open(path, encoding=encoding, errors='replace') as f:
+        stmts = list(tokenize(f, path))
+    _statements[key] = stmts
+    return stmts
+
+def _find_include(name, cwd, include_path):
+    import os
+    for d in [cwd] + include_path:
+        path = os.path.join(cwd, d, name)
+        if os.path.isfile(path):
+            return os.path.abspath(path)
+    return None
+
+def parse(path, cwd=None, include_path=None, encoding='utf-8'):
+    """Parses Doxyfile `path` into a dict mapping tags to lists of words.
+
+    The ``@INCLUDE`` and ``@INCLUDE_PATH`` directives are handled as doxygen
+    does. Relative paths are resolved against `cwd`, which defaults to the
+    directory containing the Doxyfile (doxygen is usually run from there)."""
+    import os
+    path = os.path.abspath(path)
+    if cwd is None:
+        cwd = os.path.dirname(path)
+    include_path = list(include_path or [])
+    values = {}
+    _parse_file(path, cwd, include_path, encoding, values, [])
+    return values
+
+def parse_text(text, cwd, name='<string>', include_path=None,
+               encoding='utf-8'):
+    """Parses Doxyfile contents `text`, as :func:`parse` does."""
+    include_path = list(include_path or [])
+    values = {}
+    stmts = tokenize(text.splitlines(), name)
+    _parse_statements(stmts, name, cwd, include_path, encoding, values, [])
+    return values
+
+def _parse_file(path, cwd, include_path, encoding, values, stack):
+    stmts = _file_statements(path, encoding)
+    _parse_statements(stmts, path, cwd, include_path, encoding, values, stack)
+
+def _parse_statements(stmts, path, cwd, include_path, encoding, values,
+                      stack):
+    stack.append(path)
+    for lineno, tag, op, words in stmts:
+        if tag == '@INCLUDE_PATH':
+            if op == '=':
+                del include_path[:]
+            include_path.extend(words)
+        elif tag == '@INCLUDE':
+            for word in words:
+                inc = _find_include(word, cwd, include_path)
+                if inc is None:
+                    raise _error(path, lineno, "can't find include file %r" % word)
+                if inc in stack:
+                    raise _error(path, lineno, "recursive @INCLUDE of %s" % inc)
+                _parse_file(inc, cwd, include_path, encoding, values, stack)
+        elif op == '=':
+            # words are shared with the cache, don't extend them in place
+            values[tag] = list(words)
+        else:
+            values.setdefault(tag, []).extend(words)
+    stack.pop()
+
+# Kinds of options holding a single path and a list of paths.
+_path_kinds = frozenset(('entry', 'file', 'dir', 'srcentry', 'srcfile', 'srcdir',
+                         'dualentry', 'dualfile', 'dualdir', 'tagfile'))
+_paths_kinds = frozenset(('entries', 'files', 'dirs', 'srcentries', 'srcfiles',
+                          'srcdirs', 'dualentries', 'dualfiles', 'dualdirs',
+                          'tagfiles'))
+
+def _convert(tag, kind, words, cwd):
+    """Converts `words` to a value of an option of given `kind`."""
+    import os
+    import SCons.Errors
+    if kind == 'bool':
+        if not words:
+            return None
+        try:
+            return _bool_words[words[0].upper()]
+        except KeyError:
+            raise SCons.Errors.UserError("%s: not a boolean: %r" % (tag, words[0]))
+    elif kind == 'int':
+        if not words:
+            return None
+        try:
+            return int(words[0])
+        except ValueError:
+            raise SCons.Errors.UserError("%s: not an integer: %r" % (tag, words[0]))
+    elif kind == 'str':
+        if len(words) > 1:
+            # e.g. FILE_PATTERNS, keep it a list to preserve words
+            return words
+        return words[0] if words else ''
+    elif kind == 'list':
+        return words or None
+    elif kind == 'dict':
+        # e.g. FILTER_PATTERNS = *.c=cfilter
+        items = {}
+        for word in words:
+            key, sep, val = word.partition('=')
+            if not sep:
+                raise SCons.Errors.UserError("%s: name=value expected, got %r" % (tag, word))
+            items[key] = val
+        return items or None
+    elif kind in _path_kinds:
+        paths = [w if os.path.isabs(w) else os.path.join(cwd, w) for w in words]
+        if len(paths) > 1:
+            raise SCons.Errors.UserError("%s: single path expected, got %r" % (tag, words))
+        return paths[0] if paths else None
+    elif kind in _paths_kinds:
+        return [w if os.path.isabs(w) else os.path.join(cwd, w) for w in words] or None
+    raise SCons.Errors.UserError("%s: can not load option of type %s" % (tag, kind))
+
+def doxyfile_values(env, values, cwd):
+    """Converts `values` returned by :func:`parse` to typed option values.
+
+    Returns a dict mapping option names to ``DoxyVal`` objects, as
+    ``doxyoptions()`` does. Tags not known to this tool are skipped."""
+    from .doxyoptions import DoxyVal, doxyoptions_names, doxyoption_kind
+    names = doxyoptions_names(env)
+    result = {}
+    for tag, words in values.items():
+        if tag not in names:
+            continue
+        kind = doxyoption_kind(tag, env)
+        val = _convert(tag, kind, words, cwd)
+        if kind == 'str' and isinstance(val, list):
+            kind = 'list'
+        result[tag] = DoxyVal(env, val, kind)
+    return result
+
+def load_doxyfile(env, path, cwd=None, include_path=None, encoding='utf-8'):
+    """Reads Doxyfile `path` and returns its options as ``DoxyVal`` objects.
+
+    The result may be passed directly as keyword arguments to
+    ``env.Doxyfile()``."""
+    import os
+    path = os.path.abspath(path)
+    if cwd is None:
+        cwd = os.path.dirname(path)
+    values = parse(path, cwd, include_path, encoding)
+    return doxyfile_values(env, values, cwd)
+
+def _option_words(opt):
+    """Returns words which represent option value `opt` in a Doxyfile."""
+    import SCons.Node.FS
+    from .doxyoptions import DoxyValPathList
+    if isinstance(opt, DoxyValPathList):
+        return [node.get_abspath() for node in opt.nodes()]
+    val = opt.value()
+    if val is None or val == '':
+        # nothing is written, as for an option left empty
+        return []
+    if isinstance(val, SCons.Node.FS.Base):
+        return [val.get_abspath()]
+    if isinstance(val, list):
+        return [w for item in val for w in _option_words(item)]
+    if isinstance(val, dict):
+        return ['%s=%s' % (k, '' if v is None else v.value())
+                for k, v in val.items()]
+    if isinstance(val, tuple):
+        # tag file with destination
+        node, dest = val
+        path = node.get_abspath()
+        return [path if dest is None else '%s=%s' % (path, dest)]
+    return [str(opt) if isinstance(val, bool) else str(val)]
+
+def options_words(options, names):
+    """Returns a dict mapping option `names` found in `options` (``DoxyVal``
+    objects) to the lists of words they're written as."""
+    return dict((k, _option_words(options[k])) for k in names if k in options)
+
+def _rendered_values(node, options, cwd):
+    """Renders Doxyfile `node` with `options` (in memory) and parses the
+    result. Returns None if any of the templates can't be read now."""
+    if not node.sources:
+        # minimal Doxyfile, made of the options only
+        return options_words(options, options.keys())
+    return template_values(node.sources, options, cwd, str(node))
+
+def template_values(templates, options, cwd, name='<string>'):
+    """Renders `templates` with `options` (in memory) and parses the result,
+    as :func:`parse_text` does. Returns None if any of the templates can't
+    be read now."""
+    import SCons.Errors
+    from .doxytemplate import compile_template
+    contents = []
+    for src in templates:
+        src = src.srcnode()
+        if src.has_builder() or not src.rexists():
+            return None
+        text = src.rfile().get_text_contents()
+        contents.append(compile_template(text).render(options))
+    try:
+        return parse_text(u'\n'.join(contents), cwd, name)
+    except SCons.Errors.UserError:
+        return None
+
+def doxyfile_words(node, names):
+    """Returns ``(values, cwd)`` for options `names` of Doxyfile `node`.
+
+    The `values` maps option names to lists of words, as :func:`parse`
+    does, and `cwd` is the directory relative paths are relative to (and
+    doxygen is run in).
+    Doxyfiles generated by ``Doxyfile()`` are not read, their options are
+    taken from the node. If the Doxyfile can't be read, `values` is None."""
+    import os
+    from . import doxystats
+    options = getattr(node.attributes, 'doxyfile_options', None)
+    if options is not None:
+        # with DOXYFILE_RELATIVE_PATHS, paths are relative to the directory
+        # doxygen is run in
+        basedir = getattr(node.attributes, 'doxyfile_basedir', None)
+        cwd = basedir or node.dir.get_abspath()
+        try:
+            values = node.attributes.doxyfile_values
+            doxystats.count('rendered:hit')
+        except AttributeError:
+            doxystats.count('rendered:miss')
+            values = _rendered_values(node, options, cwd)
+            if values is None:
+                # template not available yet, only our options are known
+                values = options_words(options, names)
+            else:
+                node.attributes.doxyfile_values = values
+        return dict((k, values[k]) for k in names if k in values), cwd
+    src = node.srcnode().rfile()
+    if not src.exists():
+        return None, None
+    path = src.get_abspath()
+    cwd = os.path.dirname(path)
+    values = parse(path, cwd)
+    return dict((k, values[k]) for k in names if k in values), cwd
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4 nospell:
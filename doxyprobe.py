@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""`doxyprobe`
+
+Finding out versions of doxygen and dot installed.
+"""
+
+#
+# Copyright (c) 2013-2020 by Paweł Tomulik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+import os
+import re
+import threading
+
+_cache_version = 1
+
+_version_re = re.compile(r'(\d+(?:\.\d+)+)')
+
+# Probe caches, keyed by the file they're persisted in.
+_caches = {}
+_caches_lock = threading.Lock()
+
+class ProbeCache(object):
+    """Results of probes, persisted between runs.
+
+    Maps ``(command, size, mtime)`` to the output of the command, where the
+    size and mtime are these of the program run. A program is run again only
+    when it's replaced (or touched). Failures are remembered until the end
+    of the run only, so a program installed later is probed again. Probes may be run by build actions in
+    parallel (``-j``), so the cache is guarded with a lock."""
+    __slots__ = ('path', 'entries', 'lock')
+
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        self.lock = threading.Lock()
+        if path is not None:
+            self.load()
+
+    def load(self):
+        try:
+            import cPickle as pickle
+        except ImportError:
+            import pickle
+        try:
+            with open(self.path, 'rb') as f:
+                version, entries = pickle.load(f)
+        except Exception:
+            # missing, corrupted or written by other version of the tool
+            return
+        if version == _cache_version:
+            self.entries = entries
+
+    def save(self):
+        if self.path is None:
+            return
+        try:
+            import cPickle as pickle
+        except ImportError:
+            import pickle
+        import tempfile
+        tmp = None
+        try:
+            # a unique name, as other processes may save the cache as well
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path) or '.',
+                                       prefix=os.path.basename(self.path))
+            with os.fdopen(fd, 'wb') as f:
+                entries = dict((k, v) for k, v in self.entries.items()
+                               if v is not None)
+                pickle.dump((_cache_version, entries), f, 2)
+            if os.name == 'nt' and os.path.exists(self.path):
+                os.remove(self.path)
+            os.rename(tmp, self.path)
+        except (IOError, OSError):
+            if tmp is not None and os.path.exists(tmp):
+                os.remove(tmp)
+
+    def run(self, argv):
+        """Returns the output of command `argv` (None if it fails), running
+        it only if it's not cached."""
+        try:
+            st = os.stat(argv[0])
+        except OSError:
+            return None
+        key = (tuple(argv), st.st_size, getattr(st, 'st_mtime_ns', st.st_mtime))
+        with self.lock:
+            try:
+                return self.entries[key]
+            except KeyError:
+                pass
+            output = _run(argv)
+            self.entries[key] = output
+            if output is not None:
+                self.save()
+            return output
+
+def probe_cache(path):
+    """Returns :class:`ProbeCache` persisted in file `path` (None for a cache
+    which is not persisted)."""
+    with _caches_lock:
+        try:
+            return _caches[path]
+        except KeyError:
+            pass
+        cache = ProbeCache(path)
+        _caches[path] = cache
+        return cache
+
+def _run(argv):
+    import subprocess
+    try:
+        proc = subprocess.Popen(argv, stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT)
+        output = proc.communicate()[0]
+    except OSError:
+        return None
+    if proc.returncode != 0:
+        return None
+    return output.decode('utf-8', 'replace')
+
+def _command(env, var):
+    """Returns the command in construction variable `var` as a list of
+    words, with the program found in ``PATH``, or None if there is none."""
+    # a target is needed to evaluate ${File(...)} and alike
+    cmd = env.subst_list('$' + var, target=[env.Dir('#')], source=[])
+    if not cmd or not cmd[0]:
+        return None
+    argv = [str(w) for w in cmd[0]]
+    if not os.path.isabs(argv[0]):
+        prog = env.WhereIs(argv[0])
+        if prog is None:
+            return None
+        argv[0] = prog
+    return argv
+
+def _cache(env):
+    path = env.get('DOXYFILE_PROBE_CACHE')
+    return probe_cache(env.File(path).get_abspath() if path else None)
+
+def _version(env, var, args):
+    argv = _command(env, var)
+    if argv is None:
+        return None
+    m = _version_re.search(_cache(env).run(argv + list(args)) or '')
+    return None if m is None else m.group(1)
+
+def doxygen_version(env):
+    """Returns the version of doxygen (``DOXYGEN``), or None if it can't be
+    run."""
+    return _version(env, 'DOXYGEN', ['--version'])
+
+def dot_version(env):
+    """Returns the version of dot (``DOXYGEN_DOT``), or None if it can't be
+    run."""
+    return _version(env, 'DOXYGEN_DOT', ['-V'])
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4 nospell:
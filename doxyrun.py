@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""`doxyrun`
+
+Builder running doxygen with Doxyfiles.
+"""
+
+#
+# Copyright (c) 2013-2020 by Paweł Tomulik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+import os
+
+_builder = None
+
+# Thread options set by the builder, unless the Doxyfile sets them to
+# something other than the values listed (doxygen's defaults).
+_thread_options = (
+    ('DOT_NUM_THREADS',  ('0',)),
+    ('NUM_PROC_THREADS', ('0', '1')),
+)
+
+def cpu_count():
+    """Returns the number of CPUs usable by this process."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        pass
+    import multiprocessing
+    try:
+        return multiprocessing.cpu_count()
+    except NotImplementedError:
+        return 1
+
+def _num_jobs():
+    import SCons.Script
+    try:
+        return max(1, int(SCons.Script.GetOption('num_jobs')))
+    except (AttributeError, TypeError, ValueError):
+        return 1
+
+def doxygen_threads(env):
+    """Returns the number of threads a single doxygen run may use.
+
+    The CPUs (``DOXYGEN_CPUS`` or all the CPUs available) are split evenly
+    between the jobs SCons runs in parallel (``-j``), so that concurrent
+    doxygen runs never use more threads than there are CPUs."""
+    cpus = env.get('DOXYGEN_CPUS')
+    cpus = cpu_count() if cpus is None else int(cpus)
+    return max(1, cpus // _num_jobs())
+
+def _thread_overrides(env, node):
+    """Returns lines overriding thread options, which are left to their
+    defaults in Doxyfile `node`."""
+    from .doxyoptions import doxyfile_version
+    from .doxyparser import doxyfile_words
+    from .doxyschema import supported
+    from . import doxyprobe
+    # doxygen warns about options it doesn't know, so these introduced by
+    # newer versions (see doxyschema) are set only if doxygen
+    # (DOXYFILE_VERSION or the one found) is known to be recent enough
+    version = doxyfile_version(env) or doxyprobe.doxygen_version(env)
+    options = [opt for opt in _thread_options if supported(opt[0], version)]
+    values = doxyfile_words(node, [opt[0] for opt in options])[0] or {}
+    threads = None
+    lines = []
+    for name, defaults in options:
+        words = values.get(name)
+        if words and words[0] not in defaults:
+            continue
+        if threads is None:
+            threads = doxygen_threads(env)
+        lines.append('%s = %d\n' % (name, threads))
+    return lines
+
+def _cwd(doxyfile):
+    """Returns the directory doxygen is run in, relative paths written to
+    `doxyfile` are relative to it."""
+    basedir = getattr(doxyfile.attributes, 'doxyfile_basedir', None)
+    return basedir or doxyfile.dir.get_abspath()
+
+def _subprocess_env(env):
+    """Returns the environment (``env['ENV']``) for programs run by builders,
+    with lists (e.g. of ``PATH`` directories) joined, as SCons does."""
+    import SCons.Util
+    result = {}
+    for key, val in env.get('ENV', {}).items():
+        if SCons.Util.is_List(val):
+            val = os.pathsep.join(str(x) for x in SCons.Util.flatten(val))
+        result[str(key)] = str(val)
+    return result
+
+def _doxygen_action(target, source, env):
+    import subprocess
+    import time
+    import SCons.Errors
+    import SCons.Util
+    doxyfile = source[0]
+    with open(doxyfile.get_abspath(), 'rb') as f:
+        data = f.read()
+    # the Doxyfile is passed through stdin, with the overrides appended
+    overrides = _thread_overrides(env, doxyfile)
+    data = data + b'\n' + ''.join(overrides).encode('ascii')
+    cmd = [str(x) for x in env.subst_list('$DOXYGEN', target=target,
+                                         source=source)[0]]
+    if os.path.dirname(cmd[0]):
+        if not os.path.isabs(cmd[0]):
+            # doxygen is run in another directory
+            cmd[0] = os.path.abspath(cmd[0])
+    else:
+        # found in env['ENV']['PATH'], as any other command run by SCons
+        cmd[0] = env.WhereIs(cmd[0]) or cmd[0]
+    cmd.append('-')
+    start = time.time()
+    try:
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, cwd=_cwd(doxyfile),
+                                env=_subprocess_env(env))
+    except OSError as e:
+        raise SCons.Errors.UserError("Can't run %s [%s]" % (cmd[0], e))
+    proc.communicate(data)
+    SCons.Util.display("doxygen '%s' finished in %.2fs" %
+                       (doxyfile, time.time() - start))
+    stamp = _stamp_path(doxyfile)
+    if proc.returncode == 0 and any(t.get_abspath() == stamp for t in target):
+        with open(stamp, 'w'):
+            pass
+    return proc.returncode
+
+def _doxygen_strfunc(target, source, env):
+    return "Running doxygen with '%s'" % source[0]
+
+def _stamp_path(doxyfile):
+    """Returns the path of the file written after a successful run with
+    `doxyfile`, when no file written by doxygen represents the run."""
+    return doxyfile.get_abspath() + '.stamp'
+
+def _doxygen_emitter(target, source, env):
+    # the Doxyfile given as a placeholder target (see DoxygenRun()) is
+    # replaced with the files actually written by doxygen
+    sources = set(s.get_abspath() for s in source)
+    target = [t for t in target if t.get_abspath() not in sources]
+    if not target:
+        from .doxyoutputs import doxygen_outputs
+        outputs = [doxygen_outputs(s) for s in source]
+        if not any(o is not None and o.files for o in outputs):
+            # e.g. man pages only, which have no fixed names, so the run is
+            # represented by a stamp file
+            target = [env.File(_stamp_path(source[0]))]
+    return env['DOXYFILE_EMITTER'](target, source, env)
+
+def _doxygen_scan(node, env, path=()):
+    return env['DOXYFILE_SCANNER'](node, env, path)
+
+def doxygen_builder():
+    """Returns the builder running doxygen with a Doxyfile.
+
+    The targets are found with ``DOXYFILE_EMITTER`` and the dependencies with
+    ``DOXYFILE_SCANNER``. Doxygen is run in the directory of the Doxyfile
+    (or the directory its relative paths are relative to)."""
+    global _builder
+    if _builder is None:
+        import SCons.Action
+        import SCons.Builder
+        import SCons.Node.FS
+        import SCons.Scanner
+        action = SCons.Action.Action(_doxygen_action, _doxygen_strfunc,
+                                     varlist=['DOXYGEN'])
+        scanner = SCons.Scanner.Base(_doxygen_scan, name='DoxygenRunScanner')
+        _builder = SCons.Builder.Builder(action=action,
+                                         emitter=_doxygen_emitter,
+                                         source_scanner=scanner,
+                                         source_factory=SCons.Node.FS.File,
+                                         single_source=True)
+    return _builder
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4 nospell:
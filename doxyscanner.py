@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+"""`doxyscanner`
+
+Scanner finding source files read by doxygen.
+"""
+
+#
+# Copyright (c) 2013-2020 by Paweł Tomulik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+import os
+
+from . import doxystats
+
+# Patterns used by doxygen when FILE_PATTERNS is left blank.
+default_file_patterns = (
+    '*.c', '*.cc', '*.cxx', '*.cpp', '*.c++', '*.java', '*.ii', '*.ixx',
+    '*.ipp', '*.i++', '*.inl', '*.idl', '*.ddl', '*.odl', '*.h', '*.hh',
+    '*.hxx', '*.hpp', '*.h++', '*.cs', '*.d', '*.php', '*.php4', '*.php5',
+    '*.phtml', '*.inc', '*.m', '*.markdown', '*.md', '*.mm', '*.dox', '*.py',
+    '*.f90', '*.f', '*.for', '*.tcl', '*.vhd', '*.vhdl', '*.ucf', '*.qsf',
+    '*.as', '*.js',
+)
+
+_index_version = 2
+
+# Directory indices, keyed by the file they're persisted in.
+_indices = {}
+
+class DirIndex(object):
+    """Index of directory contents, persisted between runs.
+
+    Maps directory paths to ``(mtime, files, subdirs, links)``. A directory's
+    listing changes only when its mtime changes, so on subsequent runs only
+    the directories whose mtime differs from the recorded one are re-read
+    (the other ones cost a single ``stat()``)."""
+    __slots__ = ('path', 'entries', 'dirty')
+
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        self.dirty = False
+        if path is not None:
+            self.load()
+
+    def load(self):
+        try:
+            import cPickle as pickle
+        except ImportError:
+            import pickle
+        try:
+            with open(self.path, 'rb') as f:
+                version, entries = pickle.load(f)
+        except Exception:
+            # missing, corrupted or written by other version of the tool
+            return
+        if version == _index_version:
+            self.entries = entries
+
+    def save(self):
+        if not self.dirty or self.path is None:
+            return
+        try:
+            import cPickle as pickle
+        except ImportError:
+            import pickle
+        tmp = self.path + '.tmp'
+        try:
+            with open(tmp, 'wb') as f:
+                pickle.dump((_index_version, self.entries), f, 2)
+            if os.name == 'nt' and os.path.exists(self.path):
+                os.remove(self.path)
+            os.rename(tmp, self.path)
+        except (IOError, OSError):
+            return
+        self.dirty = False
+
+    def listdir(self, path):
+        """Returns ``(files, subdirs, links)`` found in directory `path`,
+        the `links` are names of the files and subdirs which are symbolic
+        links."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return ((), (), ())
+        mtime = getattr(st, 'st_mtime_ns', st.st_mtime)
+        entry = self.entries.get(path)
+        if entry is not None and entry[0] == mtime:
+            doxystats.count('dirindex:hit')
+            return entry[1:]
+        doxystats.count('dirindex:miss')
+        listing = _scandir(path)
+        self.entries[path] = (mtime,) + listing
+        self.dirty = True
+        return listing
+
+def _scandir(path):
+    files = []
+    dirs = []
+    links = []
+    try:
+        scandir = os.scandir
+    except AttributeError:
+        # python < 3.5
+        try:
+            names = os.listdir(path)
+        except OSError:
+            return ((), (), ())
+        for name in names:
+            full = os.path.join(path, name)
+            if os.path.isdir(full):
+                dirs.append(name)
+            else:
+                files.append(name)
+            if os.path.islink(full):
+                links.append(name)
+    else:
+        try:
+            it = scandir(path)
+        except OSError:
+            return ((), (), ())
+        for entry in it:
+            try:
+                if entry.is_dir():
+                    dirs.append(entry.name)
+                else:
+                    files.append(entry.name)
+                if entry.is_symlink():
+                    links.append(entry.name)
+            except OSError:
+                pass
+    return (tuple(sorted(files)), tuple(sorted(dirs)), frozenset(links))
+
+def dir_index(path):
+    """Returns :class:`DirIndex` persisted in file `path` (None for an index
+    which is not persisted). The index is loaded once and saved at exit."""
+    try:
+        return _indices[path]
+    except KeyError:
+        pass
+    index = DirIndex(path)
+    if path is not None:
+        import atexit
+        atexit.register(index.save)
+    _indices[path] = index
+    return index
+
+def _compile_patterns(patterns):
+    """Compiles wildcard `patterns` into a single regular expression."""
+    import fnmatch
+    import re
+    if not patterns:
+        return None
+    flags = re.IGNORECASE if os.path.normcase('A') == 'a' else 0
+    return re.compile('|'.join(fnmatch.translate(p) for p in patterns), flags)
+
+class InputSpec(object):
+    """Options which select the files read by doxygen (absolute paths)."""
+    __slots__ = ('inputs', 'recursive', 'excludes', 'exclude_symlinks',
+                 '_patterns', '_exclude_patterns')
+
+    def __init__(self, inputs, recursive=False, patterns=(), excludes=(),
+                 exclude_patterns=(), exclude_symlinks=False):
+        self.inputs = list(inputs)
+        self.recursive = recursive
+        self.exclude_symlinks = exclude_symlinks
+        self.excludes = tuple(ex.rstrip(os.sep) for ex in excludes)
+        self._patterns = _compile_patterns(tuple(patterns) or
+                                           default_file_patterns)
+        self._exclude_patterns = _compile_patterns(exclude_patterns)
+
+    def excluded(self, path):
+        for ex in self.excludes:
+            if path == ex or path.startswith(ex + os.sep):
+                return True
+        pat = self._exclude_patterns
+        return pat is not None and pat.match(path) is not None
+
+    def matches(self, name):
+        return self._patterns.match(name) is not None
+
+def input_files(spec, index):
+    """Returns absolute paths of files selected by `spec`.
+
+    The directories are listed with `index`."""
+    result = []
+    seen = set()
+    for path in spec.inputs:
+        if spec.excluded(path):
+            continue
+        if os.path.isdir(path):
+            _walk(path, spec, index, result, seen)
+        elif os.path.exists(path):
+            # explicitly listed files are taken regardless of FILE_PATTERNS
+            result.append(path)
+    return result
+
+def _walk(top, spec, index, result, seen):
+    # The stack holds (path, real path) of directories. Like doxygen, each
+    # directory is read once (`seen` are the real paths read so far), so
+    # symbolic links pointing back to a parent don't loop. The real paths
+    # are resolved only for links, other subdirectories extend the parent's.
+    stack = [(top, os.path.realpath(top))]
+    while stack:
+        path, real = stack.pop()
+        if real in seen:
+            continue
+        seen.add(real)
+        files, dirs, links = index.listdir(path)
+        for name in files:
+            if spec.exclude_symlinks and name in links:
+                continue
+            if spec.matches(name):
+                full = os.path.join(path, name)
+                if not spec.excluded(full):
+                    result.append(full)
+        if spec.recursive:
+            subdirs = []
+            linked = []
+            for name in dirs:
+                full = os.path.join(path, name)
+                if spec.excluded(full):
+                    continue
+                if name not in links:
+                    subdirs.append((full, os.path.join(real, name)))
+                elif not spec.exclude_symlinks:
+                    linked.append((full, os.path.realpath(full)))
+            # the links go last, so that directories are listed under their
+            # own paths rather than through links, where possible
+            stack.extend(reversed(linked))
+            stack.extend(reversed(subdirs))
+
+# options deciding which files are read by doxygen
+_input_options = ('INPUT', 'RECURSIVE', 'FILE_PATTERNS', 'EXCLUDE',
+                  'EXCLUDE_PATTERNS', 'EXCLUDE_SYMLINKS', 'TAGFILES')
+
+def spec_from_values(values, cwd):
+    """Creates :class:`InputSpec` from option `values` (lists of words, see
+    :func:`doxyparser.doxyfile_words`). Relative paths are relative to
+    `cwd`."""
+    def paths(name):
+        return [os.path.join(cwd, p) for p in values.get(name, [])]
+    def flag(name):
+        words = values.get(name)
+        return bool(words) and words[0].upper() == 'YES'
+    return InputSpec(paths('INPUT') or [cwd],
+                     flag('RECURSIVE'),
+                     values.get('FILE_PATTERNS', []),
+                     paths('EXCLUDE'),
+                     values.get('EXCLUDE_PATTERNS', []),
+                     flag('EXCLUDE_SYMLINKS'))
+
+def tagfile_paths(values, cwd):
+    """Returns paths of tag files listed in ``TAGFILES`` option (the
+    ``=destination`` parts stripped)."""
+    return [os.path.join(cwd, w.split('=', 1)[0])
+            for w in values.get('TAGFILES', [])]
+
+def _index_path(env):
+    path = env.get('DOXYFILE_DIRINDEX')
+    if not path:
+        return None
+    return env.File(path).get_abspath()
+
+def env_dir_index(env):
+    """Returns :class:`DirIndex` selected by ``DOXYFILE_DIRINDEX``."""
+    return dir_index(_index_path(env))
+
+def scan(node, env, path=()):
+    """Returns source files read by doxygen when run with Doxyfile `node`."""
+    from .doxyparser import doxyfile_words
+    values, cwd = doxyfile_words(node, _input_options)
+    if values is None:
+        return []
+    spec = spec_from_values(values, cwd)
+    files = input_files(spec, env_dir_index(env))
+    # tag files of other projects, they're usually generated by other
+    # doxygen runs, which then have to be run first
+    files.extend(tagfile_paths(values, cwd))
+    nodes = [env.File(p) for p in files]
+    nodes.extend(_includes(node))
+    return nodes
+
+def _includes(node):
+    """Yields files included by generated Doxyfile `node`: its base (see
+    ``DoxyfileBase()``) and fragments with long options."""
+    base = getattr(node.attributes, 'doxyfile_base', None)
+    if base is not None:
+        yield base
+        for inc in _includes(base):
+            yield inc
+    fragments = getattr(node.attributes, 'doxyfile_fragments', None)
+    if fragments:
+        for name in sorted(fragments):
+            yield fragments[name]
+
+def DoxyfileScanner():
+    """Creates scanner to be used as a source scanner of builders running
+    doxygen with Doxyfiles."""
+    import SCons.Scanner
+    return SCons.Scanner.Base(scan, name='DoxyfileScanner')
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4 nospell:
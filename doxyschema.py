@@ -0,0 +1,434 @@
+# -*- coding: utf-8 -*-
+"""`doxyschema`
+
+Schema of Doxyfile options supported by the tool.
+"""
+
+#
+# Copyright (c) 2013-2020 by Paweł Tomulik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+# Supported options, one row per option: (name, kind, default, since, until).
+# The option is provided by doxygen versions ``since <= version < until``,
+# None meaning no limit. The table was generated from Doxyfile 1.8.5 (see
+# schema_from_template() and the ``doc-schema`` target in SConstruct), so
+# keep it sorted and regenerate it rather than editing by hand. Corrections
+# go to _overrides.
+_table = (
+    ('ABBREVIATE_BRIEF',        'str',        '', None, None),
+    ('ALIASES',                 'str',        '', None, None),
+    ('ALLEXTERNALS',            'bool',       False, None, None),
+    ('ALPHABETICAL_INDEX',      'bool',       True, None, None),
+    ('ALWAYS_DETAILED_SEC',     'bool',       False, None, None),
+    ('AUTOLINK_SUPPORT',        'bool',       True, None, None),
+    ('BINARY_TOC',              'bool',       False, None, None),
+    ('BRIEF_MEMBER_DESC',       'bool',       True, None, None),
+    ('BUILTIN_STL_SUPPORT',     'bool',       False, None, None),
+    ('CALLER_GRAPH',            'bool',       False, None, None),
+    ('CALL_GRAPH',              'bool',       False, None, None),
+    ('CASE_SENSE_NAMES',        'bool',       None, None, None),
+    ('CHM_FILE',                'srcfile',    None, None, None),
+    ('CHM_INDEX_ENCODING',      'str',        '', None, None),
+    ('CITE_BIB_FILES',          'files',      None, None, None),
+    ('CLANG_ASSISTED_PARSING',  'bool',       False, None, None),
+    ('CLANG_OPTIONS',           'str',        '', None, None),
+    ('CLASS_DIAGRAMS',          'bool',       True, None, None),
+    ('CLASS_GRAPH',             'bool',       True, None, None),
+    ('COLLABORATION_GRAPH',     'bool',       True, None, None),
+    ('COLS_IN_ALPHA_INDEX',     'str',        '', None, None),
+    ('COMPACT_LATEX',           'bool',       False, None, None),
+    ('COMPACT_RTF',             'bool',       False, None, None),
+    ('CPP_CLI_SUPPORT',         'bool',       False, None, None),
+    ('CREATE_SUBDIRS',          'bool',       False, None, None),
+    ('DIRECTORY_GRAPH',         'bool',       True, None, None),
+    ('DISABLE_INDEX',           'bool',       False, None, None),
+    ('DISTRIBUTE_GROUP_DOC',    'bool',       False, None, None),
+    ('DOCBOOK_OUTPUT',          'dir',        None, None, None),
+    ('DOCSET_BUNDLE_ID',        'str',        'org.doxygen.Project', None, None),
+    ('DOCSET_FEEDNAME',         'str',        'Doxygen generated docs', None, None),
+    ('DOCSET_PUBLISHER_ID',     'str',        'org.doxygen.Publisher', None, None),
+    ('DOCSET_PUBLISHER_NAME',   'str',        'Publisher', None, None),
+    ('DOTFILE_DIRS',            'srcdirs',    None, None, None),
+    ('DOT_CLEANUP',             'bool',       True, None, None),
+    ('DOT_FONTNAME',            'str',        'Helvetica', None, None),
+    ('DOT_FONTPATH',            'srcdir',     None, None, None),
+    ('DOT_FONTSIZE',            'int',        10, None, None),
+    ('DOT_GRAPH_MAX_NODES',     'int',        50, None, None),
+    ('DOT_IMAGE_FORMAT',        'str',        'png', None, None),
+    ('DOT_MULTI_TARGETS',       'bool',       False, None, None),
+    ('DOT_NUM_THREADS',         'int',        0, None, None),
+    ('DOT_PATH',                'str',        '', None, None),
+    ('DOT_TRANSPARENT',         'bool',       False, None, None),
+    ('DOXYFILE_ENCODING',       'str',        'UTF-8', None, None),
+    ('ECLIPSE_DOC_ID',          'str',        'org.doxygen.Project', None, None),
+    ('ENABLED_SECTIONS',        'str',        '', None, None),
+    ('ENABLE_PREPROCESSING',    'bool',       True, None, None),
+    ('ENUM_VALUES_PER_LINE',    'int',        4, None, None),
+    ('EXAMPLE_PATH',            'srcdirs',    None, None, None),
+    ('EXAMPLE_PATTERNS',        'str',        '', None, None),
+    ('EXAMPLE_RECURSIVE',       'bool',       False, None, None),
+    ('EXCLUDE',                 'srcdirs',    None, None, None),
+    ('EXCLUDE_PATTERNS',        'str',        '', None, None),
+    ('EXCLUDE_SYMBOLS',         'str',        '', None, None),
+    ('EXCLUDE_SYMLINKS',        'bool',       False, None, None),
+    ('EXPAND_AS_DEFINED',       'list',       [], None, None),
+    ('EXPAND_ONLY_PREDEF',      'bool',       False, None, None),
+    ('EXTENSION_MAPPING',       'str',        '', None, None),
+    ('EXTERNAL_GROUPS',         'bool',       True, None, None),
+    ('EXTERNAL_PAGES',          'bool',       True, None, None),
+    ('EXTERNAL_SEARCH',         'bool',       False, None, None),
+    ('EXTERNAL_SEARCH_ID',      'str',        '', None, None),
+    ('EXTRACT_ALL',             'bool',       False, None, None),
+    ('EXTRACT_ANON_NSPACES',    'bool',       False, None, None),
+    ('EXTRACT_LOCAL_CLASSES',   'bool',       True, None, None),
+    ('EXTRACT_LOCAL_METHODS',   'bool',       False, None, None),
+    ('EXTRACT_PACKAGE',         'bool',       False, None, None),
+    ('EXTRACT_PRIVATE',         'bool',       False, None, None),
+    ('EXTRACT_STATIC',          'bool',       False, None, None),
+    ('EXTRA_PACKAGES',          'str',        '', None, None),
+    ('EXTRA_SEARCH_MAPPINGS',   'str',        '', None, None),
+    ('EXT_LINKS_IN_WINDOW',     'bool',       False, None, None),
+    ('FILE_PATTERNS',           'str',        '', None, None),
+    ('FILE_VERSION_FILTER',     'str',        '', None, None),
+    ('FILTER_PATTERNS',         'dict',       {}, None, None),
+    ('FILTER_SOURCE_FILES',     'bool',       False, None, None),
+    ('FILTER_SOURCE_PATTERNS',  'dict',       {}, None, None),
+    ('FORCE_LOCAL_INCLUDES',    'bool',       False, None, None),
+    ('FORMULA_FONTSIZE',        'int',        10, None, None),
+    ('FORMULA_TRANSPARENT',     'bool',       True, None, None),
+    ('FULL_PATH_NAMES',         'bool',       True, None, None),
+    ('GENERATE_AUTOGEN_DEF',    'bool',       False, None, None),
+    ('GENERATE_BUGLIST',        'bool',       True, None, None),
+    ('GENERATE_CHI',            'bool',       False, None, None),
+    ('GENERATE_DEPRECATEDLIST', 'bool',       True, None, None),
+    ('GENERATE_DOCBOOK',        'bool',       False, None, None),
+    ('GENERATE_DOCSET',         'bool',       False, None, None),
+    ('GENERATE_ECLIPSEHELP',    'bool',       False, None, None),
+    ('GENERATE_HTML',           'bool',       True, None, None),
+    ('GENERATE_HTMLHELP',       'bool',       False, None, None),
+    ('GENERATE_LATEX',          'bool',       True, None, None),
+    ('GENERATE_LEGEND',         'bool',       True, None, None),
+    ('GENERATE_MAN',            'bool',       False, None, None),
+    ('GENERATE_PERLMOD',        'bool',       False, None, None),
+    ('GENERATE_QHP',            'bool',       False, None, None),
+    ('GENERATE_RTF',            'bool',       False, None, None),
+    ('GENERATE_TAGFILE',        'file',       None, None, None),
+    ('GENERATE_TESTLIST',       'bool',       True, None, None),
+    ('GENERATE_TODOLIST',       'bool',       True, None, None),
+    ('GENERATE_TREEVIEW',       'bool',       False, None, None),
+    ('GENERATE_XML',            'bool',       False, None, None),
+    ('GRAPHICAL_HIERARCHY',     'bool',       True, None, None),
+    ('GROUP_GRAPHS',            'bool',       True, None, None),
+    ('HAVE_DOT',                'bool',       False, None, None),
+    ('HHC_LOCATION',            'str',        '', None, None),
+    ('HIDE_FRIEND_COMPOUNDS',   'bool',       False, None, None),
+    ('HIDE_IN_BODY_DOCS',       'bool',       False, None, None),
+    ('HIDE_SCOPE_NAMES',        'bool',       False, None, None),
+    ('HIDE_UNDOC_CLASSES',      'bool',       False, None, None),
+    ('HIDE_UNDOC_MEMBERS',      'bool',       False, None, None),
+    ('HIDE_UNDOC_RELATIONS',    'bool',       True, None, None),
+    ('HTML_COLORSTYLE_GAMMA',   'int',        80, None, None),
+    ('HTML_COLORSTYLE_HUE',     'int',        220, None, None),
+    ('HTML_COLORSTYLE_SAT',     'int',        100, None, None),
+    ('HTML_DYNAMIC_SECTIONS',   'bool',       False, None, None),
+    ('HTML_EXTRA_FILES',        'srcfiles',   None, None, None),
+    ('HTML_EXTRA_STYLESHEET',   'srcfile',    None, None, None),
+    ('HTML_FILE_EXTENSION',     'str',        '.html', None, None),
+    ('HTML_FOOTER',             'srcfile',    None, None, None),
+    ('HTML_HEADER',             'srcfile',    None, None, None),
+    ('HTML_INDEX_NUM_ENTRIES',  'int',        100, None, None),
+    ('HTML_OUTPUT',             'str',        'html', None, None),
+    ('HTML_STYLESHEET',         'srcfile',    None, None, None),
+    ('HTML_TIMESTAMP',          'bool',       True, None, None),
+    ('IDL_PROPERTY_SUPPORT',    'bool',       True, None, None),
+    ('IGNORE_PREFIX',           'str',        '', None, None),
+    ('IMAGE_PATH',              'srcdirs',    None, None, None),
+    ('INCLUDED_BY_GRAPH',       'bool',       True, None, None),
+    ('INCLUDE_FILE_PATTERNS',   'str',        '', None, None),
+    ('INCLUDE_GRAPH',           'bool',       True, None, None),
+    ('INCLUDE_PATH',            'srcdirs',    None, None, None),
+    ('INHERIT_DOCS',            'bool',       True, None, None),
+    ('INLINE_GROUPED_CLASSES',  'bool',       False, None, None),
+    ('INLINE_INFO',             'bool',       True, None, None),
+    ('INLINE_INHERITED_MEMB',   'bool',       False, None, None),
+    ('INLINE_SIMPLE_STRUCTS',   'bool',       False, None, None),
+    ('INLINE_SOURCES',          'bool',       False, None, None),
+    ('INPUT',                   'srcentries', None, None, None),
+    ('INPUT_ENCODING',          'str',        'UTF-8', None, None),
+    ('INPUT_FILTER',            'str',        '', None, None),
+    ('INTERACTIVE_SVG',         'bool',       False, None, None),
+    ('INTERNAL_DOCS',           'bool',       False, None, None),
+    ('JAVADOC_AUTOBRIEF',       'bool',       False, None, None),
+    ('LATEX_BATCHMODE',         'bool',       False, None, None),
+    ('LATEX_BIB_STYLE',         'str',        '', None, None),
+    ('LATEX_CMD_NAME',          'str',        'latex', None, None),
+    ('LATEX_EXTRA_FILES',       'srcfiles',   None, None, None),
+    ('LATEX_FOOTER',            'srcfile',    None, None, None),
+    ('LATEX_HEADER',            'srcfile',    None, None, None),
+    ('LATEX_HIDE_INDICES',      'bool',       False, None, None),
+    ('LATEX_OUTPUT',            'str',        'latex', None, None),
+    ('LATEX_SOURCE_CODE',       'bool',       False, None, None),
+    ('LAYOUT_FILE',             'srcfile',    None, None, None),
+    ('LOOKUP_CACHE_SIZE',       'int',        0, None, None),
+    ('MACRO_EXPANSION',         'bool',       False, None, None),
+    ('MAKEINDEX_CMD_NAME',      'str',        'makeindex', None, None),
+    ('MAN_EXTENSION',           'str',        '.3', None, None),
+    ('MAN_LINKS',               'bool',       False, None, None),
+    ('MAN_OUTPUT',              'str',        'man', None, None),
+    ('MARKDOWN_SUPPORT',        'bool',       True, None, None),
+    ('MATHJAX_CODEFILE',        'srcfile',    None, None, None),
+    ('MATHJAX_EXTENSIONS',      'str',        '', None, None),
+    ('MATHJAX_FORMAT',          'str',        'HTML-CSS', None, None),
+    ('MATHJAX_RELPATH',         'str',        'http://cdn.mathjax.org/mathjax/latest', None, None),
+    ('MAX_DOT_GRAPH_DEPTH',     'int',        0, None, None),
+    ('MAX_INITIALIZER_LINES',   'int',        30, None, None),
+    ('MSCFILE_DIRS',            'dirs',       None, None, None),
+    ('MSCGEN_PATH',             'str',        '', None, None),
+    ('MULTILINE_CPP_IS_BRIEF',  'bool',       False, None, None),
+    ('OPTIMIZE_FOR_FORTRAN',    'bool',       False, None, None),
+    ('OPTIMIZE_OUTPUT_FOR_C',   'bool',       False, None, None),
+    ('OPTIMIZE_OUTPUT_JAVA',    'bool',       False, None, None),
+    ('OPTIMIZE_OUTPUT_VHDL',    'bool',       False, None, None),
+    ('OUTPUT_DIRECTORY',        'dir',        None, None, None),
+    ('OUTPUT_LANGUAGE',         'str',        'English', None, None),
+    ('PAPER_TYPE',              'str',        'a4', None, None),
+    ('PDF_HYPERLINKS',          'bool',       True, None, None),
+    ('PERLMOD_LATEX',           'bool',       False, None, None),
+    ('PERLMOD_MAKEVAR_PREFIX',  'str',        '', None, None),
+    ('PERLMOD_PRETTY',          'bool',       True, None, None),
+    ('PERL_PATH',               'str',        '/usr/bin/perl', None, None),
+    ('PREDEFINED',              'list',       [], None, None),
+    ('PROJECT_BRIEF',           'str',        '', None, None),
+    ('PROJECT_LOGO',            'str',        '', None, None),
+    ('PROJECT_NAME',            'str',        'My Project', None, None),
+    ('PROJECT_NUMBER',          'str',        '', None, None),
+    ('QCH_FILE',                'str',        '', None, None),
+    ('QHG_LOCATION',            'str',        '', None, None),
+    ('QHP_CUST_FILTER_ATTRS',   'str',        '', None, None),
+    ('QHP_CUST_FILTER_NAME',    'str',        '', None, None),
+    ('QHP_NAMESPACE',           'str',        '', None, None),
+    ('QHP_SECT_FILTER_ATTRS',   'str',        '', None, None),
+    ('QHP_VIRTUAL_FOLDER',      'str',        'doc', None, None),
+    ('QT_AUTOBRIEF',            'bool',       False, None, None),
+    ('QUIET',                   'bool',       False, None, None),
+    ('RECURSIVE',               'bool',       False, None, None),
+    ('REFERENCED_BY_RELATION',  'bool',       False, None, None),
+    ('REFERENCES_LINK_SOURCE',  'bool',       True, None, None),
+    ('REFERENCES_RELATION',     'bool',       False, None, None),
+    ('REPEAT_BRIEF',            'bool',       True, None, None),
+    ('RTF_EXTENSIONS_FILE',     'file',       None, None, None),
+    ('RTF_HYPERLINKS',          'bool',       False, None, None),
+    ('RTF_OUTPUT',              'str',        'rtf', None, None),
+    ('RTF_STYLESHEET_FILE',     'file',       None, None, None),
+    ('SEARCHDATA_FILE',         'str',        'searchdata.xml', None, None),
+    ('SEARCHENGINE',            'bool',       True, None, None),
+    ('SEARCHENGINE_URL',        'str',        '', None, None),
+    ('SEARCH_INCLUDES',         'bool',       True, None, None),
+    ('SEPARATE_MEMBER_PAGES',   'bool',       False, None, None),
+    ('SERVER_BASED_SEARCH',     'bool',       False, None, None),
+    ('SHORT_NAMES',             'bool',       False, None, None),
+    ('SHOW_FILES',              'bool',       True, None, None),
+    ('SHOW_INCLUDE_FILES',      'bool',       True, None, None),
+    ('SHOW_NAMESPACES',         'bool',       True, None, None),
+    ('SHOW_USED_FILES',         'bool',       True, None, None),
+    ('SIP_SUPPORT',             'bool',       False, None, None),
+    ('SKIP_FUNCTION_MACROS',    'bool',       True, None, None),
+    ('SORT_BRIEF_DOCS',         'bool',       False, None, None),
+    ('SORT_BY_SCOPE_NAME',      'bool',       False, None, None),
+    ('SORT_GROUP_NAMES',        'bool',       False, None, None),
+    ('SORT_MEMBERS_CTORS_1ST',  'bool',       False, None, None),
+    ('SORT_MEMBER_DOCS',        'bool',       True, None, None),
+    ('SOURCE_BROWSER',          'bool',       False, None, None),
+    ('SOURCE_TOOLTIPS',         'bool',       True, None, None),
+    ('STRICT_PROTO_MATCHING',   'bool',       False, None, None),
+    ('STRIP_CODE_COMMENTS',     'bool',       True, None, None),
+    ('STRIP_FROM_INC_PATH',     'srcdirs',    None, None, None),
+    ('STRIP_FROM_PATH',         'srcdirs',    None, None, None),
+    ('SUBGROUPING',             'bool',       True, None, None),
+    ('TAB_SIZE',                'int',        4, None, None),
+    ('TAGFILES',                'str',        '', None, None),
+    ('TCL_SUBST',               'str',        '', None, None),
+    ('TEMPLATE_RELATIONS',      'bool',       False, None, None),
+    ('TOC_EXPAND',              'bool',       False, None, None),
+    ('TREEVIEW_WIDTH',          'int',        250, None, None),
+    ('TYPEDEF_HIDES_STRUCT',    'bool',       False, None, None),
+    ('UML_LIMIT_NUM_FIELDS',    'int',        10, None, None),
+    ('UML_LOOK',                'bool',       False, None, None),
+    ('USE_HTAGS',               'bool',       False, None, None),
+    ('USE_MATHJAX',             'bool',       False, None, None),
+    ('USE_MDFILE_AS_MAINPAGE',  'srcfile',    None, None, None),
+    ('USE_PDFLATEX',            'bool',       True, None, None),
+    ('VERBATIM_HEADERS',        'bool',       True, None, None),
+    ('WARNINGS',                'bool',       True, None, None),
+    ('WARN_FORMAT',             'str',        '$file:$line: $text', None, None),
+    ('WARN_IF_DOC_ERROR',       'bool',       True, None, None),
+    ('WARN_IF_UNDOCUMENTED',    'bool',       True, None, None),
+    ('WARN_LOGFILE',            'file',       None, None, None),
+    ('WARN_NO_PARAMDOC',        'bool',       False, None, None),
+    ('XML_DTD',                 'str',        '', None, None),
+    ('XML_OUTPUT',              'str',        'xml', None, None),
+    ('XML_PROGRAMLISTING',      'bool',       True, None, None),
+    ('XML_SCHEMA',              'str',        '', None, None),
+)
+
+# Rows maintained by hand, replacing these in _table (or added to it). They
+# hold what can't be found out from a template: kinds which can't be guessed
+# from the values and options of doxygen newer than the template _table was
+# generated from.
+_overrides = (
+    ('NUM_PROC_THREADS',        'int',        1, '1.9.0', None),
+    ('TAGFILES',                'tagfiles',   None, None, None),
+)
+
+# Schemas filtered by version, keyed by version tuple.
+_schemas = {}
+# Rows of _table and _overrides merged, built on first use.
+_merged_rows = None
+
+def _host_defaults():
+    """Returns defaults which depend on the host we're running on."""
+    import os
+    # NOTE: this may sometimes give wrong result, but I have no better idea
+    # how to determine case sensitiveness, some people say, that this gives
+    # wrong answer on Mac OS for example (I don't have one to test it)
+    #
+    # See also:
+    # http://stackoverflow.com/questions/7870041/check-if-file-system-is-case-insensitive-in-python
+    return {
+        'CASE_SENSE_NAMES' : (os.path.normcase('A') != os.path.normcase('a')),
+    }
+
+def parse_version(version):
+    """Converts `version` string (e.g. ``'1.8.5'``) to a tuple of ints."""
+    import SCons.Util
+    import SCons.Errors
+    if version is None or isinstance(version, tuple):
+        return version
+    if not SCons.Util.is_String(version):
+        version = str(version)
+    try:
+        return tuple(int(x) for x in version.split('.'))
+    except ValueError:
+        raise SCons.Errors.UserError("invalid doxygen version %r" % version)
+
+def _supported(version, since, until):
+    if version is None:
+        return True
+    if since is not None and version < parse_version(since):
+        return False
+    if until is not None and version >= parse_version(until):
+        return False
+    return True
+
+def _rows():
+    """Returns the rows of _table, corrected with _overrides, by name."""
+    global _merged_rows
+    if _merged_rows is None:
+        _merged_rows = dict((row[0], row) for row in _table)
+        _merged_rows.update((row[0], row) for row in _overrides)
+    return _merged_rows
+
+def supported(name, version):
+    """Tells whether doxygen `version` provides option `name`.
+
+    If `version` is None (unknown), only the options provided by all the
+    versions are."""
+    try:
+        since, until = _rows()[name][3:]
+    except KeyError:
+        return False
+    if version is None:
+        return since is None and until is None
+    return _supported(parse_version(version), since, until)
+
+def schema(version=None):
+    """Returns options supported by doxygen `version`.
+
+    The result is a dict mapping option names to ``(default, kind)`` tuples.
+    If `version` is None, all the known options are returned. The dict is
+    built on first use and then cached, so it must not be modified."""
+    version = parse_version(version)
+    try:
+        return _schemas[version]
+    except KeyError:
+        pass
+    host = _host_defaults()
+    result = {}
+    for name, kind, default, since, until in _rows().values():
+        if _supported(version, since, until):
+            result[name] = (host.get(name, default), kind)
+    _schemas[version] = result
+    return result
+
+def _guess(words):
+    """Guesses (kind, default) of a new option from its value in template."""
+    if len(words) != 1 or words[0].startswith('@'):
+        return ('str', '')
+    word = words[0]
+    if word in ('YES', 'NO'):
+        return ('bool', word == 'YES')
+    try:
+        return ('int', int(word))
+    except ValueError:
+        return ('str', word)
+
+def schema_from_template(text, version=None, table=None):
+    """Returns schema rows for options found in Doxyfile template `text`.
+
+    The `text` may be a Doxyfile generated with ``doxygen -g`` or a
+    ``Doxyfile.in`` template. Kinds and defaults of options already present
+    in `table` (the current table by default) are preserved, new options get
+    them guessed from their values in `text`. If `version` is given, new
+    options are marked as introduced in `version` and the known options
+    missing in `text` as removed in `version`."""
+    from .doxyparser import tokenize
+    known = dict((row[0], row) for row in (_table if table is None else table))
+    rows = {}
+    for lineno, tag, op, words in tokenize(text.splitlines(), '<template>'):
+        if tag.startswith('@'):
+            continue
+        try:
+            rows[tag] = known[tag]
+        except KeyError:
+            kind, default = _guess(words)
+            rows[tag] = (tag, kind, default, version, None)
+    for name, row in known.items():
+        if name not in rows:
+            if version is not None and row[4] is None:
+                row = row[:4] + (version,)
+            rows[name] = row
+    return [rows[name] for name in sorted(rows)]
+
+def format_schema(rows):
+    """Formats schema `rows` as Python source of the ``_table`` tuple."""
+    w0 = max(len(repr(r[0])) for r in rows) + 1
+    w1 = max(len(repr(r[1])) for r in rows) + 1
+    lines = ['_table = (']
+    for row in rows:
+        lines.append('    (%-*s %-*s %r, %r, %r),' %
+                     ((w0, repr(row[0]) + ',', w1, repr(row[1]) + ',') + row[2:]))
+    lines.append(')')
+    return '\n'.join(lines)
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4 nospell:
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""`doxyshards`
+
+Splitting documentation of a large source tree into several doxygen runs.
+"""
+
+#
+# Copyright (c) 2013-2020 by Paweł Tomulik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+import os
+
+# Options the template must have placeholders for.
+required_options = ('INPUT', 'RECURSIVE', 'OUTPUT_DIRECTORY',
+                    'GENERATE_TAGFILE', 'TAGFILES', 'ALLEXTERNALS')
+
+# Options needed to plan the shards.
+plan_options = ('INPUT', 'RECURSIVE', 'FILE_PATTERNS', 'EXCLUDE',
+                'EXCLUDE_PATTERNS', 'EXCLUDE_SYMLINKS', 'OUTPUT_DIRECTORY',
+                'HTML_OUTPUT')
+
+# Files with documentation pages, they go to the index project.
+_page_suffixes = ('.dox', '.md', '.markdown')
+
+def _size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+def partition(paths, count, size=_size):
+    """Splits `paths` into at most `count` lists of similar total size.
+
+    Files are assigned, largest first, to the currently smallest shard.
+    Empty shards are dropped and each shard is sorted, so the result depends
+    only on the set of `paths` and their sizes."""
+    import heapq
+    weighted = sorted(((size(p), p) for p in set(paths)),
+                      key=lambda x: (-x[0], x[1]))
+    heap = [(0, i) for i in range(count)]
+    shards = [[] for i in range(count)]
+    for weight, path in weighted:
+        total, i = heapq.heappop(heap)
+        shards[i].append(path)
+        heapq.heappush(heap, (total + weight, i))
+    return [sorted(shard) for shard in shards if shard]
+
+class ShardPlan(object):
+    """Option values for sharded documentation (absolute paths).
+
+    The `shards` is a list of dicts with options overriden for each shard,
+    `index` the options of the index project linking them."""
+    __slots__ = ('shards', 'index')
+
+    def __init__(self, shards, index):
+        self.shards = shards
+        self.index = index
+
+def plan(values, cwd, count, dirindex):
+    """Plans `count` shards for option `values` (lists of words, see
+    :func:`doxyparser.doxyfile_words`).
+
+    The files selected by ``INPUT`` are listed with `dirindex` and split
+    between the shards, each shard is written to its own subdirectory of
+    ``OUTPUT_DIRECTORY`` and generates a tag file. Documentation pages are
+    left for the index project, which reads the tag files of all the
+    shards. The shards don't read each other's tag files, so they may be
+    run in parallel."""
+    from .doxyscanner import spec_from_values, input_files
+    files = input_files(spec_from_values(values, cwd), dirindex)
+    pages = [f for f in files if f.endswith(_page_suffixes)]
+    sources = [f for f in files if not f.endswith(_page_suffixes)]
+    words = values.get('OUTPUT_DIRECTORY')
+    outdir = os.path.join(cwd, words[0]) if words else cwd
+    words = values.get('HTML_OUTPUT')
+    html = words[0] if words else 'html'
+    shards = []
+    tagfiles = []
+    for i, inputs in enumerate(partition(sources, count)):
+        shard_dir = os.path.join(outdir, 'shard%d' % i)
+        tagfile = os.path.join(shard_dir, 'shard%d.tag' % i)
+        shards.append({
+            'INPUT': inputs,
+            'RECURSIVE': False,
+            'OUTPUT_DIRECTORY': shard_dir,
+            'GENERATE_TAGFILE': tagfile,
+        })
+        # the html of shards, relative to the index's html
+        dest = os.path.relpath(os.path.join(shard_dir, html),
+                               os.path.join(outdir, html))
+        tagfiles.append((tagfile, dest.replace(os.sep, '/')))
+    index = {
+        'INPUT': sorted(pages),
+        'RECURSIVE': False,
+        'TAGFILES': tagfiles,
+        'ALLEXTERNALS': True,
+    }
+    return ShardPlan(shards, index)
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4 nospell:
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""`doxystats`
+
+Opt-in instrumentation of the tool.
+"""
+
+#
+# Copyright (c) 2013-2020 by Paweł Tomulik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+import time
+
+try:
+    clock = time.perf_counter
+except AttributeError:
+    # python < 3.3
+    clock = time.time
+
+# The statistics being collected, None when disabled. Instrumented code
+# checks it before doing anything else, so the cost of disabled
+# instrumentation is a single global lookup.
+current = None
+
+# Environment variable and command-line option enabling the statistics,
+# both give the file the statistics are written to.
+environ_var = 'SCONS_DOXYFILE_STATS'
+option = '--doxyfile-stats'
+
+_option_added = False
+
+class Stats(object):
+    """Statistics collected during the build.
+
+    The `timers` map names to ``[calls, seconds]``, `counters` map names to
+    numbers (e.g. ``'template:hit'``) and `targets` map Doxyfiles to dicts
+    with ``render_seconds``, ``bytes`` rendered and whether they were
+    ``written`` (see ``DOXYFILE_WRITE_IF_CHANGED``)."""
+    __slots__ = ('timers', 'counters', 'targets', '_lock')
+
+    def __init__(self):
+        import threading
+        self.timers = {}
+        self.counters = {}
+        self.targets = {}
+        # actions may be run concurrently (scons -j)
+        self._lock = threading.Lock()
+
+    def add_time(self, name, seconds):
+        with self._lock:
+            try:
+                timer = self.timers[name]
+            except KeyError:
+                timer = self.timers[name] = [0, 0.0]
+            timer[0] += 1
+            timer[1] += seconds
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def target(self, name, **kw):
+        with self._lock:
+            self.targets.setdefault(name, {}).update(kw)
+
+    def as_dict(self):
+        with self._lock:
+            timers = dict((k, {'calls': v[0], 'seconds': v[1]})
+                          for k, v in self.timers.items())
+            return {
+                'timers': timers,
+                'counters': dict(self.counters),
+                'targets': dict((k, dict(v)) for k, v in self.targets.items()),
+            }
+
+    def dump(self, path):
+        """Writes the statistics to `path` as JSON."""
+        import json
+        with open(path, 'w') as f:
+            json.dump(self.as_dict(), f, indent=2, sort_keys=True)
+            f.write('\n')
+
+def enable(path=None):
+    """Starts collecting statistics and returns :class:`Stats`. If `path` is
+    given, the statistics are written there when SCons exits."""
+    global current
+    if current is None:
+        current = Stats()
+        if path is not None:
+            import atexit
+            atexit.register(current.dump, path)
+    return current
+
+def disable():
+    global current
+    current = None
+
+def stats():
+    """Returns :class:`Stats` collected so far (None, if disabled)."""
+    return current
+
+def count(name, n=1):
+    if current is not None:
+        current.count(name, n)
+
+def _add_option():
+    """Adds the command-line option to SCons, unless it's already there
+    (e.g. added by another copy of the tool, loaded under another name)."""
+    global _option_added
+    if _option_added:
+        return
+    _option_added = True
+    import SCons.Script
+    import SCons.Script.Main
+    parser = SCons.Script.Main.OptionsParser
+    if getattr(parser, 'has_option', lambda opt: False)(option):
+        return
+    SCons.Script.AddOption(option, dest='doxyfile_stats', metavar='FILE',
+                           default=None, help='write statistics of the '
+                           'doxyfile tool to FILE (JSON)')
+
+def setup(env):
+    """Enables statistics if requested on the command line or with the
+    environment variable. Called by the tool's ``generate()``."""
+    import os
+    path = None
+    try:
+        import SCons.Script
+        path = SCons.Script.GetOption('doxyfile_stats')
+    except Exception:
+        # not run by SCons (e.g. bench scripts)
+        pass
+    if not path:
+        path = os.environ.get(environ_var)
+    if path:
+        enable(env.File(path).get_abspath())
+
+# The option is added once, when the tool gets imported, not by every
+# Environment the tool is loaded into.
+try:
+    _add_option()
+except Exception:
+    # not run by SCons (e.g. bench scripts)
+    pass
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4 nospell:
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""`doxytemplate`
+
+Compiled Doxyfile templates.
+"""
+
+#
+# Copyright (c) 2013-2020 by Paweł Tomulik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+import re
+import hashlib
+
+_placeholder_re = re.compile(r'@([A-Za-z_][A-Za-z0-9_]*)@')
+
+_templates = {}
+
+class DoxyTemplate(object):
+    """Template split into literal and placeholder segments.
+
+    The template text is tokenized once, such that ``segments[0::2]`` are
+    literal strings and ``segments[1::2]`` are names of ``@NAME@``
+    placeholders found between them."""
+    __slots__ = ('segments', 'placeholders')
+
+    def __init__(self, text):
+        self.segments = tuple(_placeholder_re.split(text))
+        self.placeholders = frozenset(self.segments[1::2])
+
+    def render(self, values, ctx=None):
+        """Renders the template in a single pass.
+
+        The `values` is a mapping from placeholder names (without ``@``) to
+        option values. Placeholders with no value are left untouched. The
+        `ctx` is passed to values' ``render()`` (see ``RenderContext``).
+        Placeholders of options written to fragment files are left empty and
+        the ``@INCLUDE`` directives of the fragments follow the line they
+        are in, so the rest of the line (e.g. a comment or another
+        placeholder) stays where it was."""
+        fragments = None if ctx is None else ctx.fragments
+        parts = list(self.segments)
+        includes = []
+        for i in range(1, len(parts), 2):
+            try:
+                val = values[parts[i]]
+            except KeyError:
+                parts[i] = '@%s@' % parts[i]
+            else:
+                if fragments and parts[i] in fragments:
+                    includes.append(ctx.include_file(fragments[parts[i]]))
+                    parts[i] = ''
+                else:
+                    parts[i] = '' if val is None else val.render(ctx)
+            if includes:
+                end = _line_end(parts[i + 1])
+                if end is not None:
+                    parts[i + 1] = ''.join((parts[i + 1][:end],
+                                            ''.join(s + '\n' for s in includes),
+                                            parts[i + 1][end:]))
+                    includes = []
+        if includes:
+            parts.append(''.join('\n' + s for s in includes))
+        return ''.join(parts)
+
+def _line_end(text):
+    """Returns the position just after the first newline in `text`, which
+    ends a line (is not escaped with backslash), or None."""
+    pos = text.find('\n')
+    while pos >= 0:
+        if not text[:pos].rstrip('\r').endswith('\\'):
+            return pos + 1
+        pos = text.find('\n', pos + 1)
+    return None
+
+def template_key(text):
+    """Returns a key identifying template `text` by its content."""
+    if not isinstance(text, bytes):
+        text = text.encode('utf-8')
+    return hashlib.sha1(text).hexdigest()
+
+def compile_template(text):
+    """Returns compiled template for `text`, reusing cached one if possible."""
+    from . import doxystats
+    key = template_key(text)
+    try:
+        tpl = _templates[key]
+    except KeyError:
+        doxystats.count('template:miss')
+        tpl = DoxyTemplate(text)
+        _templates[key] = tpl
+        return tpl
+    doxystats.count('template:hit')
+    return tpl
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4 nospell:
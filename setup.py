@@ -43,7 +43,11 @@ class develop(setuptools.command.develop.develop):
                         'broken "pip install -e ."')
 
     def run(self, *args, **kw):
-        self._make_symlinks(['__init__.py', 'about.py'])
+        self._make_symlinks(['__init__.py', 'about.py', 'doxyoptions.py',
+                             'doxytemplate.py', 'doxyparser.py',
+                             'doxyschema.py', 'doxyscanner.py',
+                             'doxyoutputs.py', 'doxyrun.py', 'doxyshards.py',
+                             'doxystats.py', 'doxyprobe.py'])
         setuptools.command.develop.develop.run(self, *args, **kw)
 
 
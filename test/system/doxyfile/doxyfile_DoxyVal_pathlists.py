@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2018-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY
+# KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+import TestSCons
+import sys
+import os
+import glob
+
+# the tool's sources, three directories up from this test
+srcdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..')
+
+if sys.platform == 'win32':
+    test = TestSCons.TestSCons(program='scons.bat', interpreter=None)
+else:
+    test = TestSCons.TestSCons()
+
+test.subdir('src')
+test.subdir('site_scons')
+test.subdir(['site_scons', 'site_tools'])
+test.subdir(['site_scons', 'site_tools', 'doxyfile'])
+
+modules = ['__init__.py', 'about.py'] + \
+          [os.path.basename(p) for p in glob.glob(os.path.join(srcdir, 'doxy*.py'))]
+for module in sorted(modules):
+    test.file_fixture(os.path.join(srcdir, module),
+                      os.path.join('site_scons', 'site_tools', 'doxyfile', module))
+
+test.write('src/a.h', '')
+test.write('Doxyfile.in', """\
+INPUT                  = @INPUT@
+""")
+
+test.write('SConstruct', """\
+# SConstruct
+import sconstool.loader
+sconstool.loader.extend_toolpath(transparent=True)
+env = Environment(tools=['doxyfile'])
+from doxyfile.doxyoptions import DoxyVal
+inputs = SConscript('src/SConscript', exports=['env'], variant_dir='build',
+                    duplicate=0)
+env['SUB'] = 'other'
+# the paths are looked up where they were assigned, when they're first used
+env.Doxyfile('Doxyfile', 'Doxyfile.in', INPUT=inputs)
+assert [n.path for n in inputs.nodes()] == ['src/a.h', 'src/sub/b.h', 'src/c.h']
+assert [v.kind() for v in inputs.value()] == ['srcentry'] * 3
+assert [v.value().path for v in inputs.value()] == ['src/a.h', 'src/sub/b.h', 'src/c.h']
+# dual paths are the build node followed by its source node
+dual = DoxyVal(env, ['build/a.h', None, File('build/a.h')], 'dualfiles')
+a, src_a = File('build/a.h').abspath, File('src/a.h').abspath
+assert dual.nodes() == [File('build/a.h'), File('src/a.h')] * 2
+assert str(dual) == ' \\\\\\n'.join([a, src_a, '', a, src_a]), str(dual)
+assert len(dual.value()) == 3 and dual.value()[1].value() is None
+""")
+
+test.write('src/SConscript', """\
+# src/SConscript
+from doxyfile.doxyoptions import DoxyVal
+Import(['env'])
+env['SUB'] = 'sub'
+inputs = DoxyVal(env, ['a.h', '$SUB/b.h', env.File('c.h')], 'srcentries')
+Return('inputs')
+""")
+
+test.run()
+test.must_match('Doxyfile', """\
+INPUT                  = %s \\
+%s \\
+%s
+""" % (test.workpath('src', 'a.h'), test.workpath('src', 'sub', 'b.h'),
+       test.workpath('src', 'c.h')), mode='r')
+test.up_to_date(arguments='.')
+
+test.pass_test()
+
+# Local Variables:
+# tab-width:4
+# indent-tabs-mode:nil
+# End:
+# vim: set expandtab tabstop=4 shiftwidth=4:
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2018-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY
+# KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+import TestSCons
+import sys
+import os
+import glob
+
+# the tool's sources, three directories up from this test
+srcdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..')
+
+if sys.platform == 'win32':
+    test = TestSCons.TestSCons(program='scons.bat', interpreter=None)
+else:
+    test = TestSCons.TestSCons()
+
+test.subdir('src')
+test.subdir('site_scons')
+test.subdir(['site_scons', 'site_tools'])
+test.subdir(['site_scons', 'site_tools', 'doxyfile'])
+
+modules = ['__init__.py', 'about.py'] + \
+          [os.path.basename(p) for p in glob.glob(os.path.join(srcdir, 'doxy*.py'))]
+for module in sorted(modules):
+    test.file_fixture(os.path.join(srcdir, module),
+                      os.path.join('site_scons', 'site_tools', 'doxyfile', module))
+
+test.write('SConstruct', """\
+# SConstruct
+import sconstool.loader
+sconstool.loader.extend_toolpath(transparent=True)
+env = Environment(tools=['doxyfile'])
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""")
+
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+base = env.DoxyfileBase('Doxyfile.base', RECURSIVE=True, GENERATE_LATEX=False)
+for name in ('a', 'b'):
+    env.Doxyfile('%s/Doxyfile' % name, base=base, INPUT=name, RECURSIVE=True,
+                 PROJECT_NAME=name.upper())
+""")
+
+test.run()
+test.must_match('build/Doxyfile.base', """\
+GENERATE_LATEX = NO
+RECURSIVE = YES
+""", mode='r')
+# RECURSIVE is inherited from the base
+test.must_match('build/a/Doxyfile', """\
+@INCLUDE = %s
+INPUT = %s
+PROJECT_NAME = A
+""" % (test.workpath('build', 'Doxyfile.base'),
+       test.workpath('src', 'a')), mode='r')
+test.up_to_date(arguments='.')
+
+a_mtime = os.path.getmtime(test.workpath('build/a/Doxyfile'))
+test.sleep()
+
+# changed base rewrites only the base
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+base = env.DoxyfileBase('Doxyfile.base', RECURSIVE=True, GENERATE_LATEX=False,
+                        GENERATE_XML=True)
+for name in ('a', 'b'):
+    env.Doxyfile('%s/Doxyfile' % name, base=base, INPUT=name, RECURSIVE=True,
+                 PROJECT_NAME=name.upper())
+""")
+
+test.run()
+test.must_contain_all_lines(test.stdout(), ["Creating 'build/Doxyfile.base'"])
+test.must_not_contain_any_line(test.stdout(), [
+    "Creating 'build/a/Doxyfile'",
+    "Creating 'build/b/Doxyfile'",
+])
+test.fail_test(os.path.getmtime(test.workpath('build/a/Doxyfile')) != a_mtime)
+test.up_to_date(arguments='.')
+
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+env.Doxyfile('a/Doxyfile', base='Doxyfile.in', INPUT='a')
+""")
+
+test.run(status=2, stderr=None)
+test.must_contain_all_lines(test.stderr(), [
+    "Doxyfile.in is not generated by DoxyfileBase()"
+])
+
+test.pass_test()
+
+# Local Variables:
+# tab-width:4
+# indent-tabs-mode:nil
+# End:
+# vim: set expandtab tabstop=4 shiftwidth=4:
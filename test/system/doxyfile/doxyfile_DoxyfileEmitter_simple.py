@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2018-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY
+# KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+import TestSCons
+import sys
+import os
+import glob
+
+# the tool's sources, three directories up from this test
+srcdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..')
+
+if sys.platform == 'win32':
+    test = TestSCons.TestSCons(program='scons.bat', interpreter=None)
+else:
+    test = TestSCons.TestSCons()
+
+test.subdir('src')
+test.subdir('site_scons')
+test.subdir(['site_scons', 'site_tools'])
+test.subdir(['site_scons', 'site_tools', 'doxyfile'])
+
+modules = ['__init__.py', 'about.py'] + \
+          [os.path.basename(p) for p in glob.glob(os.path.join(srcdir, 'doxy*.py'))]
+for module in sorted(modules):
+    test.file_fixture(os.path.join(srcdir, module),
+                      os.path.join('site_scons', 'site_tools', 'doxyfile', module))
+
+test.write('src/Doxyfile.in', """\
+OUTPUT_DIRECTORY       = @OUTPUT_DIRECTORY@
+GENERATE_LATEX         = NO
+GENERATE_XML           = @GENERATE_XML@
+GENERATE_TAGFILE       = @GENERATE_TAGFILE@
+WARN_LOGFILE           = @WARN_LOGFILE@
+""")
+
+test.write('SConstruct', """\
+# SConstruct
+import sconstool.loader
+sconstool.loader.extend_toolpath(transparent=True)
+env = Environment(tools=['doxyfile'])
+# fake doxygen, just creates its outputs
+def fake_doxygen(target, source, env):
+    for t in target:
+        open(str(t), 'w').close()
+env['BUILDERS']['FakeDoxygen'] = Builder(action=fake_doxygen,
+                                         emitter=env['DOXYFILE_EMITTER'])
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""")
+
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+a = env.Doxyfile('a/Doxyfile', 'Doxyfile.in', OUTPUT_DIRECTORY='out/a',
+                 GENERATE_XML=True, GENERATE_TAGFILE='a.tag',
+                 WARN_LOGFILE='warn.log')
+b = env.Doxyfile('b/Doxyfile', 'Doxyfile.in', OUTPUT_DIRECTORY='out/b',
+                 WARN_LOGFILE='warn.log')
+env.FakeDoxygen('a.stamp', a)
+env.FakeDoxygen('b.stamp', b)
+""")
+
+test.run(arguments='-j2 .')
+test.must_exist('build/out/a/html/index.html')
+test.must_exist('build/out/a/xml/index.xml')
+test.must_exist('build/a.tag')
+test.must_exist('build/out/b/html/index.html')
+test.must_not_exist('build/out/a/latex/refman.tex')
+test.must_not_exist('build/out/b/xml/index.xml')
+test.up_to_date(arguments='.')
+
+test.run(arguments='-c .')
+test.must_not_exist('build/out/a/html')
+test.must_not_exist('build/out/a/xml')
+test.must_not_exist('build/out/b/html')
+test.must_not_exist('build/a.tag')
+
+test.pass_test()
+
+# Local Variables:
+# tab-width:4
+# indent-tabs-mode:nil
+# End:
+# vim: set expandtab tabstop=4 shiftwidth=4:
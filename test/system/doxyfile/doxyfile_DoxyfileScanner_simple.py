@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2018-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY
+# KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+import TestSCons
+import sys
+import os
+import glob
+
+# the tool's sources, three directories up from this test
+srcdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..')
+
+if sys.platform == 'win32':
+    test = TestSCons.TestSCons(program='scons.bat', interpreter=None)
+else:
+    test = TestSCons.TestSCons()
+
+test.subdir('src')
+test.subdir(['src', 'inc'])
+test.subdir(['src', 'inc', 'sub'])
+test.subdir(['src', 'inc', 'skip'])
+test.subdir('site_scons')
+test.subdir(['site_scons', 'site_tools'])
+test.subdir(['site_scons', 'site_tools', 'doxyfile'])
+
+modules = ['__init__.py', 'about.py'] + \
+          [os.path.basename(p) for p in glob.glob(os.path.join(srcdir, 'doxy*.py'))]
+for module in sorted(modules):
+    test.file_fixture(os.path.join(srcdir, module),
+                      os.path.join('site_scons', 'site_tools', 'doxyfile', module))
+
+test.write('src/Doxyfile.in', """\
+INPUT                  = @INPUT@
+RECURSIVE              = @RECURSIVE@
+EXCLUDE                = @EXCLUDE@
+""")
+
+test.write('src/inc/a.h', "// a.h\n")
+test.write('src/inc/b.txt', "b.txt\n")
+test.write('src/inc/sub/c.hpp', "// c.hpp\n")
+test.write('src/inc/skip/d.h', "// d.h\n")
+
+test.write('SConstruct', """\
+# SConstruct
+import sconstool.loader
+sconstool.loader.extend_toolpath(transparent=True)
+env = Environment(tools=['doxyfile'])
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""")
+
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+doxyfile = env.Doxyfile(INPUT='inc', RECURSIVE=True, EXCLUDE='inc/skip')
+env.Command('docs.stamp', doxyfile, Copy('$TARGET', '$SOURCE'),
+            source_scanner=env['DOXYFILE_SCANNER'])
+""")
+
+test.run(arguments='--tree=prune build/docs.stamp')
+test.must_contain_all_lines(test.stdout(), [
+    'src/inc/a.h', 'src/inc/sub/c.hpp'
+])
+test.must_not_contain_any_line(test.stdout(), [
+    'src/inc/b.txt', 'src/inc/skip/d.h'
+])
+test.must_exist('.doxyfile.dirindex')
+test.up_to_date(arguments='build/docs.stamp')
+
+# changed header triggers the consumer
+test.write('src/inc/sub/c.hpp', "// c.hpp changed\n")
+test.not_up_to_date(arguments='build/docs.stamp')
+test.up_to_date(arguments='build/docs.stamp')
+
+# new header is found
+test.write('src/inc/e.h', "// e.h\n")
+test.run(arguments='--tree=prune build/docs.stamp')
+test.must_contain_all_lines(test.stdout(), ['src/inc/e.h'])
+
+# excluded and not matching files are ignored
+test.write('src/inc/skip/d.h', "// d.h changed\n")
+test.write('src/inc/b.txt', "b.txt changed\n")
+test.up_to_date(arguments='build/docs.stamp')
+
+# options set to empty strings mean the defaults, not empty words
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+base = env.DoxyfileBase('base/Doxyfile', INPUT='inc', RECURSIVE=True)
+doxyfile = env.Doxyfile('c/Doxyfile', base=base, FILE_PATTERNS='',
+                        EXCLUDE_PATTERNS='')
+env.Command('docs.stamp', doxyfile, Copy('$TARGET', '$SOURCE'),
+            source_scanner=env['DOXYFILE_SCANNER'])
+""")
+
+test.run(arguments='--tree=prune build/docs.stamp')
+test.must_contain_all_lines(test.stdout(), [
+    'src/inc/a.h', 'src/inc/sub/c.hpp'
+])
+
+test.pass_test()
+
+# Local Variables:
+# tab-width:4
+# indent-tabs-mode:nil
+# End:
+# vim: set expandtab tabstop=4 shiftwidth=4:
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2018-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY
+# KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+import TestSCons
+import sys
+import os
+import glob
+
+# the tool's sources, three directories up from this test
+srcdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..')
+
+if sys.platform == 'win32':
+    test = TestSCons.TestSCons(program='scons.bat', interpreter=None)
+else:
+    test = TestSCons.TestSCons()
+
+if not hasattr(os, 'symlink') or sys.platform == 'win32':
+    test.skip_test("symbolic links are not supported, skipping test\n")
+
+test.subdir('src')
+test.subdir(['src', 'inc'])
+test.subdir(['src', 'inc', 'sub'])
+test.subdir(['src', 'inc', 'skip'])
+test.subdir('site_scons')
+test.subdir(['site_scons', 'site_tools'])
+test.subdir(['site_scons', 'site_tools', 'doxyfile'])
+
+modules = ['__init__.py', 'about.py'] + \
+          [os.path.basename(p) for p in glob.glob(os.path.join(srcdir, 'doxy*.py'))]
+for module in sorted(modules):
+    test.file_fixture(os.path.join(srcdir, module),
+                      os.path.join('site_scons', 'site_tools', 'doxyfile', module))
+
+test.write('src/Doxyfile.in', """\
+INPUT                  = @INPUT@
+RECURSIVE              = @RECURSIVE@
+EXCLUDE_SYMLINKS       = @EXCLUDE_SYMLINKS@
+""")
+
+test.write('src/inc/a.h', "// a.h\n")
+test.write('src/inc/sub/c.h', "// c.h\n")
+# a link back to a parent, a link to a sibling and a link to a file
+os.symlink('..', test.workpath('src', 'inc', 'sub', 'up'))
+os.symlink('sub', test.workpath('src', 'inc', 'alias'))
+os.symlink('a.h', test.workpath('src', 'inc', 'link.h'))
+
+test.write('SConstruct', """\
+# SConstruct
+import sconstool.loader
+sconstool.loader.extend_toolpath(transparent=True)
+env = Environment(tools=['doxyfile'])
+SConscript('src/SConscript', exports=['env'])
+""")
+
+test.write('src/SConscript', """\
+# src/SConscript
+import os
+Import(['env'])
+def list_deps(target, source, env):
+    deps = env['DOXYFILE_SCANNER'](source[0], env, ())
+    top = Dir('#').abspath
+    with open(target[0].abspath, 'w') as f:
+        for dep in deps:
+            f.write(os.path.relpath(dep.abspath, top).replace(os.sep, '/') + '\\n')
+for name, exclude in [('follow', False), ('exclude', True)]:
+    doxyfile = env.Doxyfile(name + '/Doxyfile', 'Doxyfile.in', INPUT='inc',
+                            RECURSIVE=True, EXCLUDE_SYMLINKS=exclude)
+    env.Command(name + '/deps.txt', doxyfile, list_deps)
+""")
+
+test.run(arguments='.')
+# each directory is read once, the loop through inc/sub/up ends there
+test.must_match('src/follow/deps.txt', """\
+src/inc/a.h
+src/inc/link.h
+src/inc/sub/c.h
+""", mode='r')
+test.must_match('src/exclude/deps.txt', """\
+src/inc/a.h
+src/inc/sub/c.h
+""", mode='r')
+test.up_to_date(arguments='.')
+
+test.pass_test()
+
+# Local Variables:
+# tab-width:4
+# indent-tabs-mode:nil
+# End:
+# vim: set expandtab tabstop=4 shiftwidth=4:
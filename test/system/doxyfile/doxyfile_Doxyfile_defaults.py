@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2018-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY
+# KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+import TestSCons
+import sys
+import os
+import glob
+
+# the tool's sources, three directories up from this test
+srcdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..')
+
+if sys.platform == 'win32':
+    test = TestSCons.TestSCons(program='scons.bat', interpreter=None)
+else:
+    test = TestSCons.TestSCons()
+
+test.subdir('src')
+test.subdir('site_scons')
+test.subdir(['site_scons', 'site_tools'])
+test.subdir(['site_scons', 'site_tools', 'doxyfile'])
+
+modules = ['__init__.py', 'about.py'] + \
+          [os.path.basename(p) for p in glob.glob(os.path.join(srcdir, 'doxy*.py'))]
+for module in sorted(modules):
+    test.file_fixture(os.path.join(srcdir, module),
+                      os.path.join('site_scons', 'site_tools', 'doxyfile', module))
+
+test.write('src/Doxyfile.in', """\
+PROJECT_NAME           = @PROJECT_NAME@
+NUM_PROC_THREADS       = @NUM_PROC_THREADS@
+""")
+
+test.write('SConstruct', """\
+# SConstruct
+import sconstool.loader
+sconstool.loader.extend_toolpath(transparent=True)
+env = Environment(tools=['doxyfile'], DOXYFILE_VERSION='1.8.5')
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""")
+
+test.write('src/SConscript', """\
+# src/SConscript
+import doxyfile
+Import(['env'])
+env.Doxyfile('a/Doxyfile', 'Doxyfile.in')
+protos = doxyfile._prototypes(env)[0]
+# the defaults are cached per environment
+assert doxyfile._prototypes(env)[0] is protos
+# a clone starts its own table, although it copies the parent's attributes
+clone = env.Clone()
+assert doxyfile._prototypes(clone)[0] is not protos
+clone.Clone(DOXYFILE_VERSION='1.9.1').Doxyfile('b/Doxyfile', 'Doxyfile.in')
+# the table is built again when DOXYFILE_VERSION changes
+env['DOXYFILE_VERSION'] = '1.9.1'
+env.Doxyfile('c/Doxyfile', 'Doxyfile.in')
+assert doxyfile._prototypes(env)[0] is not protos
+# ... and the parent is not affected by its clones
+clone.Doxyfile('d/Doxyfile', 'Doxyfile.in')
+""")
+
+test.run()
+old = """\
+PROJECT_NAME           = "My Project"
+NUM_PROC_THREADS       = @NUM_PROC_THREADS@
+"""
+new = """\
+PROJECT_NAME           = "My Project"
+NUM_PROC_THREADS       = 1
+"""
+test.must_match('build/a/Doxyfile', old, mode='r')
+test.must_match('build/b/Doxyfile', new, mode='r')
+test.must_match('build/c/Doxyfile', new, mode='r')
+test.must_match('build/d/Doxyfile', old, mode='r')
+test.up_to_date(arguments='.')
+
+test.pass_test()
+
+# Local Variables:
+# tab-width:4
+# indent-tabs-mode:nil
+# End:
+# vim: set expandtab tabstop=4 shiftwidth=4:
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2018-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY
+# KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+import TestSCons
+import sys
+import os
+import glob
+
+# the tool's sources, three directories up from this test
+srcdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..')
+
+if sys.platform == 'win32':
+    test = TestSCons.TestSCons(program='scons.bat', interpreter=None)
+else:
+    test = TestSCons.TestSCons()
+
+test.subdir('src')
+test.subdir('site_scons')
+test.subdir(['site_scons', 'site_tools'])
+test.subdir(['site_scons', 'site_tools', 'doxyfile'])
+
+modules = ['__init__.py', 'about.py'] + \
+          [os.path.basename(p) for p in glob.glob(os.path.join(srcdir, 'doxy*.py'))]
+for module in sorted(modules):
+    test.file_fixture(os.path.join(srcdir, module),
+                      os.path.join('site_scons', 'site_tools', 'doxyfile', module))
+
+test.write('src/Doxyfile.in', """\
+PROJECT_NAME           = @PROJECT_NAME@
+INPUT                  = @INPUT@
+EXCLUDE                = @EXCLUDE@
+""")
+
+test.write('SConstruct', """\
+# SConstruct
+import sconstool.loader
+sconstool.loader.extend_toolpath(transparent=True)
+env = Environment(tools=['doxyfile'], DOXYFILE_FRAGMENTS=2)
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""")
+
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+env.Doxyfile(INPUT=['a.h', 'b.h', 'c.h'], EXCLUDE=['a.h'])
+""")
+
+test.run()
+test.must_contain_all_lines(test.stdout(), [
+    "Creating 'build/Doxyfile.INPUT'",
+    "Creating 'build/Doxyfile'",
+])
+# short lists stay in the Doxyfile
+test.must_not_exist('build/Doxyfile.EXCLUDE')
+test.must_match('build/Doxyfile', """\
+PROJECT_NAME           = "My Project"
+INPUT                  = 
+@INCLUDE = %s
+EXCLUDE                = %s
+""" % (test.workpath('build', 'Doxyfile.INPUT'),
+       test.workpath('src', 'a.h')), mode='r')
+test.must_match('build/Doxyfile.INPUT', "INPUT += %s \\\n%s \\\n%s\n" %
+                tuple(test.workpath('src', f) for f in ('a.h', 'b.h', 'c.h')),
+                mode='r')
+test.up_to_date(arguments='.')
+
+doxyfile_mtime = os.path.getmtime(test.workpath('build/Doxyfile'))
+test.sleep()
+
+# changed list rewrites only its fragment
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+env.Doxyfile(INPUT=['a.h', 'b.h', 'c.h', 'd.h'], EXCLUDE=['a.h'])
+""")
+
+test.run()
+test.must_contain_all_lines(test.stdout(), ["Creating 'build/Doxyfile.INPUT'"])
+test.must_not_contain_any_line(test.stdout(), ["Creating 'build/Doxyfile'\n"])
+test.fail_test(os.path.getmtime(test.workpath('build/Doxyfile')) != doxyfile_mtime)
+test.must_contain('build/Doxyfile.INPUT', test.workpath('src', 'd.h'), mode='r')
+
+fragment_mtime = os.path.getmtime(test.workpath('build/Doxyfile.INPUT'))
+test.sleep()
+
+# other options don't touch the fragment
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+env.Doxyfile(INPUT=['a.h', 'b.h', 'c.h', 'd.h'], EXCLUDE=['a.h'],
+             PROJECT_NAME='P')
+""")
+
+test.run()
+test.must_contain_all_lines(test.stdout(), ["Creating 'build/Doxyfile'"])
+test.must_not_contain_any_line(test.stdout(), ["Creating 'build/Doxyfile.INPUT'"])
+test.fail_test(os.path.getmtime(test.workpath('build/Doxyfile.INPUT')) != fragment_mtime)
+test.up_to_date(arguments='.')
+
+test.run(arguments='-c build/Doxyfile')
+test.must_not_exist('build/Doxyfile')
+test.must_not_exist('build/Doxyfile.INPUT')
+
+# the rest of the line stays in place, the @INCLUDE follows the line
+test.write('src/Doxyfile2.in', """\
+INPUT                  = @INPUT@ # sources
+PREDEFINED             = @PREDEFINED@ @EXPAND_AS_DEFINED@
+EXCLUDE                = @EXCLUDE@""")
+
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+env.Doxyfile('c/Doxyfile', 'Doxyfile2.in', INPUT=['a.h', 'b.h', 'c.h'],
+             PREDEFINED=['A', 'B', 'C'], EXPAND_AS_DEFINED=['D'],
+             EXCLUDE=['a.h', 'b.h', 'c.h'])
+""")
+
+test.run()
+test.must_match('build/c/Doxyfile', """\
+INPUT                  =  # sources
+@INCLUDE = %s
+PREDEFINED             =  D
+@INCLUDE = %s
+EXCLUDE                = 
+@INCLUDE = %s""" % tuple(test.workpath('build', 'c', 'Doxyfile.%s' % name)
+                         for name in ('INPUT', 'PREDEFINED', 'EXCLUDE')),
+                mode='r')
+test.must_match('build/c/Doxyfile.PREDEFINED',
+                "PREDEFINED += A B C\n", mode='r')
+test.up_to_date(arguments='.')
+
+test.pass_test()
+
+# Local Variables:
+# tab-width:4
+# indent-tabs-mode:nil
+# End:
+# vim: set expandtab tabstop=4 shiftwidth=4:
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2018-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY
+# KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+import TestSCons
+import sys
+import os
+import glob
+
+# the tool's sources, three directories up from this test
+srcdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..')
+
+if sys.platform == 'win32':
+    test = TestSCons.TestSCons(program='scons.bat', interpreter=None)
+else:
+    test = TestSCons.TestSCons()
+
+test.subdir('src')
+test.subdir('site_scons')
+test.subdir(['site_scons', 'site_tools'])
+test.subdir(['site_scons', 'site_tools', 'doxyfile'])
+
+modules = ['__init__.py', 'about.py'] + \
+          [os.path.basename(p) for p in glob.glob(os.path.join(srcdir, 'doxy*.py'))]
+for module in sorted(modules):
+    test.file_fixture(os.path.join(srcdir, module),
+                      os.path.join('site_scons', 'site_tools', 'doxyfile', module))
+
+test.write('fake_doxygen.py', """\
+# fake doxygen, counts the probes
+import os
+import sys
+assert sys.argv[1:] == ['--version']
+with open(os.path.join(os.path.dirname(__file__), 'probes'), 'a') as f:
+    f.write('probe\\n')
+print('1.8.5 (fake)')
+""")
+
+test.write('SConstruct', """\
+# SConstruct
+import sys
+import sconstool.loader
+sconstool.loader.extend_toolpath(transparent=True)
+env = Environment(tools=['doxyfile'], DOXYFILE_VERSION='auto',
+                  DOXYGEN='%s ${File("#fake_doxygen.py").abspath}' % sys.executable)
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""")
+
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+env.Doxyfile(minimal=True, PROJECT_NAME='P', NUM_PROC_THREADS=2)
+""")
+
+test.run(stderr=None)
+# NUM_PROC_THREADS is not known to doxygen 1.8.5
+test.must_contain_all_lines(test.stderr(), [
+    "option NUM_PROC_THREADS is not supported"
+])
+test.must_match('build/Doxyfile', """\
+# Doxyfile 1.8.5
+PROJECT_NAME = P
+""", mode='r')
+test.must_exist('.doxyfile.probe')
+# written through a temporary file with a unique name, not left behind
+test.fail_test(glob.glob(test.workpath('.doxyfile.probe?*')))
+test.must_match('probes', "probe\n", mode='r')
+
+# the result is cached on disk
+test.up_to_date(arguments='.', stderr=None)
+test.must_match('probes', "probe\n", mode='r')
+
+# so it is when the template uses an option unknown to doxygen 1.8.5
+test.write('src/Doxyfile.in', """\
+PROJECT_NAME           = @PROJECT_NAME@
+NUM_PROC_THREADS       = @NUM_PROC_THREADS@
+""")
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+env.Doxyfile('Doxyfile', 'Doxyfile.in', PROJECT_NAME='P', NUM_PROC_THREADS=2)
+""")
+
+test.run(stderr=None)
+test.must_contain_all_lines(test.stderr(), [
+    "option NUM_PROC_THREADS is not supported"
+])
+
+# dot is probed for Doxyfiles enabling HAVE_DOT
+test.write('fake_dot.py', """\
+print('dot - graphviz version 2.43.0 (0)')
+""")
+
+test.write('SConstruct', """\
+# SConstruct
+import sys
+import sconstool.loader
+sconstool.loader.extend_toolpath(transparent=True)
+env = Environment(tools=['doxyfile'], DOXYFILE_VERSION='auto',
+                  DOXYGEN='%s ${File("#fake_doxygen.py").abspath}' % sys.executable,
+                  DOXYGEN_DOT='%s ${File("#fake_dot.py").abspath}' % sys.executable)
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""")
+
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+env.Doxyfile('a/Doxyfile', minimal=True, HAVE_DOT=True)
+env.Clone(DOXYGEN_DOT='no-such-dot').Doxyfile('b/Doxyfile', minimal=True,
+                                              HAVE_DOT=True)
+""")
+
+test.run(stderr=None)
+test.must_contain_all_lines(test.stderr(), [
+    "HAVE_DOT is enabled, but dot (no-such-dot) can't be run"
+])
+test.fail_test(test.stderr().count("HAVE_DOT is enabled") != 1)
+test.must_match('build/a/Doxyfile', """\
+# Doxyfile 1.8.5
+HAVE_DOT = YES
+""", mode='r')
+
+# a failed probe is not stored on disk, doxygen is probed again next time
+test.write('flaky_doxygen.py', """\
+import os
+import sys
+if os.path.exists(os.path.join(os.path.dirname(__file__), 'broken')):
+    sys.exit(1)
+print('1.9.1')
+""")
+
+test.write('SConstruct', """\
+# SConstruct
+import sys
+import sconstool.loader
+sconstool.loader.extend_toolpath(transparent=True)
+env = Environment(tools=['doxyfile'], DOXYFILE_VERSION='auto',
+                  DOXYGEN='%s ${File("#flaky_doxygen.py").abspath}' % sys.executable)
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""")
+
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+env.Doxyfile(minimal=True, PROJECT_NAME='P')
+""")
+
+test.write('broken', '')
+test.run(stderr=None)
+test.must_match('build/Doxyfile', "PROJECT_NAME = P\n", mode='r')
+
+test.unlink('broken')
+test.run(stderr=None)
+test.must_match('build/Doxyfile', """\
+# Doxyfile 1.9.1
+PROJECT_NAME = P
+""", mode='r')
+
+test.pass_test()
+
+# Local Variables:
+# tab-width:4
+# indent-tabs-mode:nil
+# End:
+# vim: set expandtab tabstop=4 shiftwidth=4:
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2018-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY
+# KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+import TestSCons
+import sys
+import os
+import glob
+
+# the tool's sources, three directories up from this test
+srcdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..')
+
+if sys.platform == 'win32':
+    test = TestSCons.TestSCons(program='scons.bat', interpreter=None)
+else:
+    test = TestSCons.TestSCons()
+
+test.subdir('site_scons')
+test.subdir(['site_scons', 'site_tools'])
+test.subdir(['site_scons', 'site_tools', 'doxyfile'])
+
+modules = ['__init__.py', 'about.py'] + \
+          [os.path.basename(p) for p in glob.glob(os.path.join(srcdir, 'doxy*.py'))]
+for module in sorted(modules):
+    test.file_fixture(os.path.join(srcdir, module),
+                      os.path.join('site_scons', 'site_tools', 'doxyfile', module))
+
+# the same project checked out in two workspaces, sharing a CacheDir
+for ws in ('ws1', 'ws2'):
+    test.subdir(ws, [ws, 'src'], [ws, 'src', 'inc'])
+    test.write([ws, 'src', 'Doxyfile.in'], """\
+OUTPUT_DIRECTORY       = @OUTPUT_DIRECTORY@
+INPUT                  = @INPUT@
+HTML_HEADER            = @HTML_HEADER@
+""")
+    test.write([ws, 'src', 'inc', 'a.h'], '')
+    test.write([ws, 'src', 'header.html'], '')
+    test.write([ws, 'SConstruct'], """\
+# SConstruct
+import sconstool.loader
+sconstool.loader.extend_toolpath(transparent=True)
+env = Environment(tools=['doxyfile'], DOXYFILE_RELATIVE_PATHS=True)
+CacheDir('../cache')
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""")
+    test.write([ws, 'src', 'SConscript'], """\
+# src/SConscript
+Import(['env'])
+env.Doxyfile('doc/Doxyfile', 'Doxyfile.in', INPUT=['inc', 'inc/a.h'],
+             OUTPUT_DIRECTORY='out', HTML_HEADER='header.html')
+""")
+
+site_dir = '--site-dir=%s' % test.workpath('site_scons')
+
+test.run(chdir='ws1', arguments=[site_dir, '.'])
+test.must_match(['ws1', 'build', 'doc', 'Doxyfile'], """\
+OUTPUT_DIRECTORY       = ../out
+INPUT                  = ../../src/inc \\
+../../src/inc/a.h
+HTML_HEADER            = ../../src/header.html
+""")
+
+test.run(chdir='ws2', arguments=[site_dir, '.'])
+test.must_contain_all_lines(test.stdout(), [
+    "Retrieved `build/doc/Doxyfile' from cache",
+])
+test.must_match(['ws2', 'build', 'doc', 'Doxyfile'],
+                test.read(['ws1', 'build', 'doc', 'Doxyfile'], mode='r'))
+
+# relative to the top directory, doxygen is then run from there
+test.write(['ws1', 'SConstruct'], """\
+# SConstruct
+import sconstool.loader
+sconstool.loader.extend_toolpath(transparent=True)
+env = Environment(tools=['doxyfile'], DOXYFILE_RELATIVE_PATHS='#')
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""")
+
+test.run(chdir='ws1', arguments=[site_dir, '.'])
+test.must_match(['ws1', 'build', 'doc', 'Doxyfile'], """\
+OUTPUT_DIRECTORY       = build/out
+INPUT                  = src/inc \\
+src/inc/a.h
+HTML_HEADER            = src/header.html
+""")
+
+test.pass_test()
+
+# Local Variables:
+# tab-width:4
+# indent-tabs-mode:nil
+# End:
+# vim: set expandtab tabstop=4 shiftwidth=4:
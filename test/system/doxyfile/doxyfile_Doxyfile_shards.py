@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2018-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY
+# KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+import TestSCons
+import sys
+import os
+import glob
+
+# the tool's sources, three directories up from this test
+srcdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..')
+
+if sys.platform == 'win32':
+    test = TestSCons.TestSCons(program='scons.bat', interpreter=None)
+else:
+    test = TestSCons.TestSCons()
+
+test.subdir('src')
+test.subdir(['src', 'lib'])
+test.subdir(['src', 'lib', 'sub'])
+test.subdir('site_scons')
+test.subdir(['site_scons', 'site_tools'])
+test.subdir(['site_scons', 'site_tools', 'doxyfile'])
+
+modules = ['__init__.py', 'about.py'] + \
+          [os.path.basename(p) for p in glob.glob(os.path.join(srcdir, 'doxy*.py'))]
+for module in sorted(modules):
+    test.file_fixture(os.path.join(srcdir, module),
+                      os.path.join('site_scons', 'site_tools', 'doxyfile', module))
+
+test.write('fake_doxygen.py', """\
+# fake doxygen, checks that tag files are there and writes its outputs
+import os
+import re
+import sys
+opts = {}
+key = None
+for line in sys.stdin.read().splitlines():
+    m = re.match(r'([A-Z_]+)\\s*=(.*)', line)
+    if m:
+        key, line = m.groups()
+    opts.setdefault(key, []).extend(line.rstrip('\\\\').split())
+for tag in opts.get('TAGFILES', []):
+    assert os.path.exists(tag.split('=')[0]), tag
+out = opts['OUTPUT_DIRECTORY'][0]
+open(os.path.join(out, 'html', 'index.html'), 'w').close()
+if opts.get('GENERATE_TAGFILE'):
+    open(opts['GENERATE_TAGFILE'][0], 'w').close()
+""")
+
+test.write('src/Doxyfile.in', """\
+OUTPUT_DIRECTORY       = @OUTPUT_DIRECTORY@
+GENERATE_LATEX         = NO
+INPUT                  = @INPUT@
+RECURSIVE              = @RECURSIVE@
+TAGFILES               = @TAGFILES@
+GENERATE_TAGFILE       = @GENERATE_TAGFILE@
+ALLEXTERNALS           = @ALLEXTERNALS@
+""")
+
+test.write('src/Small.in', """\
+INPUT                  = @INPUT@
+""")
+
+for i in range(1, 7):
+    test.write(['src', 'lib', 'f%d.h' % i], 'x' * (1000 * i))
+test.write(['src', 'lib', 'sub', 's.h'], 'x')
+test.write(['src', 'lib', 'main.dox'], '/** @mainpage */')
+
+test.write('SConstruct', """\
+# SConstruct
+import sys
+import sconstool.loader
+sconstool.loader.extend_toolpath(transparent=True)
+env = Environment(tools=['doxyfile'],
+                  DOXYGEN='%s ${File("#fake_doxygen.py").abspath}' % sys.executable)
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""")
+
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+docs = env.Doxyfile('Doxyfile', 'Doxyfile.in', INPUT='lib', RECURSIVE=True,
+                    OUTPUT_DIRECTORY='out', shards=3)
+print(' '.join(str(d) for d in docs))
+env.DoxygenRun(docs)
+""")
+
+test.run(arguments='-j3 .')
+test.must_contain_all_lines(test.stdout(), [
+    'Doxyfile Doxyfile.shard0 Doxyfile.shard1 Doxyfile.shard2',
+])
+src = test.workpath('src')
+out = test.workpath('build', 'out')
+# 21 kB split into shards of 7 kB, largest files first
+test.must_contain('build/Doxyfile.shard0',
+                  "INPUT                  = %s \\\n%s \\\n%s\n" %
+                  (os.path.join(src, 'lib', 'f1.h'),
+                   os.path.join(src, 'lib', 'f6.h'),
+                   os.path.join(src, 'lib', 'sub', 's.h')))
+test.must_contain('build/Doxyfile.shard1',
+                  "INPUT                  = %s \\\n%s\n" %
+                  (os.path.join(src, 'lib', 'f2.h'),
+                   os.path.join(src, 'lib', 'f5.h')))
+test.must_contain('build/Doxyfile.shard2',
+                  "INPUT                  = %s \\\n%s\n" %
+                  (os.path.join(src, 'lib', 'f3.h'),
+                   os.path.join(src, 'lib', 'f4.h')))
+test.must_contain('build/Doxyfile.shard0',
+                  "OUTPUT_DIRECTORY       = %s\n" % os.path.join(out, 'shard0'))
+test.must_contain('build/Doxyfile.shard0',
+                  "GENERATE_TAGFILE       = %s\n" %
+                  os.path.join(out, 'shard0', 'shard0.tag'))
+# the index documents pages and links the shards
+test.must_contain('build/Doxyfile',
+                  "INPUT                  = %s\n" %
+                  os.path.join(src, 'lib', 'main.dox'))
+test.must_contain('build/Doxyfile',
+                  "TAGFILES               = %s=../shard0/html \\\n" %
+                  os.path.join(out, 'shard0', 'shard0.tag'))
+test.must_contain('build/Doxyfile', "ALLEXTERNALS           = YES\n")
+test.must_exist('build/out/html/index.html')
+test.must_exist('build/out/shard2/html/index.html')
+test.up_to_date(arguments='.',
+                read_str='Doxyfile Doxyfile.shard0 Doxyfile.shard1 Doxyfile.shard2\n')
+
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+env.Doxyfile('Doxyfile', 'Small.in', INPUT='lib', shards=3)
+""")
+
+test.run(arguments='.', status=2, stderr=None)
+test.must_contain_all_lines(test.stderr(), [
+    'sharding requires options RECURSIVE, OUTPUT_DIRECTORY, GENERATE_TAGFILE, '
+    'TAGFILES, ALLEXTERNALS in template',
+])
+
+test.pass_test()
+
+# Local Variables:
+# tab-width:4
+# indent-tabs-mode:nil
+# End:
+# vim: set expandtab tabstop=4 shiftwidth=4:
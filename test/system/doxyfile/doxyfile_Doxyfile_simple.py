@@ -26,6 +26,10 @@
 import TestSCons
 import sys
 import os
+import glob
+
+# the tool's sources, three directories up from this test
+srcdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..')
 
 if sys.platform == 'win32':
     test = TestSCons.TestSCons(program='scons.bat', interpreter=None)
@@ -37,9 +41,11 @@ test.subdir('site_scons')
 test.subdir(['site_scons', 'site_tools'])
 test.subdir(['site_scons', 'site_tools', 'doxyfile'])
 
-test.file_fixture('../../../__init__.py', 'site_scons/site_tools/doxyfile/__init__.py')
-test.file_fixture('../../../doxyoptions.py', 'site_scons/site_tools/doxyfile/doxyoptions.py')
-test.file_fixture('../../../about.py', 'site_scons/site_tools/doxyfile/about.py')
+modules = ['__init__.py', 'about.py'] + \
+          [os.path.basename(p) for p in glob.glob(os.path.join(srcdir, 'doxy*.py'))]
+for module in sorted(modules):
+    test.file_fixture(os.path.join(srcdir, module),
+                      os.path.join('site_scons', 'site_tools', 'doxyfile', module))
 test.file_fixture('../../../Doxyfile.in', 'src/Doxyfile.in')
 
 test.write('src/test.hpp', r"""\
@@ -69,6 +75,8 @@ test.must_not_exist('src/Doxyfile')
 test.must_exist('build/Doxyfile')
 test.must_contain('build/Doxyfile', '"My Project"')
 
+test.up_to_date(arguments='.')
+
 
 test.run(['-c'])
 test.must_not_exist('build/Doxyfile')
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2018-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY
+# KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+import TestSCons
+import sys
+import os
+import glob
+import json
+
+# the tool's sources, three directories up from this test
+srcdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..')
+
+if sys.platform == 'win32':
+    test = TestSCons.TestSCons(program='scons.bat', interpreter=None)
+else:
+    test = TestSCons.TestSCons()
+
+test.subdir('src')
+test.subdir('site_scons')
+test.subdir(['site_scons', 'site_tools'])
+test.subdir(['site_scons', 'site_tools', 'doxyfile'])
+
+modules = ['__init__.py', 'about.py'] + \
+          [os.path.basename(p) for p in glob.glob(os.path.join(srcdir, 'doxy*.py'))]
+for module in sorted(modules):
+    test.file_fixture(os.path.join(srcdir, module),
+                      os.path.join('site_scons', 'site_tools', 'doxyfile', module))
+
+# another copy of the tool, loaded under another name
+test.subdir('tools', ['tools', 'doxy2'])
+for module in sorted(modules):
+    test.file_fixture(os.path.join(srcdir, module),
+                      os.path.join('tools', 'doxy2', module))
+
+test.write('src/Doxyfile.in', """\
+PROJECT_NAME           = @PROJECT_NAME@
+INPUT                  = @INPUT@
+""")
+
+test.write('SConstruct', """\
+# SConstruct
+import sconstool.loader
+sconstool.loader.extend_toolpath(transparent=True)
+env = Environment(tools=['doxyfile'])
+# the tool loaded into another environment
+env2 = Environment(tools=['doxyfile'], DOXYFILE_FRAGMENTS=2)
+SConscript('src/SConscript', exports=['env', 'env2'], variant_dir='build',
+           duplicate=0)
+print("stats: %r" % (env.DoxyfileStats() is not None))
+env3 = Environment(tools=['doxy2'], toolpath=['tools'])
+print("stats2: %r" % (env3.DoxyfileStats() is not None))
+""")
+
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env', 'env2'])
+env.Doxyfile('a/Doxyfile', 'Doxyfile.in', INPUT='.')
+env.Doxyfile('b/Doxyfile', 'Doxyfile.in', INPUT='.', PROJECT_NAME='B')
+env2.Doxyfile('c/Doxyfile', 'Doxyfile.in', INPUT=['x.h', 'y.h', 'z.h'])
+""")
+
+# disabled by default
+test.run()
+test.must_contain_all_lines(test.stdout(), ["stats: False", "stats2: False"])
+test.must_not_exist('stats.json')
+
+test.run(arguments='-c .')
+test.run(arguments='--doxyfile-stats=stats.json .')
+test.must_contain_all_lines(test.stdout(), ["stats: True", "stats2: True"])
+test.must_exist('stats.json')
+
+with open(test.workpath('stats.json')) as f:
+    stats = json.load(f)
+
+test.fail_test(sorted(stats) != ['counters', 'targets', 'timers'])
+test.fail_test(stats['timers']['Doxyfile']['calls'] != 3)
+test.fail_test('doxyoptions' not in stats['timers'])
+test.fail_test(not any(k.startswith('DoxyVal:') for k in stats['timers']))
+# the template is compiled once
+test.fail_test(stats['counters'].get('template:miss') != 1)
+target = stats['targets'][os.path.join('build', 'a', 'Doxyfile')]
+test.fail_test(target['bytes'] != os.path.getsize(test.workpath('build/a/Doxyfile')))
+test.fail_test(not target['written'])
+# fragment files are counted as well
+fragment = stats['targets'][os.path.join('build', 'c', 'Doxyfile.INPUT')]
+test.fail_test(fragment['bytes'] != os.path.getsize(test.workpath('build/c/Doxyfile.INPUT')))
+test.fail_test(not fragment['written'])
+
+# enabled with environment variable
+test.unlink('stats.json')
+os.environ['SCONS_DOXYFILE_STATS'] = 'stats.json'
+test.run(arguments='.')
+del os.environ['SCONS_DOXYFILE_STATS']
+test.must_exist('stats.json')
+test.up_to_date(arguments='.', read_str='stats: False\nstats2: False\n')
+
+test.pass_test()
+
+# Local Variables:
+# tab-width:4
+# indent-tabs-mode:nil
+# End:
+# vim: set expandtab tabstop=4 shiftwidth=4:
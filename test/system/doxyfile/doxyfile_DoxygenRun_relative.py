@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2018-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY
+# KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+import TestSCons
+import sys
+import os
+import glob
+
+# the tool's sources, three directories up from this test
+srcdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..')
+
+if sys.platform == 'win32':
+    test = TestSCons.TestSCons(program='scons.bat', interpreter=None)
+else:
+    test = TestSCons.TestSCons()
+
+test.subdir('site_scons')
+test.subdir(['site_scons', 'site_tools'])
+test.subdir(['site_scons', 'site_tools', 'doxyfile'])
+
+modules = ['__init__.py', 'about.py'] + \
+          [os.path.basename(p) for p in glob.glob(os.path.join(srcdir, 'doxy*.py'))]
+for module in sorted(modules):
+    test.file_fixture(os.path.join(srcdir, module),
+                      os.path.join('site_scons', 'site_tools', 'doxyfile', module))
+
+test.subdir('src', ['src', 'inc'])
+test.write(['src', 'inc', 'a.h'], '')
+
+test.write('fake_doxygen.py', """\
+# fake doxygen, writes the html index where the Doxyfile tells (relative
+# paths are relative to the directory it's run in)
+import os
+import sys
+opts = {}
+for line in sys.stdin.read().splitlines():
+    if '=' in line:
+        key, val = line.split('=', 1)
+        opts[key.strip()] = val.strip()
+for path in opts['INPUT'].split():
+    assert os.path.exists(path), path
+html = os.path.join(opts.get('OUTPUT_DIRECTORY') or '.', 'html')
+if not os.path.isdir(html):
+    os.makedirs(html)
+with open(os.path.join(html, 'index.html'), 'w') as f:
+    f.write('%s\\n' % os.getcwd())
+""")
+
+test.write(['src', 'Doxyfile.in'], """\
+INPUT                  = @INPUT@
+GENERATE_LATEX         = NO
+""")
+
+test.write('SConstruct', """\
+# SConstruct
+import sys
+import sconstool.loader
+sconstool.loader.extend_toolpath(transparent=True)
+env = Environment(tools=['doxyfile'], DOXYFILE_RELATIVE_PATHS='#',
+                  DOXYGEN='%s ${File("#fake_doxygen.py").abspath}' % sys.executable)
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""")
+
+test.write(['src', 'SConscript'], """\
+# src/SConscript
+Import(['env'])
+doxyfile = env.Doxyfile('doc/Doxyfile', 'Doxyfile.in', INPUT=['inc'])
+docs = env.DoxygenRun(doxyfile)
+# no OUTPUT_DIRECTORY, doxygen writes to the directory it's run in (top)
+assert [t.path for t in docs] == ['html/index.html'], [t.path for t in docs]
+""")
+
+test.run(arguments='.')
+test.must_match(['html', 'index.html'], '%s\n' % test.workpath(), mode='r')
+test.must_not_exist(['build', 'doc', 'html'])
+test.up_to_date(arguments='.')
+
+# the headers are found where doxygen reads them
+test.write(['src', 'inc', 'a.h'], 'int a;\n')
+test.not_up_to_date(arguments='html/index.html')
+
+test.pass_test()
+
+# Local Variables:
+# tab-width:4
+# indent-tabs-mode:nil
+# End:
+# vim: set expandtab tabstop=4 shiftwidth=4:
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2018-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY
+# KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+import TestSCons
+import sys
+import os
+import glob
+
+# the tool's sources, three directories up from this test
+srcdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..')
+
+if sys.platform == 'win32':
+    test = TestSCons.TestSCons(program='scons.bat', interpreter=None)
+else:
+    test = TestSCons.TestSCons()
+
+test.subdir('src')
+test.subdir('site_scons')
+test.subdir(['site_scons', 'site_tools'])
+test.subdir(['site_scons', 'site_tools', 'doxyfile'])
+
+modules = ['__init__.py', 'about.py'] + \
+          [os.path.basename(p) for p in glob.glob(os.path.join(srcdir, 'doxy*.py'))]
+for module in sorted(modules):
+    test.file_fixture(os.path.join(srcdir, module),
+                      os.path.join('site_scons', 'site_tools', 'doxyfile', module))
+
+test.write('fake_doxygen.py', """\
+# fake doxygen, reads Doxyfile from stdin and writes what the test checks
+import os
+import sys
+if sys.argv[1:] == ['--version']:
+    with open(os.path.join(os.path.dirname(__file__), 'fake_doxygen.ver')) as f:
+        sys.stdout.write(f.read())
+    sys.exit(0)
+assert sys.argv[1:] == ['-']
+opts = {}
+for line in sys.stdin.read().splitlines():
+    if '=' in line:
+        key, val = line.split('=', 1)
+        opts[key.strip()] = val.strip()
+out = opts['OUTPUT_DIRECTORY']
+if opts.get('GENERATE_HTML', 'YES') == 'YES':
+    with open(os.path.join(out, 'html', 'index.html'), 'w') as f:
+        f.write('DOT_NUM_THREADS=%s\\n' % opts.get('DOT_NUM_THREADS'))
+        f.write('NUM_PROC_THREADS=%s\\n' % opts.get('NUM_PROC_THREADS'))
+if opts.get('GENERATE_MAN') == 'YES':
+    man3 = os.path.join(out, 'man', 'man3')
+    os.makedirs(man3)
+    open(os.path.join(man3, 'foo.3'), 'w').close()
+""")
+
+test.write('fake_doxygen.ver', '1.9.1\n')
+
+test.write('src/Doxyfile.in', """\
+OUTPUT_DIRECTORY       = @OUTPUT_DIRECTORY@
+GENERATE_LATEX         = NO
+DOT_NUM_THREADS        = @DOT_NUM_THREADS@
+""")
+
+test.write('SConstruct', """\
+# SConstruct
+import sys
+import sconstool.loader
+sconstool.loader.extend_toolpath(transparent=True)
+# the version of fake doxygen changes, while the program (python) doesn't
+env = Environment(tools=['doxyfile'], DOXYGEN_CPUS=4, DOXYFILE_PROBE_CACHE=None,
+                  DOXYGEN='%s ${File("#fake_doxygen.py").abspath}' % sys.executable)
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""")
+
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+a = env.Doxyfile('a/Doxyfile', 'Doxyfile.in', OUTPUT_DIRECTORY='out/a')
+b = env.Doxyfile('b/Doxyfile', 'Doxyfile.in', OUTPUT_DIRECTORY='out/b',
+                 DOT_NUM_THREADS=3)
+env.DoxygenRun([a, b])
+""")
+
+test.run(arguments='-j2 .')
+test.must_contain_all_lines(test.stdout(), [
+    "Running doxygen with 'build/a/Doxyfile'",
+    "doxygen 'build/a/Doxyfile' finished in ",
+])
+# 4 CPUs shared by 2 jobs, explicitly set options are left untouched
+test.must_match('build/out/a/html/index.html',
+                "DOT_NUM_THREADS=2\nNUM_PROC_THREADS=2\n")
+test.must_match('build/out/b/html/index.html',
+                "DOT_NUM_THREADS=3\nNUM_PROC_THREADS=2\n")
+# the number of jobs doesn't affect the build signature
+test.up_to_date(options='-j4', arguments='.')
+
+test.run(arguments='-c .')
+test.must_not_exist('build/out/a/html')
+
+test.run(arguments='-j1 .')
+test.must_match('build/out/a/html/index.html',
+                "DOT_NUM_THREADS=4\nNUM_PROC_THREADS=4\n")
+
+# doxygen found is too old to know NUM_PROC_THREADS
+test.write('fake_doxygen.ver', '1.8.17\n')
+test.run(arguments='-c .')
+test.run(arguments='-j1 .')
+test.must_match('build/out/a/html/index.html',
+                "DOT_NUM_THREADS=4\nNUM_PROC_THREADS=None\n")
+
+test.write('fake_doxygen.ver', '1.9.1\n')
+test.write('SConstruct', """\
+# SConstruct
+import sys
+import sconstool.loader
+sconstool.loader.extend_toolpath(transparent=True)
+env = Environment(tools=['doxyfile'], DOXYGEN_CPUS=4, DOXYFILE_VERSION='1.8.5',
+                  DOXYGEN='%s ${File("#fake_doxygen.py").abspath}' % sys.executable)
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""")
+
+# doxygen 1.8.5 has no NUM_PROC_THREADS, whichever version is found
+test.run(arguments='-c .')
+test.run(arguments='-j1 .')
+test.must_match('build/out/a/html/index.html',
+                "DOT_NUM_THREADS=4\nNUM_PROC_THREADS=None\n")
+
+# man pages have no fixed names, a stamp file represents the run
+test.write('src/SConscript', """\
+# src/SConscript
+Import(['env'])
+c = env.Doxyfile('c/Doxyfile', minimal=True, OUTPUT_DIRECTORY='out/c',
+                 GENERATE_HTML=False, GENERATE_LATEX=False, GENERATE_MAN=True)
+docs = env.DoxygenRun(c)
+assert [t.name for t in docs] == ['Doxyfile.stamp'], docs
+""")
+
+test.run(arguments='.')
+test.must_exist('build/c/Doxyfile.stamp')
+test.must_exist('build/out/c/man/man3/foo.3')
+test.up_to_date(arguments='.')
+
+test.run(arguments='-c .')
+test.must_not_exist('build/c/Doxyfile.stamp')
+test.must_not_exist('build/out/c/man')
+
+# doxygen is found in, and run with, the environment of SCons (ENV)
+if sys.platform != 'win32':
+    test.subdir('bin')
+    test.write(['bin', 'doxygen'], """\
+#!%s
+import os
+import sys
+assert os.environ.get('FAKE_DOXYGEN') == 'yes'
+exec(open(sys.argv.pop(1)).read())
+""" % sys.executable)
+    os.chmod(test.workpath('bin', 'doxygen'), 0o755)
+    test.write('SConstruct', """\
+# SConstruct
+import os
+import sconstool.loader
+sconstool.loader.extend_toolpath(transparent=True)
+env = Environment(tools=['doxyfile'], DOXYGEN_CPUS=4, DOXYFILE_VERSION='1.9.1',
+                  DOXYGEN='doxygen ${File("#fake_doxygen.py").abspath}')
+env.PrependENVPath('PATH', Dir('#bin').abspath)
+env['ENV']['FAKE_DOXYGEN'] = 'yes'
+SConscript('src/SConscript', exports=['env'], variant_dir='build', duplicate=0)
+""")
+    test.run(arguments='.')
+    test.must_exist('build/c/Doxyfile.stamp')
+
+test.pass_test()
+
+# Local Variables:
+# tab-width:4
+# indent-tabs-mode:nil
+# End:
+# vim: set expandtab tabstop=4 shiftwidth=4: